@@ -433,6 +433,7 @@ from .core.ocr_engine import OCREngine, OCRResult, find_text_with_multiple_prepr
 from .core.image_processing import ImageProcessor, preprocess_image_for_ocr
 from .core.overlay import VisualOverlay, show_overlay
 from .core.relative_image import RelativeImageDetector  # NOVA FUNCIONALIDADE
+from .core.text_index import ScreenTextIndex
 from .core.keyboard_commands import KeyboardCommander  # NOVA FUNCIONALIDADE
 from .utils.config import BotVisionConfig, get_default_config
 from .utils.text_filters import limpar_texto, matches_filter
@@ -482,6 +483,12 @@ class BotVision:
         self.ocr_engine = OCREngine(self.config)
         self.image_processor = ImageProcessor()
         
+        # Índice de texto da tela: um OCR por frame atende várias buscas
+        self.text_index = None
+        if self.config.get("text_index", False):
+            self.text_index = ScreenTextIndex(self.ocr_engine,
+                                              tile_size=self.config.get("text_index_tile_size", 0))
+        
         # Configurações de overlay - acessíveis via propriedades
         self._overlay_enabled = self.config.get("overlay_enabled", True)
         self._show_overlay = self.config.get("show_overlay", True)
@@ -493,6 +500,23 @@ class BotVision:
         self.max_backtrack_attempts = 2  # Máximo de tentativas de backtrack por tarefa
         self.task_session_active = False  # Se está em uma sessão de tarefas individuais
     
+    def close(self):
+        """
+        Libera os recursos do Bot Vision (pools de OCR, posições memorizadas pendentes).
+        
+        Examples:
+            >>> with BotVision() as bot:
+            ...     bot.click_text("Salvar")
+        """
+        self.executor.close()
+        self.ocr_engine.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def _add_to_task_history(self, method_name, args, kwargs):
         """Adiciona método ao histórico de tarefas individuais."""
         task_info = {
@@ -839,19 +863,25 @@ class BotVision:
         """
         import time
         
+        if self.text_index is not None:
+            matches = self._query_text_index(text, region, filter_type, confidence_threshold)
+            if len(matches) >= occurrence:
+                return matches[occurrence - 1].box
+        
         attempts = 0
         while attempts < max_attempts:
             if region is None:
-                # Se não especificou região, captura tela inteira
-                import pyautogui
-                screen = pyautogui.screenshot()
+                # Se não especificou região, usa o frame da tela inteira (em cache)
+                screen = self.executor.frame_provider.grab_image()
                 region = (0, 0, screen.width, screen.height)
                 region_img = screen
             else:
                 region_img = self.executor._capture_region(region)
             
+            last_attempt = not backtrack or attempts >= max_attempts - 1
             found_boxes, confidence_scores, _ = self.ocr_engine.find_text(
-                region_img, text, filter_type, confidence_threshold
+                region_img, text, filter_type, confidence_threshold, region=region,
+                exhaustive=last_attempt
             )
             
             if found_boxes and len(found_boxes) >= occurrence:
@@ -884,6 +914,75 @@ class BotVision:
         
         return None
     
+    def find_texts(self, texts, region=None, filter_type="both", confidence_threshold=75.0):
+        """
+        Encontra vários textos na tela com uma única captura e uma única passada de OCR.
+        
+        Mais rápido que chamar find_text para cada rótulo: a região é capturada e
+        pré-processada uma vez e cada configuração do Tesseract roda uma vez só.
+        
+        Args:
+            texts (list): Textos a serem encontrados
+            region (tuple, optional): (x, y, width, height) da região de busca
+            filter_type (str): Tipo de filtro ("numbers", "letters", "both")
+            confidence_threshold (float): Limiar de confiança para encerrar a busca
+        
+        Returns:
+            dict: Texto -> coordenadas absolutas (x, y, width, height), ou None se não encontrado
+        
+        Examples:
+            >>> locations = bot.find_texts(["Nome", "CPF", "Telefone"], region=(0, 0, 800, 600))
+            >>> if locations["CPF"]:
+            ...     bot.click_at(locations["CPF"])
+        """
+        locations = {}
+        if self.text_index is not None:
+            for text in texts:
+                matches = self._query_text_index(text, region, filter_type)
+                if matches:
+                    locations[text] = matches[0].box
+        
+        pending = [text for text in texts if text not in locations]
+        if not pending:
+            return locations
+        
+        if region is None:
+            region_img = self.executor.frame_provider.grab_image()
+            offset_x, offset_y = 0, 0
+        else:
+            region_img = self.executor._capture_region(region)
+            offset_x, offset_y = region[0], region[1]
+        
+        found = self.ocr_engine.find_texts(region_img, pending, filter_type, confidence_threshold,
+                                           region=region)
+        
+        for text, box in found.items():
+            locations[text] = (offset_x + box[0], offset_y + box[1], box[2], box[3]) if box else None
+        return locations
+    
+    def _query_text_index(self, text, region=None, filter_type="both", min_confidence=None):
+        """
+        Consulta o índice de texto da tela, reconstruindo-o se o frame mudou.
+        
+        Args:
+            text (str): Texto a ser encontrado
+            region (tuple, optional): (x, y, width, height) da região de busca
+            filter_type (str): Tipo de filtro ("numbers", "letters", "both")
+            min_confidence (float, optional): Confiança mínima; padrão 'text_index_min_confidence'
+            
+        Returns:
+            list: OCRResult com coordenadas absolutas, em ordem de leitura
+        """
+        try:
+            screen = self.executor.frame_provider.grab_image()
+            self.text_index.ensure(screen, self.executor.change_detector, region)
+            if min_confidence is None:
+                min_confidence = self.config.get("text_index_min_confidence", 60.0)
+            return self.text_index.find(text, filter_type, region, min_confidence)
+        except Exception as e:
+            logger.warning(f"Falha ao consultar o índice de texto: {e}")
+            return []
+    
     def click_text(self, text, region=None, filter_type="both", delay=0, mouse_button="left", 
                    occurrence=1, backtrack=False, max_attempts=3, sendtext=None, 
                    confidence_threshold=None, show_overlay=None):
@@ -1054,6 +1153,13 @@ class BotVision:
         if scales is None:
             scales = [1.0, 0.95, 1.05] if not specific else [1.0]
         
+        # Com a busca em pirâmide, todo o intervalo de escalas é coberto em uma única busca
+        search_scales = None
+        if not specific and self.executor.config.get("template_pyramid", True):
+            search_scales = sorted({round(scale * inner, 4) for scale in scales
+                                    for inner in (1.0, 0.95, 1.05)})
+            scales = [1.0]
+        
         attempts = 0
         while attempts < max_attempts:
             try:
@@ -1061,39 +1167,28 @@ class BotVision:
                 for scale in scales:
                     try:
                         if scale != 1.0 and not specific:
-                            # Implementa redimensionamento da imagem de referência
-                            from PIL import Image
-                            import os
-                            ref_img = Image.open(image_path)
-                            new_width = int(ref_img.width * scale)
-                            new_height = int(ref_img.height * scale)
-                            scaled_img = ref_img.resize((new_width, new_height))
-                            
-                            # Salva temporariamente
-                            temp_path = f"temp_scaled_{scale}_{attempts}.png"
-                            scaled_img.save(temp_path)
-                            
+                            # Variação redimensionada da imagem de referência (em memória)
                             # NOVA LÓGICA: specific controla onde buscar
                             if specific and region:
                                 # Se específico E tem região, busca na região
-                                location = self.executor._locate_image_with_retry(temp_path, region, confidence)
+                                location = self.executor._locate_image_with_retry(
+                                    image_path, region, confidence, base_scale=scale)
                             else:
                                 # Se não específico OU sem região, busca na tela inteira
-                                location = self.executor._locate_image_with_retry(temp_path, None, confidence)
-                            
-                            # Remove arquivo temporário
-                            if os.path.exists(temp_path):
-                                os.remove(temp_path)
+                                location = self.executor._locate_image_with_retry(
+                                    image_path, None, confidence, base_scale=scale)
                         else:
                             # NOVA LÓGICA: specific controla onde buscar
                             if specific and region:
                                 # Se específico E tem região, busca na região
                                 logger.info(f"Buscando imagem na região {region} (specific=True)")
-                                location = self.executor._locate_image_with_retry(image_path, region, confidence)
+                                location = self.executor._locate_image_with_retry(
+                                    image_path, region, confidence, scales=search_scales)
                             else:
                                 # Se não específico OU sem região, busca na tela inteira
                                 logger.info(f"Buscando imagem em toda a tela (specific=False)")
-                                location = self.executor._locate_image_with_retry(image_path, None, confidence)
+                                location = self.executor._locate_image_with_retry(
+                                    image_path, None, confidence, scales=search_scales)
                         
                         if location:
                             return location
@@ -1367,6 +1462,7 @@ class BotVision:
                 self.executor.keyboard_commander.process_sendtext_command(text)
             else:
                 self.executor.keyboard_commander.type_text(text, interval)
+            self.executor.frame_provider.invalidate()
             
             if delay > 0:
                 time.sleep(delay)
@@ -1403,6 +1499,7 @@ class BotVision:
         """Implementação interna do comando de teclado."""
         try:
             success = self.executor.keyboard_commander.execute_command(command)
+            self.executor.frame_provider.invalidate()
             if delay > 0:
                 time.sleep(delay)
             return success
@@ -1425,6 +1522,32 @@ class BotVision:
         """
         return self.executor.keyboard_commander.get_available_commands()
 
+    def wait_for(self, condition, region=None, timeout=None, poll_interval=None, image=None,
+                 confidence=0.9):
+        """
+        Aguarda até a tela (ou uma região) estabilizar, mudar ou um alvo aparecer.
+        
+        Args:
+            condition (str or callable): "stable", "changed", "appeared" ou função sem argumentos
+            region (tuple, optional): Região observada (x, y, width, height); None para a tela inteira
+            timeout (float, optional): Espera máxima em segundos (padrão: config 'wait_timeout')
+            poll_interval (float, optional): Intervalo entre verificações (padrão: config 'wait_poll_interval')
+            image (str, optional): Imagem aguardada quando condition="appeared"
+            confidence (float): Confiança da busca da imagem
+            
+        Returns:
+            bool: True se a condição foi satisfeita, False se o tempo esgotou
+            
+        Examples:
+            >>> bot.click_image('salvar.png')
+            >>> bot.wait_for('appeared', image='confirmacao.png', timeout=10)
+            >>> bot.wait_for('stable', region=(0, 0, 800, 600))
+        """
+        target = None
+        if image is not None:
+            target = lambda: self.executor._locate_on_screen(image, region, confidence) is not None
+        return self.executor.wait_for(condition, region, timeout, poll_interval, target=target)
+    
     def _process_sendtext(self, sendtext):
         """
         Processa comandos especiais no sendtext e digita o texto.
@@ -1476,6 +1599,8 @@ class BotVision:
                 # Fallback para digitação direta
                 pyautogui.write(text_to_write)
             time.sleep(0.1)
+        
+        self.executor.frame_provider.invalidate()
 
     def execute_with_backtrack_between_tasks(self, tasks_list):
         """
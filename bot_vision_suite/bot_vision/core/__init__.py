@@ -6,6 +6,8 @@ Este módulo contém as classes e funções principais do Bot Vision Suite.
 
 from .image_processing import (
     ImageProcessor,
+    LazyPreprocessedImages,
+    batch_threshold,
     preprocess_image_for_ocr,
     get_available_methods
 )
@@ -13,10 +15,21 @@ from .image_processing import (
 from .ocr_engine import (
     OCREngine,
     OCRResult,
+    OCRBackend,
+    PytesseractBackend,
+    TesserocrBackend,
+    create_ocr_backend,
+    build_target_config,
+    plan_ocr_configs,
     find_text_with_multiple_preprocessing,
     extract_text_from_image
 )
 
+from .ocr_scheduler import (
+    AdaptiveOCRScheduler,
+    make_task_signature
+)
+
 from .overlay import (
     VisualOverlay,
     show_overlay,
@@ -39,16 +52,61 @@ from .keyboard_commands import (
     KeyboardCommander
 )
 
+from .template_matching import (
+    TemplateMatcher,
+    MatchResult,
+    Box,
+    MATCH_DTYPE,
+    non_max_suppression
+)
+
+from .template_cache import TemplateCache
+
+from .ocr_cache import OCRResultCache, dhash
+
+from .location_cache import (
+    LocationCache,
+    image_signature,
+    text_signature,
+    pixel_fingerprint
+)
+
+from .wait import wait_for, WAIT_CONDITIONS
+
+from .text_index import ScreenTextIndex
+
+from .text_detection import detect_text_regions, rank_text_regions, split_tiles
+
+from .screen_capture import (
+    FrameProvider,
+    ScreenChangeDetector,
+    CaptureBackend,
+    PyAutoGUICaptureBackend,
+    MSSCaptureBackend,
+    SyntheticCaptureBackend,
+    create_capture_backend
+)
+
 __all__ = [
     # Image processing
     "ImageProcessor",
+    "LazyPreprocessedImages",
+    "batch_threshold",
     "preprocess_image_for_ocr", 
     "get_available_methods",
     # OCR
     "OCREngine",
     "OCRResult",
+    "OCRBackend",
+    "PytesseractBackend",
+    "TesserocrBackend",
+    "create_ocr_backend",
+    "build_target_config",
+    "plan_ocr_configs",
     "find_text_with_multiple_preprocessing",
     "extract_text_from_image",
+    "AdaptiveOCRScheduler",
+    "make_task_signature",
     # Overlay
     "VisualOverlay",
     "show_overlay",
@@ -62,5 +120,37 @@ __all__ = [
     # Relative image detection (NEW!)
     "RelativeImageDetector",
     # Keyboard commands (NEW!)
-    "KeyboardCommander"
+    "KeyboardCommander",
+    # Template matching
+    "TemplateMatcher",
+    "MatchResult",
+    "Box",
+    "MATCH_DTYPE",
+    "non_max_suppression",
+    "TemplateCache",
+    # OCR result cache
+    "OCRResultCache",
+    "dhash",
+    # Screen text index
+    "ScreenTextIndex",
+    # Text detection
+    "detect_text_regions",
+    "rank_text_regions",
+    "split_tiles",
+    # Location cache
+    "LocationCache",
+    "image_signature",
+    "text_signature",
+    "pixel_fingerprint",
+    # Wait conditions
+    "wait_for",
+    "WAIT_CONDITIONS",
+    # Screen capture
+    "FrameProvider",
+    "ScreenChangeDetector",
+    "CaptureBackend",
+    "PyAutoGUICaptureBackend",
+    "MSSCaptureBackend",
+    "SyntheticCaptureBackend",
+    "create_capture_backend"
 ]
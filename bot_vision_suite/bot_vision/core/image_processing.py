@@ -6,16 +6,64 @@ otimizadas para melhorar a precisão do OCR.
 """
 
 import logging
+import threading
+from collections.abc import Sequence
 import numpy as np
 import cv2
 from PIL import Image, ImageEnhance, ImageFilter
-from typing import List, Optional, Union
+from typing import List, Optional, Sequence as SequenceType, Tuple, Union
 
 from ..exceptions import ImageProcessingError
+from .text_detection import estimate_text_height
 
 logger = logging.getLogger(__name__)
 
 
+def batch_threshold(gray: np.ndarray, thresholds, inverse=False, maxval: int = 255,
+                    out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Aplica vários limiares a uma imagem em escala de cinza de uma só vez.
+    
+    Equivale a chamar cv2.threshold (THRESH_BINARY ou THRESH_BINARY_INV) para
+    cada limiar, mas em um único broadcast vetorizado sobre uma pilha
+    pré-alocada ``(k, H, W)``. Cada ``stack[i]`` é uma view sem cópia.
+    
+    Args:
+        gray (numpy.ndarray): Imagem 2D uint8
+        thresholds (sequence): Limiares a aplicar (k valores)
+        inverse (bool or sequence): Inversão global ou por limiar
+        maxval (int): Valor atribuído aos pixels acima do limiar
+        out (numpy.ndarray, optional): Pilha (k, H, W) uint8 a reutilizar
+        
+    Returns:
+        numpy.ndarray: Pilha (k, H, W) uint8 com os mapas binários
+        
+    Examples:
+        >>> stack = batch_threshold(gray, [140, 160, 180], inverse=True)
+        >>> stack.shape
+        (3, H, W)
+    """
+    gray = np.asarray(gray)
+    if gray.ndim != 2 or gray.dtype != np.uint8:
+        raise ImageProcessingError("batch_threshold requer imagem 2D uint8")
+    
+    thresholds = np.asarray(thresholds).reshape(-1, 1, 1)
+    k = thresholds.shape[0]
+    inverse = np.broadcast_to(np.asarray(inverse, dtype=bool), (k,)).reshape(-1, 1, 1)
+    
+    if out is None:
+        out = np.empty((k,) + gray.shape, dtype=np.uint8)
+    elif out.shape != (k,) + gray.shape or out.dtype != np.uint8:
+        raise ImageProcessingError(f"Pilha de saída inválida: {out.shape} {out.dtype}")
+    
+    # pixel > limiar (como o cv2.threshold), invertido onde pedido, escalado para maxval
+    np.greater(gray[np.newaxis], thresholds, out=out)
+    np.not_equal(out, inverse, out=out)
+    out *= np.uint8(maxval)
+    
+    return out
+
+
 class ImageProcessor:
     """
     Classe responsável pelo processamento de imagens para OCR.
@@ -51,148 +99,10 @@ class ImageProcessor:
         Foca em métodos que melhor detectaram números e remove métodos ineficazes.
         
         Esta função é uma cópia EXATA da função preprocess_image_for_ocr do bot_vision.py original.
+        Gera todas as variações de uma vez; para gerar sob demanda use
+        preprocess_for_ocr_lazy.
         """
-        # Lista para armazenar todas as versões processadas
-        processed_images = []
-        
-        # Converte para array numpy para manipulação
-        img_np = np.array(img)
-        
-        # MÉTODO 28 (62% confiança) - Prioridade máxima
-        # -----------------------------------------------------------------------------------
-        # Versão com melhor detecção de números em caixas coloridas
-        # Processamento HSV com ajustes específicos
-        img_hsv = cv2.cvtColor(img_np, cv2.COLOR_RGB2HSV)
-        
-        # Aumenta a saturação para destacar cores
-        img_hsv[:,:,1] = np.clip(img_hsv[:,:,1] * 1.4, 0, 255).astype(np.uint8)
-        img_enhanced = cv2.cvtColor(img_hsv, cv2.COLOR_HSV2RGB)
-        processed_images.append(Image.fromarray(img_enhanced))
-        
-        # Versão com threshold específico - variação do método 28
-        img_gray = cv2.cvtColor(img_enhanced, cv2.COLOR_RGB2GRAY)
-        _, thresh = cv2.threshold(img_gray, 150, 255, cv2.THRESH_BINARY)
-        processed_images.append(Image.fromarray(thresh))
-        
-        # MÉTODO 2 (59% confiança) - Segunda prioridade
-        # -----------------------------------------------------------------------------------
-        # Inversão para texto claro em fundo escuro
-        _, dark_bg_thresh = cv2.threshold(np.array(img.convert("L")), 160, 255, cv2.THRESH_BINARY_INV)
-        processed_images.append(Image.fromarray(dark_bg_thresh))
-        
-        # Variação do método 2 com diferentes thresholds
-        dark_thresholds = [140, 160, 180]
-        for thresh_val in dark_thresholds:
-            _, dark_var = cv2.threshold(np.array(img.convert("L")), thresh_val, 255, cv2.THRESH_BINARY_INV)
-            processed_images.append(Image.fromarray(dark_var))
-        
-        # MÉTODO 22 (57% confiança) - Terceira prioridade
-        # -----------------------------------------------------------------------------------
-        # Processamento de canais de cor e detecção específica
-        r_channel = img_np[:,:,0]
-        g_channel = img_np[:,:,1]
-        b_channel = img_np[:,:,2]
-        
-        # Variações de manipulação de canais
-        # Detecção de canais com base em diferenças entre R, G, B
-        channel_diff = np.absolute(r_channel.astype(np.int16) - b_channel.astype(np.int16))
-        channel_diff = np.clip(channel_diff * 2, 0, 255).astype(np.uint8)
-        _, channel_thresh = cv2.threshold(channel_diff, 30, 255, cv2.THRESH_BINARY)
-        processed_images.append(Image.fromarray(channel_thresh))
-        
-        # MÉTODO 13 (41% confiança) e MÉTODO 27 (41% confiança)
-        # -----------------------------------------------------------------------------------
-        # Versões com alta nitidez e contraste
-        gray = img.convert("L")
-        
-        # Contraste alto + nitidez (otimizado)
-        contrast_sharp = ImageEnhance.Contrast(gray).enhance(2.5).filter(ImageFilter.SHARPEN)
-        processed_images.append(contrast_sharp)
-        
-        # Nitidez adicional para melhorar bordas
-        extra_sharp = contrast_sharp.filter(ImageFilter.SHARPEN).filter(ImageFilter.SHARPEN)
-        processed_images.append(extra_sharp)
-        
-        # TÉCNICAS PARA TEXTO CLARO EM FUNDO ESCURO (cinza, preto)
-        # -----------------------------------------------------------------------------------
-        # Inversão simples (útil para texto branco em fundo escuro)
-        inverted = Image.fromarray(255 - img_np)
-        processed_images.append(inverted)
-        
-        # Thresholding adaptativo para texto em fundo escuro
-        cv_gray = np.array(gray)
-        
-        # Adaptativo com diferentes janelas - melhor para números pequenos em fundos variados
-        adaptive_thresh1 = cv2.adaptiveThreshold(
-            cv_gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 7, 2
-        )
-        processed_images.append(Image.fromarray(adaptive_thresh1))
-        
-        adaptive_thresh2 = cv2.adaptiveThreshold(
-            cv_gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 11, 3
-        )
-        processed_images.append(Image.fromarray(adaptive_thresh2))
-        
-        # MANIPULAÇÃO DE COR PARA FUNDOS COLORIDOS (rosa, cinza)
-        # -----------------------------------------------------------------------------------
-        # Rosa/roxo claro em HSV com faixas mais precisas
-        lower_pink = np.array([140, 50, 150])
-        upper_pink = np.array([170, 255, 255])
-        pink_mask_hsv = cv2.inRange(img_hsv, lower_pink, upper_pink)
-        pink_mask_inv = cv2.bitwise_not(pink_mask_hsv)
-        processed_images.append(Image.fromarray(pink_mask_inv))
-        
-        # Cinza claro em HSV
-        lower_gray = np.array([0, 0, 180])
-        upper_gray = np.array([180, 30, 255])
-        gray_mask_hsv = cv2.inRange(img_hsv, lower_gray, upper_gray)
-        gray_mask_inv = cv2.bitwise_not(gray_mask_hsv)
-        processed_images.append(Image.fromarray(gray_mask_inv))
-        
-        # Cinza escuro/preto
-        lower_dark_gray = np.array([0, 0, 0])
-        upper_dark_gray = np.array([180, 30, 80])
-        dark_gray_mask = cv2.inRange(img_hsv, lower_dark_gray, upper_dark_gray)
-        dark_gray_mask_inv = cv2.bitwise_not(dark_gray_mask)
-        processed_images.append(Image.fromarray(dark_gray_mask_inv))
-        
-        # EQUALIZAÇÃO E APRIMORAMENTO DE LUMINOSIDADE
-        # -----------------------------------------------------------------------------------
-        # Lab color space processing - bom para números em fundos coloridos diversos
-        lab_img = cv2.cvtColor(img_np, cv2.COLOR_RGB2LAB)
-        l_channel, a_channel, b_channel = cv2.split(lab_img)
-        
-        # Equaliza o canal L (luminosidade) - técnica que foi bem sucedida
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-        cl = clahe.apply(l_channel)
-        
-        # Recombina os canais
-        updated_lab_img = cv2.merge((cl, a_channel, b_channel))
-        
-        # Converte de volta para RGB e depois para escala de cinza
-        enhanced_img = cv2.cvtColor(updated_lab_img, cv2.COLOR_LAB2RGB)
-        enhanced_gray = cv2.cvtColor(enhanced_img, cv2.COLOR_RGB2GRAY)
-        
-        # Aplica thresholding na imagem melhorada
-        _, binary_enhanced = cv2.threshold(enhanced_gray, 127, 255, cv2.THRESH_BINARY)
-        processed_images.append(Image.fromarray(binary_enhanced))
-        
-        # Versão invertida para texto claro em fundo escuro
-        _, binary_enhanced_inv = cv2.threshold(enhanced_gray, 127, 255, cv2.THRESH_BINARY_INV)
-        processed_images.append(Image.fromarray(binary_enhanced_inv))
-        
-        # COMBINAÇÕES OTIMIZADAS - mescla técnicas bem sucedidas
-        # -----------------------------------------------------------------------------------
-        
-        # Combinação: alta nitidez + contraste elevado
-        contrast_highest = ImageEnhance.Contrast(gray).enhance(3.0)
-        sharpened_strong = contrast_highest.filter(ImageFilter.SHARPEN).filter(ImageFilter.SHARPEN)
-        processed_images.append(sharpened_strong)
-        
-        # Mescla lab e hsv para capturar o melhor dos dois mundos
-        merged_img = cv2.addWeighted(enhanced_gray, 0.5, img_gray, 0.5, 0)
-        _, merged_thresh = cv2.threshold(merged_img, 140, 255, cv2.THRESH_BINARY)
-        processed_images.append(Image.fromarray(merged_thresh))
+        processed_images = self.preprocess_for_ocr_lazy(img)
         
         # Filtra imagens válidas
         valid_images = []
@@ -206,6 +116,295 @@ class ImageProcessor:
         print(f"Gerando {len(valid_images)} variações otimizadas de pré-processamento para OCR")
         
         return valid_images
+    
+    def preprocess_for_ocr_lazy(self, img: Image.Image, scale: float = 1.0) -> "LazyPreprocessedImages":
+        """
+        Retorna as variações de pré-processamento como uma sequência preguiçosa.
+        
+        Cada variação só é calculada quando acessada, na mesma ordem de
+        preprocess_for_ocr, e os intermediários comuns (HSV, escala de cinza,
+        LAB/CLAHE) são calculados uma única vez.
+        
+        Args:
+            img (Image.Image): Imagem a ser processada
+            scale (float): Fator já aplicado à imagem em relação à região original
+                          (ver normalize_text_height)
+            
+        Returns:
+            LazyPreprocessedImages: Sequência indexável de imagens processadas
+        """
+        return LazyPreprocessedImages(img, scale)
+    
+    def normalize_text_height(self, img: Image.Image, target_height: float = 22.0,
+                              tolerance: float = 0.15, min_scale: float = 0.5,
+                              max_scale: float = 4.0) -> Tuple[Image.Image, float]:
+        """
+        Redimensiona a imagem para que o texto predominante tenha a altura desejada.
+        
+        Fontes pequenas de interface são ampliadas (o Tesseract reconhece mal
+        glifos muito baixos) e regiões com texto grande são reduzidas (menos
+        pixels por chamada de OCR).
+        
+        Args:
+            img (Image.Image): Imagem a ser normalizada
+            target_height (float): Altura mediana desejada para os glifos, em pixels
+            tolerance (float): Diferença relativa tolerada sem redimensionar
+            min_scale (float): Menor fator de escala permitido
+            max_scale (float): Maior fator de escala permitido
+            
+        Returns:
+            tuple: (imagem redimensionada, fator de escala); fator 1.0 se nada mudou
+        """
+        height = estimate_text_height(img)
+        if not height:
+            return img, 1.0
+        
+        scale = min(max_scale, max(min_scale, target_height / height))
+        if abs(scale - 1.0) <= tolerance:
+            return img, 1.0
+        
+        size = (max(1, int(round(img.width * scale))), max(1, int(round(img.height * scale))))
+        resample = Image.LANCZOS if scale < 1.0 else Image.BICUBIC
+        logger.debug(f"Altura do texto estimada em {height:.1f}px; redimensionando em {scale:.2f}x")
+        return img.resize(size, resample), scale
+
+
+class LazyPreprocessedImages(Sequence):
+    """
+    Sequência indexável e preguiçosa das variações de pré-processamento para OCR.
+    
+    Mantém exatamente a ordem e o resultado de ImageProcessor.preprocess_for_ocr,
+    mas calcula cada variação apenas quando ela é pedida (um retorno antecipado
+    do OCR na variação 0 evita o cálculo das demais). Variações e intermediários
+    são memorizados, e o acesso é seguro entre threads (OCR paralelo).
+    """
+    
+    # Ordem das variações (mesma ordem histórica do pré-processamento)
+    VARIANTS = [
+        "hsv_enhanced",             # Método 28 - 62% confiança
+        "hsv_threshold_150",        # Variação do método 28
+        "dark_background_160",      # Método 2 - 59% confiança
+        "dark_background_140",
+        "dark_background_160_var",
+        "dark_background_180",
+        "channel_difference",       # Método 22 - 57% confiança
+        "contrast_sharp",           # Métodos 13 e 27 - 41% confiança
+        "extra_sharp",
+        "inverted",
+        "adaptive_gaussian",
+        "adaptive_mean",
+        "pink_mask",
+        "light_gray_mask",
+        "dark_gray_mask",
+        "lab_binary",
+        "lab_binary_inv",
+        "sharpened_strong",
+        "merged_threshold",
+    ]
+    
+    def __init__(self, img: Image.Image, scale: float = 1.0):
+        """
+        Inicializa a sequência.
+        
+        Args:
+            img (Image.Image): Imagem original (RGB)
+            scale (float): Fator já aplicado à imagem em relação à região original;
+                          as caixas do OCR são divididas por ele
+        """
+        self.img = img
+        self.scale = scale
+        self._variants = {}
+        self._intermediates = {}
+        self._lock = threading.RLock()
+    
+    def __len__(self) -> int:
+        return len(self.VARIANTS)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Índice de pré-processamento fora do intervalo")
+        
+        with self._lock:
+            variant = self._variants.get(index)
+            if variant is None:
+                name = self.VARIANTS[index]
+                variant = getattr(self, f"_variant_{name}")()
+                self._variants[index] = variant
+            return variant
+    
+    @property
+    def computed(self) -> int:
+        """Número de variações já calculadas."""
+        return len(self._variants)
+    
+    def _memo(self, key: str, factory):
+        """Calcula um intermediário uma única vez."""
+        with self._lock:
+            if key not in self._intermediates:
+                self._intermediates[key] = factory()
+            return self._intermediates[key]
+    
+    # Intermediários compartilhados
+    # -----------------------------------------------------------------------------------
+    def _img_np(self) -> np.ndarray:
+        return self._memo("img_np", lambda: np.array(self.img))
+    
+    def _img_hsv(self) -> np.ndarray:
+        # HSV com saturação aumentada (as máscaras de cor usam esta mesma versão)
+        def build():
+            img_hsv = cv2.cvtColor(self._img_np(), cv2.COLOR_RGB2HSV)
+            img_hsv[:,:,1] = np.clip(img_hsv[:,:,1] * 1.4, 0, 255).astype(np.uint8)
+            return img_hsv
+        return self._memo("img_hsv", build)
+    
+    def _img_enhanced(self) -> np.ndarray:
+        return self._memo("img_enhanced", lambda: cv2.cvtColor(self._img_hsv(), cv2.COLOR_HSV2RGB))
+    
+    def _img_gray(self) -> np.ndarray:
+        return self._memo("img_gray", lambda: cv2.cvtColor(self._img_enhanced(), cv2.COLOR_RGB2GRAY))
+    
+    def _gray(self) -> Image.Image:
+        return self._memo("gray", lambda: self.img.convert("L"))
+    
+    def _gray_np(self) -> np.ndarray:
+        return self._memo("gray_np", lambda: np.array(self._gray()))
+    
+    def _merged_gray(self) -> np.ndarray:
+        return self._memo("merged_gray", lambda: cv2.addWeighted(self._enhanced_gray(), 0.5,
+                                                                 self._img_gray(), 0.5, 0))
+    
+    def _thresholds(self, base: str, thresholds: SequenceType[int], inverse=False) -> np.ndarray:
+        """
+        Pilha de limiares (k, H, W) sobre um intermediário em escala de cinza,
+        calculada em uma única passada e memorizada.
+        """
+        key = f"thresholds:{base}:{tuple(thresholds)}:{inverse}"
+        return self._memo(key, lambda: batch_threshold(getattr(self, f"_{base}")(), thresholds, inverse))
+    
+    def array(self, index: int) -> np.ndarray:
+        """
+        Retorna a variação como array numpy (view sem cópia quando possível).
+        
+        Args:
+            index (int): Índice da variação
+            
+        Returns:
+            numpy.ndarray: Imagem processada
+        """
+        return np.asarray(self[index])
+    
+    def _enhanced_gray(self) -> np.ndarray:
+        # LAB com CLAHE no canal L, convertido de volta para escala de cinza
+        def build():
+            lab_img = cv2.cvtColor(self._img_np(), cv2.COLOR_RGB2LAB)
+            l_channel, a_channel, b_channel = cv2.split(lab_img)
+            clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
+            cl = clahe.apply(l_channel)
+            updated_lab_img = cv2.merge((cl, a_channel, b_channel))
+            enhanced_img = cv2.cvtColor(updated_lab_img, cv2.COLOR_LAB2RGB)
+            return cv2.cvtColor(enhanced_img, cv2.COLOR_RGB2GRAY)
+        return self._memo("enhanced_gray", build)
+    
+    # MÉTODO 28 (62% confiança) - Prioridade máxima
+    # -----------------------------------------------------------------------------------
+    def _variant_hsv_enhanced(self) -> Image.Image:
+        # Processamento HSV com saturação aumentada para destacar cores
+        return Image.fromarray(self._img_enhanced())
+    
+    def _variant_hsv_threshold_150(self) -> Image.Image:
+        return Image.fromarray(self._thresholds("img_gray", [150])[0])
+    
+    # MÉTODO 2 (59% confiança) - Inversão para texto claro em fundo escuro
+    # -----------------------------------------------------------------------------------
+    # Família de limiares invertidos calculada em uma única passada
+    DARK_THRESHOLDS = [140, 160, 180]
+    
+    def _dark_background(self, thresh_val: int) -> Image.Image:
+        stack = self._thresholds("gray_np", self.DARK_THRESHOLDS, inverse=True)
+        return Image.fromarray(stack[self.DARK_THRESHOLDS.index(thresh_val)])
+    
+    def _variant_dark_background_160(self) -> Image.Image:
+        return self._dark_background(160)
+    
+    def _variant_dark_background_140(self) -> Image.Image:
+        return self._dark_background(140)
+    
+    def _variant_dark_background_160_var(self) -> Image.Image:
+        return self._dark_background(160)
+    
+    def _variant_dark_background_180(self) -> Image.Image:
+        return self._dark_background(180)
+    
+    # MÉTODO 22 (57% confiança) - Diferença entre canais R e B
+    # -----------------------------------------------------------------------------------
+    def _variant_channel_difference(self) -> Image.Image:
+        img_np = self._img_np()
+        channel_diff = np.absolute(img_np[:,:,0].astype(np.int16) - img_np[:,:,2].astype(np.int16))
+        channel_diff = np.clip(channel_diff * 2, 0, 255).astype(np.uint8)
+        _, channel_thresh = cv2.threshold(channel_diff, 30, 255, cv2.THRESH_BINARY)
+        return Image.fromarray(channel_thresh)
+    
+    # MÉTODO 13 (41% confiança) e MÉTODO 27 (41% confiança) - Nitidez e contraste
+    # -----------------------------------------------------------------------------------
+    def _variant_contrast_sharp(self) -> Image.Image:
+        return ImageEnhance.Contrast(self._gray()).enhance(2.5).filter(ImageFilter.SHARPEN)
+    
+    def _variant_extra_sharp(self) -> Image.Image:
+        return self[self.VARIANTS.index("contrast_sharp")].filter(ImageFilter.SHARPEN).filter(ImageFilter.SHARPEN)
+    
+    # TÉCNICAS PARA TEXTO CLARO EM FUNDO ESCURO (cinza, preto)
+    # -----------------------------------------------------------------------------------
+    def _variant_inverted(self) -> Image.Image:
+        return Image.fromarray(255 - self._img_np())
+    
+    def _variant_adaptive_gaussian(self) -> Image.Image:
+        return Image.fromarray(cv2.adaptiveThreshold(
+            self._gray_np(), 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 7, 2
+        ))
+    
+    def _variant_adaptive_mean(self) -> Image.Image:
+        return Image.fromarray(cv2.adaptiveThreshold(
+            self._gray_np(), 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 11, 3
+        ))
+    
+    # MANIPULAÇÃO DE COR PARA FUNDOS COLORIDOS (rosa, cinza)
+    # -----------------------------------------------------------------------------------
+    def _color_mask_inv(self, lower, upper) -> Image.Image:
+        mask = cv2.inRange(self._img_hsv(), np.array(lower), np.array(upper))
+        return Image.fromarray(cv2.bitwise_not(mask))
+    
+    def _variant_pink_mask(self) -> Image.Image:
+        return self._color_mask_inv([140, 50, 150], [170, 255, 255])
+    
+    def _variant_light_gray_mask(self) -> Image.Image:
+        return self._color_mask_inv([0, 0, 180], [180, 30, 255])
+    
+    def _variant_dark_gray_mask(self) -> Image.Image:
+        return self._color_mask_inv([0, 0, 0], [180, 30, 80])
+    
+    # EQUALIZAÇÃO E APRIMORAMENTO DE LUMINOSIDADE (LAB + CLAHE)
+    # -----------------------------------------------------------------------------------
+    def _variant_lab_binary(self) -> Image.Image:
+        # Normal e invertida saem da mesma passada
+        return Image.fromarray(self._thresholds("enhanced_gray", [127, 127], (False, True))[0])
+    
+    def _variant_lab_binary_inv(self) -> Image.Image:
+        return Image.fromarray(self._thresholds("enhanced_gray", [127, 127], (False, True))[1])
+    
+    # COMBINAÇÕES OTIMIZADAS - mescla técnicas bem sucedidas
+    # -----------------------------------------------------------------------------------
+    def _variant_sharpened_strong(self) -> Image.Image:
+        contrast_highest = ImageEnhance.Contrast(self._gray()).enhance(3.0)
+        return contrast_highest.filter(ImageFilter.SHARPEN).filter(ImageFilter.SHARPEN)
+    
+    def _variant_merged_threshold(self) -> Image.Image:
+        # Mescla lab e hsv para capturar o melhor dos dois mundos
+        return Image.fromarray(self._thresholds("merged_gray", [140])[0])
 
 
 # Função standalone para compatibilidade total com o código original
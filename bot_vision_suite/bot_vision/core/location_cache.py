@@ -0,0 +1,262 @@
+"""
+Bot Vision Suite - Location Cache
+
+Este módulo memoriza onde cada tarefa (imagem ou texto) foi encontrada. Na
+próxima execução, a posição memorizada é verificada com uma checagem local
+barata (template match ou hash dos pixels do retângulo) antes de recorrer à
+busca completa.
+"""
+
+import os
+import json
+import time
+import atexit
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Caches com arquivo de persistência; as alterações pendentes são salvas na saída
+_persistent_caches = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_persistent_caches() -> None:
+    for cache in list(_persistent_caches):
+        cache.flush()
+
+
+def _region_key(region: Optional[Tuple[int, int, int, int]]) -> str:
+    return ",".join(str(int(v)) for v in region) if region else "*"
+
+
+def image_signature(image_path: str, region: Optional[Tuple[int, int, int, int]] = None) -> str:
+    """
+    Cria a assinatura de uma tarefa de imagem.
+    
+    Args:
+        image_path (str): Caminho da imagem
+        region (tuple, optional): Região de busca
+        
+    Returns:
+        str: Assinatura (ex: 'image|/abs/botao.png|0,0,800,600')
+    """
+    return f"image|{os.path.abspath(image_path)}|{_region_key(region)}"
+
+
+def text_signature(target_text: str, filter_type: str = "both",
+                   region: Optional[Tuple[int, int, int, int]] = None) -> str:
+    """
+    Cria a assinatura de uma tarefa de texto.
+    
+    Args:
+        target_text (str): Texto buscado
+        filter_type (str): Tipo de filtro ("numbers", "letters", "both")
+        region (tuple, optional): Região de busca
+        
+    Returns:
+        str: Assinatura (ex: 'text|letters|salvar|10,20,100,30')
+    """
+    return f"text|{filter_type.lower()}|{' '.join(target_text.lower().split())}|{_region_key(region)}"
+
+
+def pixel_fingerprint(pixels: np.ndarray) -> str:
+    """
+    Calcula o hash dos pixels de um retângulo.
+    
+    Args:
+        pixels (numpy.ndarray): Recorte da tela
+        
+    Returns:
+        str: Hash hexadecimal (inclui as dimensões do recorte)
+    """
+    pixels = np.ascontiguousarray(pixels)
+    digest = hashlib.blake2b(str(pixels.shape).encode(), digest_size=16)
+    digest.update(pixels.data)
+    return digest.hexdigest()
+
+
+class LocationCache:
+    """
+    Memória de posições por assinatura de tarefa.
+    
+    Cada entrada guarda a caixa (left, top, width, height) em coordenadas
+    absolutas e, para textos, o hash dos pixels da caixa no momento em que
+    foi encontrada. Entradas expiram após ``ttl`` segundos e podem ser
+    persistidas em JSON para reaproveitamento entre execuções. As alterações
+    marcam o cache como modificado e o arquivo é regravado no máximo a cada
+    ``save_interval`` segundos, em ``flush()``/``close()`` ou na saída do
+    processo.
+    """
+    
+    def __init__(self, ttl: float = 3600.0, max_entries: int = 1000,
+                 persist_path: Optional[str] = None, save_interval: float = 5.0):
+        """
+        Inicializa o cache.
+        
+        Args:
+            ttl (float): Tempo de vida das entradas em segundos (0 ou None: sem expiração)
+            max_entries (int): Máximo de entradas (as menos usadas são descartadas)
+            persist_path (str, optional): Arquivo JSON para persistir as posições
+            save_interval (float): Intervalo mínimo entre gravações do arquivo em
+                                   segundos (0: grava a cada alteração)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.persist_path = persist_path
+        self.save_interval = save_interval or 0.0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self.stats = {"hits": 0, "misses": 0, "rejected": 0, "expired": 0, "stores": 0}
+        
+        if persist_path:
+            self.load()
+            _persistent_caches.add(self)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, signature: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna a entrada memorizada para a assinatura, se ainda válida.
+        
+        Args:
+            signature (str): Assinatura da tarefa
+            
+        Returns:
+            dict or None: Entrada com "box" e "fingerprint"
+        """
+        with self._lock:
+            entry = self._entries.get(signature)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            
+            if self.ttl and time.time() - entry["timestamp"] > self.ttl:
+                del self._entries[signature]
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            
+            self._entries.move_to_end(signature)
+            return dict(entry, box=tuple(entry["box"]))
+    
+    def put(self, signature: str, box: Tuple[int, int, int, int],
+            fingerprint: Optional[str] = None) -> None:
+        """
+        Memoriza a posição de uma tarefa.
+        
+        Args:
+            signature (str): Assinatura da tarefa
+            box (tuple): Caixa (left, top, width, height) absoluta
+            fingerprint (str, optional): Hash dos pixels da caixa
+        """
+        with self._lock:
+            self._entries.pop(signature, None)
+            self._entries[signature] = {
+                "box": [int(v) for v in box],
+                "fingerprint": fingerprint,
+                "timestamp": time.time(),
+            }
+            self.stats["stores"] += 1
+            
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        
+        self._changed()
+    
+    def record_hit(self) -> None:
+        """Contabiliza uma posição memorizada confirmada pela verificação local."""
+        with self._lock:
+            self.stats["hits"] += 1
+    
+    def reject(self, signature: str) -> None:
+        """
+        Descarta uma entrada que falhou na verificação local.
+        
+        Args:
+            signature (str): Assinatura da tarefa
+        """
+        with self._lock:
+            self._entries.pop(signature, None)
+            self.stats["rejected"] += 1
+            self.stats["misses"] += 1
+    
+    def invalidate(self, signature: Optional[str] = None) -> None:
+        """
+        Remove uma entrada (ou todas, se signature for None).
+        
+        Args:
+            signature (str, optional): Assinatura da tarefa
+        """
+        with self._lock:
+            if signature is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(signature, None)
+        
+        self._changed()
+    
+    def _changed(self) -> None:
+        """Marca o cache como modificado e salva se o intervalo de gravação passou."""
+        if not self.persist_path:
+            return
+        self._dirty = True
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+    
+    def flush(self) -> None:
+        """Salva as posições se houver alterações ainda não gravadas."""
+        if self._dirty:
+            self.save()
+    
+    def close(self) -> None:
+        """Grava as alterações pendentes; o cache continua utilizável."""
+        self.flush()
+        _persistent_caches.discard(self)
+    
+    def load(self) -> None:
+        """Carrega as posições do arquivo JSON, se existir."""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+        
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            
+            with self._lock:
+                self._entries = OrderedDict(data.get("entries", {}))
+            
+            logger.info(f"Posições memorizadas carregadas: {len(self._entries)} entradas")
+        except Exception as e:
+            logger.warning(f"Não foi possível carregar posições de {self.persist_path}: {e}")
+    
+    def save(self) -> None:
+        """Salva as posições no arquivo JSON (escrita atômica)."""
+        if not self.persist_path:
+            return
+        
+        with self._lock:
+            data = {"version": 1, "entries": dict(self._entries)}
+            self._dirty = False
+            self._last_save = time.monotonic()
+        
+        temp_path = f"{self.persist_path}.{os.getpid()}.tmp"
+        try:
+            directory = os.path.dirname(os.path.abspath(self.persist_path))
+            os.makedirs(directory, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.persist_path)
+        except Exception as e:
+            logger.warning(f"Não foi possível salvar posições em {self.persist_path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
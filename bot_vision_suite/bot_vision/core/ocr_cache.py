@@ -0,0 +1,157 @@
+"""
+Bot Vision Suite - OCR Result Cache
+
+Este módulo guarda o resultado de buscas de texto indexado pela impressão
+digital dos pixels da região (hash exato e, opcionalmente, dHash
+perceptual). Uma região idêntica à da tentativa anterior devolve o
+resultado na hora, sem rodar a grade de OCR de novo.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from .location_cache import pixel_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def dhash(pixels: np.ndarray, hash_size: int = 8) -> int:
+    """
+    Calcula o hash perceptual por diferença (dHash) de uma imagem.
+    
+    Args:
+        pixels (numpy.ndarray): Imagem RGB ou em escala de cinza
+        hash_size (int): Lado da grade do hash (8 gera 64 bits)
+        
+    Returns:
+        int: Hash com hash_size * hash_size bits
+    """
+    if pixels.ndim == 3:
+        pixels = cv2.cvtColor(np.ascontiguousarray(pixels), cv2.COLOR_RGB2GRAY)
+    small = cv2.resize(pixels, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Número de bits diferentes entre dois hashes."""
+    return bin(a ^ b).count("1")
+
+
+class OCRResultCache:
+    """
+    Cache LRU de resultados de find_text.
+    
+    A chave é o hash exato dos pixels mais o texto buscado, o filtro e o
+    limiar antecipado. Com ``dhash_tolerance`` > 0, uma região cujo dHash
+    difira em até esse número de bits (e com as mesmas dimensões) também
+    reaproveita o resultado.
+    """
+    
+    def __init__(self, max_entries: int = 128, dhash_tolerance: int = 0):
+        """
+        Inicializa o cache.
+        
+        Args:
+            max_entries (int): Máximo de resultados guardados
+            dhash_tolerance (int): Distância de Hamming máxima do dHash (0: apenas hash exato)
+        """
+        self.max_entries = max_entries
+        self.dhash_tolerance = dhash_tolerance
+        self._entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "perceptual_hits": 0, "misses": 0}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def _query_key(target_text: str, filter_type: str, early_confidence_threshold: float) -> Tuple:
+        return (" ".join(target_text.lower().split()), filter_type.lower(),
+                float(early_confidence_threshold))
+    
+    @staticmethod
+    def _pixels(region_img) -> np.ndarray:
+        return np.asarray(region_img) if isinstance(region_img, Image.Image) else region_img
+    
+    def get(self, region_img, target_text: str, filter_type: str,
+            early_confidence_threshold: float) -> Optional[Tuple]:
+        """
+        Procura o resultado de uma busca sobre pixels equivalentes.
+        
+        Args:
+            region_img (PIL.Image ou numpy.ndarray): Imagem da região
+            target_text (str): Texto buscado
+            filter_type (str): Tipo de filtro
+            early_confidence_threshold (float): Limiar antecipado
+            
+        Returns:
+            tuple or None: (boxes, scores, early_match) em cache
+        """
+        pixels = self._pixels(region_img)
+        query = self._query_key(target_text, filter_type, early_confidence_threshold)
+        key = (pixel_fingerprint(pixels),) + query
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._copy(entry["result"])
+        
+        if self.dhash_tolerance > 0:
+            image_hash = dhash(pixels)
+            with self._lock:
+                for entry_key, entry in reversed(self._entries.items()):
+                    if entry_key[1:] == query and entry["shape"] == pixels.shape and \
+                            hamming_distance(entry["dhash"], image_hash) <= self.dhash_tolerance:
+                        self._entries.move_to_end(entry_key)
+                        self.stats["perceptual_hits"] += 1
+                        return self._copy(entry["result"])
+        
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+    
+    def put(self, region_img, target_text: str, filter_type: str,
+            early_confidence_threshold: float, result: Tuple) -> None:
+        """
+        Guarda o resultado de uma busca.
+        
+        Args:
+            region_img (PIL.Image ou numpy.ndarray): Imagem da região
+            target_text (str): Texto buscado
+            filter_type (str): Tipo de filtro
+            early_confidence_threshold (float): Limiar antecipado
+            result (tuple): (boxes, scores, early_match)
+        """
+        pixels = self._pixels(region_img)
+        key = (pixel_fingerprint(pixels),) + self._query_key(target_text, filter_type,
+                                                             early_confidence_threshold)
+        entry = {
+            "result": self._copy(result),
+            "shape": pixels.shape,
+            "dhash": dhash(pixels) if self.dhash_tolerance > 0 else None,
+        }
+        
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    @staticmethod
+    def _copy(result: Tuple) -> Tuple:
+        boxes, scores, early_match = result
+        return list(boxes), list(scores), early_match
+    
+    def clear(self) -> None:
+        """Remove todos os resultados em cache."""
+        with self._lock:
+            self._entries.clear()
@@ -5,17 +5,45 @@ Este módulo gerencia o reconhecimento óptico de caracteres (OCR) usando Tesser
 com múltiplas configurações e técnicas otimizadas para diferentes tipos de texto.
 """
 
+import os
+import string
+import hashlib
 import logging
-from typing import List, Tuple, Optional, Dict, Any
+import shlex
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import List, Tuple, Optional, Dict, Any, Union, Callable, Iterable
+import numpy as np
 from PIL import Image
 
 from ..utils.text_filters import limpar_texto, matches_filter
+from ..utils.fuzzy import fuzzy_words_distance
 from ..utils.config import BotVisionConfig
-from ..exceptions import OCRProcessingError, TesseractNotFoundError
+from ..exceptions import OCRProcessingError, TesseractNotFoundError, ConfigurationError
 from .image_processing import ImageProcessor
+from .ocr_scheduler import AdaptiveOCRScheduler, make_task_signature
+from .ocr_cache import OCRResultCache
+from .text_detection import CHAR_ASPECT, detect_text_regions, rank_text_regions, split_tiles
+from .template_matching import non_max_suppression
 
 logger = logging.getLogger(__name__)
 
+# Colunas do formato TSV/DICT do Tesseract (mesma ordem do image_to_data)
+TESSERACT_DATA_COLUMNS = [
+    "level", "page_num", "block_num", "par_num", "line_num", "word_num",
+    "left", "top", "width", "height", "conf", "text"
+]
+
+# Variáveis que o Tesseract só lê na inicialização (não aceitam SetVariable)
+INIT_ONLY_VARIABLES = {
+    "load_system_dawg", "load_freq_dawg", "load_punc_dawg", "load_number_dawg",
+    "load_unambig_dawg", "load_bigram_dawg", "user_words_file", "user_patterns_file",
+    "user_words_suffix", "user_patterns_suffix",
+}
+
 
 class OCRResult:
     """
@@ -33,6 +61,604 @@ class OCRResult:
         return f"OCRResult(text='{self.text}', confidence={self.confidence:.2f})"
 
 
+@lru_cache(maxsize=4096)
+def _clean_word(word: str, filter_type: str) -> str:
+    """Limpa uma palavra do OCR; retorna "" se ela não passar no filtro (com memória)."""
+    if not word.strip():
+        return ""
+    cleaned = limpar_texto(word, filter_type)
+    return cleaned if cleaned and matches_filter(cleaned, filter_type) else ""
+
+
+class OCRWords:
+    """
+    Saída de uma execução do Tesseract normalizada em arrays.
+    
+    As palavras são limpas uma única vez; confianças e caixas ficam em arrays
+    numpy e um índice palavra -> posições permite localizar um alvo a partir
+    da sua primeira palavra sem percorrer todas as janelas. A busca aproximada
+    usa as palavras originais (apenas em minúsculas), sem o filtro, para que
+    trocas como "0"/"o" não sejam apagadas pela limpeza.
+    """
+    
+    def __init__(self, data: Dict[str, List], filter_type: str, scale: float = 1.0):
+        """
+        Args:
+            data (dict): Dados no formato do pytesseract.image_to_data
+            filter_type (str): Tipo de filtro ("numbers", "letters", "both")
+            scale (float): Fator aplicado à imagem antes do OCR (caixas são mapeadas de volta)
+        """
+        self.scale = scale
+        self.cleaned = [_clean_word(word, filter_type) for word in data['text']]
+        self.lowered = [word.lower() for word in self.cleaned]
+        self.raw_lowered = [word.strip().lower() for word in data['text']]
+        self.conf = np.asarray(data['conf'], dtype=np.float64)
+        self.left = np.asarray(data['left'], dtype=np.int64)
+        self.top = np.asarray(data['top'], dtype=np.int64)
+        self.right = self.left + np.asarray(data['width'], dtype=np.int64)
+        self.bottom = self.top + np.asarray(data['height'], dtype=np.int64)
+        
+        self.positions = {}
+        for position, word in enumerate(self.lowered):
+            if word:
+                self.positions.setdefault(word, []).append(position)
+    
+    def __len__(self) -> int:
+        return len(self.cleaned)
+    
+    def find(self, target_words: List[str]) -> List[int]:
+        """
+        Localiza uma sequência de palavras (já limpas e em minúsculas).
+        
+        Args:
+            target_words (list): Palavras do alvo
+            
+        Returns:
+            list: Índices iniciais das ocorrências
+        """
+        n_words = len(target_words)
+        if n_words == 0:
+            return []
+        return [idx for idx in self.positions.get(target_words[0], ())
+                if self.lowered[idx:idx + n_words] == target_words]
+    
+    def find_fuzzy(self, target_words: List[str], max_ratio: float) -> List[Tuple[int, float]]:
+        """
+        Localiza uma sequência de palavras aceitando pequenas diferenças.
+        
+        As palavras reconhecidas são comparadas sem o filtro: com "letters",
+        "Salv0" continua a uma troca de "salvo".
+        
+        Args:
+            target_words (list): Palavras do alvo (limpas, em minúsculas)
+            max_ratio (float): Distância de edição máxima por caractere do alvo
+            
+        Returns:
+            list: Pares (índice inicial, distância) das ocorrências
+        """
+        n_words = len(target_words)
+        if n_words == 0:
+            return []
+        
+        matches = []
+        for idx in range(len(self.raw_lowered) - n_words + 1):
+            if not self.raw_lowered[idx]:
+                continue
+            distance = fuzzy_words_distance(self.raw_lowered[idx:idx + n_words], target_words, max_ratio)
+            if distance is not None:
+                matches.append((idx, distance))
+        return matches
+
+
+# Mesmo modo de shlex do pytesseract: no Windows as barras invertidas dos caminhos são mantidas
+POSIX_CONFIG = os.name != "nt"
+
+
+def parse_tesseract_config(config: str) -> Tuple[int, int, Dict[str, str]]:
+    """
+    Converte uma string de configuração do Tesseract em (oem, psm, variáveis).
+    
+    Args:
+        config (str): Configuração no formato da CLI (ex: "--oem 3 --psm 7 -c chave=valor")
+        
+    Returns:
+        tuple: (oem, psm, dicionário de variáveis -c)
+        
+    Examples:
+        >>> parse_tesseract_config("--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789")
+        (3, 7, {'tessedit_char_whitelist': '0123456789'})
+    """
+    oem, psm = 3, 3
+    variables = {}
+    
+    tokens = shlex.split(config or "", posix=POSIX_CONFIG)
+    if not POSIX_CONFIG:
+        # Fora do modo POSIX as aspas permanecem no token (ex: caminhos com espaços)
+        tokens = [token[1:-1] if len(token) > 1 and token[0] == token[-1] == '"' else token
+                  for token in tokens]
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        value = tokens[i + 1] if i + 1 < len(tokens) else None
+        
+        if token == "--oem" and value is not None:
+            oem = int(value)
+            i += 2
+        elif token == "--psm" and value is not None:
+            psm = int(value)
+            i += 2
+        elif token == "-c" and value is not None and "=" in value:
+            key, val = value.split("=", 1)
+            variables[key] = val
+            i += 2
+        elif token == "--user-words" and value is not None:
+            variables["user_words_file"] = value
+            i += 2
+        elif token == "--user-patterns" and value is not None:
+            variables["user_patterns_file"] = value
+            i += 2
+        else:
+            logger.debug(f"Opção do Tesseract ignorada: {token}")
+            i += 1
+    
+    return oem, psm, variables
+
+
+def parse_tesseract_tsv(tsv: str) -> Dict[str, List]:
+    """
+    Converte a saída TSV do Tesseract no mesmo dicionário do pytesseract.image_to_data.
+    
+    Args:
+        tsv (str): Texto TSV (com ou sem cabeçalho)
+        
+    Returns:
+        dict: Dicionário coluna -> lista de valores
+    """
+    data = {column: [] for column in TESSERACT_DATA_COLUMNS}
+    
+    for line in (tsv or "").splitlines():
+        fields = line.split("\t")
+        if len(fields) < len(TESSERACT_DATA_COLUMNS) - 1 or fields[0] == "level":
+            continue
+        
+        # A coluna de texto pode vir ausente em linhas de estrutura
+        if len(fields) == len(TESSERACT_DATA_COLUMNS) - 1:
+            fields.append("")
+        
+        try:
+            for column, value in zip(TESSERACT_DATA_COLUMNS[:10], fields[:10]):
+                data[column].append(int(value))
+            data["conf"].append(float(fields[10]))
+            data["text"].append("\t".join(fields[11:]))
+        except ValueError:
+            logger.debug(f"Linha TSV inválida ignorada: {line!r}")
+            # Mantém as colunas alinhadas descartando valores parciais
+            size = len(data["text"])
+            for column in TESSERACT_DATA_COLUMNS:
+                del data[column][size:]
+    
+    return data
+
+
+# Alfabeto que sobrevive a limpar_texto em cada filtro (base das whitelists)
+FILTER_CHARSETS = {
+    "numbers": string.digits,
+    "letters": string.ascii_letters,
+    "both": string.ascii_letters + string.digits,
+}
+
+
+def target_charset(target_text: str, filter_type: str = "both") -> Optional[str]:
+    """
+    Monta a whitelist de caracteres para uma busca.
+    
+    A whitelist é o alfabeto do filtro acrescido dos caracteres do alvo fora
+    dele (ex: letras acentuadas, nas duas caixas). Restringir apenas às letras
+    do alvo faria o Tesseract forçar palavras parecidas a virarem o alvo.
+    
+    Args:
+        target_text (str): Texto alvo
+        filter_type (str): Tipo de filtro ("numbers", "letters", "both")
+        
+    Returns:
+        str or None: Caracteres permitidos, ou None se o filtro não restringe o alfabeto
+        
+    Examples:
+        >>> target_charset("12", "numbers")
+        '0123456789'
+    """
+    base = FILTER_CHARSETS.get(filter_type)
+    if base is None:
+        return None
+    
+    extra = {char for word in target_text.split() for char in limpar_texto(word, filter_type)}
+    extra |= {char.swapcase() for char in extra}
+    return base + "".join(sorted(char for char in extra if len(char) == 1 and char not in base))
+
+
+def target_user_files(target_text: str, filter_type: str = "both",
+                      directory: Optional[str] = None) -> Dict[str, str]:
+    """
+    Grava (uma vez por conteúdo) o arquivo de user-words ou user-patterns do alvo.
+    
+    Buscas numéricas recebem padrões (ex: "\\d\\d" para "12"); as demais, a
+    lista de palavras do alvo.
+    
+    Args:
+        target_text (str): Texto alvo
+        filter_type (str): Tipo de filtro
+        directory (str, optional): Diretório dos arquivos (padrão: pasta temporária do sistema)
+        
+    Returns:
+        dict: Variável do Tesseract ("user_words_file" ou "user_patterns_file") -> caminho
+    """
+    words = [limpar_texto(word, filter_type) for word in target_text.split()]
+    words = [word for word in words if word]
+    if not words:
+        return {}
+    
+    if filter_type == "numbers":
+        variable, suffix = "user_patterns_file", "patterns"
+        lines = sorted({"\\d" * len(word) for word in words})
+    else:
+        variable, suffix = "user_words_file", "words"
+        lines = sorted(set(words) | {word.lower() for word in words})
+    content = "\n".join(lines) + "\n"
+    
+    directory = directory or os.path.join(tempfile.gettempdir(), "bot_vision_user_words")
+    digest = hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+    path = os.path.join(directory, f"{digest}.{suffix}")
+    
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    
+    return {variable: path}
+
+
+def build_target_config(base_config: str, target_text: str, filter_type: str = "both",
+                        disable_dictionaries: bool = True,
+                        user_files: Optional[Dict[str, str]] = None) -> str:
+    """
+    Especializa uma configuração do Tesseract para o alvo e o filtro.
+    
+    Args:
+        base_config (str): Configuração base (ex: "--oem 3 --psm 7")
+        target_text (str): Texto alvo
+        filter_type (str): Tipo de filtro
+        disable_dictionaries (bool): Desliga os dicionários do idioma
+                                     (load_system_dawg=0, load_freq_dawg=0)
+        user_files (dict, optional): Arquivos de target_user_files
+        
+    Returns:
+        str: Configuração no formato da CLI
+        
+    Examples:
+        >>> build_target_config("--oem 3 --psm 7", "10", "numbers")
+        '--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789 -c load_system_dawg=0 -c load_freq_dawg=0'
+    """
+    _, _, variables = parse_tesseract_config(base_config)
+    parts = [base_config]
+    
+    # Configurações com whitelist própria (ex: apenas dígitos) são mantidas
+    if "tessedit_char_whitelist" not in variables:
+        charset = target_charset(target_text, filter_type)
+        if charset:
+            parts.append(f"-c tessedit_char_whitelist={charset}")
+    
+    if disable_dictionaries:
+        parts.append("-c load_system_dawg=0 -c load_freq_dawg=0")
+    
+    for variable, path in (user_files or {}).items():
+        option = "--user-words" if variable == "user_words_file" else "--user-patterns"
+        parts.append(f'{option} "{path}"' if " " in path else f"{option} {path}")
+    
+    return " ".join(parts)
+
+
+# Modos de segmentação que produzem uma única palavra (ou caractere)
+SINGLE_WORD_PSMS = {8, 10}
+
+# Modos de segmentação de página (várias linhas/blocos)
+PAGE_PSMS = {1, 3, 4, 6, 11, 12}
+
+
+def plan_ocr_configs(ocr_configs: List[str], target_text: str, filter_type: str = "both",
+                     image_height: Optional[int] = None,
+                     single_line_height: Optional[int] = None) -> List[int]:
+    """
+    Seleciona as configurações da grade que podem encontrar o alvo.
+    
+    Uma configuração é descartada quando:
+        - sua whitelist não contém os caracteres do alvo (ex: apenas dígitos
+          em uma busca por letras);
+        - ela reconhece uma única palavra (PSM 8/10) e o alvo tem várias;
+        - ela é um modo de página (PSM 6/11...) e a imagem tem a altura de uma
+          única linha (apenas se ``single_line_height`` for informado).
+    
+    Args:
+        ocr_configs (list): Configurações no formato da CLI do Tesseract
+        target_text (str): Texto alvo
+        filter_type (str): Tipo de filtro ("numbers", "letters", "both")
+        image_height (int, optional): Altura da imagem enviada ao OCR
+        single_line_height (int, optional): Altura máxima de uma imagem de linha única
+        
+    Returns:
+        list: Índices das configurações mantidas, na ordem original
+    """
+    words = [limpar_texto(word, filter_type) for word in target_text.split()]
+    words = [word for word in words if word]
+    characters = set("".join(words))
+    single_line = (image_height is not None and single_line_height is not None and
+                   image_height <= single_line_height)
+    
+    planned = []
+    for index, config in enumerate(ocr_configs):
+        _, psm, variables = parse_tesseract_config(config)
+        whitelist = variables.get("tessedit_char_whitelist")
+        if whitelist is not None and any(c not in whitelist and c.swapcase() not in whitelist
+                                         for c in characters):
+            continue
+        if psm in SINGLE_WORD_PSMS and len(words) > 1:
+            continue
+        if psm == 10 and len("".join(words)) > 1:
+            continue
+        if single_line and psm in PAGE_PSMS:
+            continue
+        planned.append(index)
+    
+    # Sem nenhuma configuração viável, mantém a grade completa
+    return planned or list(range(len(ocr_configs)))
+
+
+@lru_cache(maxsize=1024)
+def _target_config(base_config: str, target_text: str, filter_type: str, user_words: bool) -> str:
+    """Versão memorizada de build_target_config usada pelo OCREngine."""
+    user_files = target_user_files(target_text, filter_type) if user_words else None
+    return build_target_config(base_config, target_text, filter_type, user_files=user_files)
+
+
+class BackendInitializationError(OCRProcessingError):
+    """Falha ao inicializar um backend de OCR (tessdata, idioma, biblioteca)."""
+    pass
+
+
+class OCRBackend:
+    """
+    Interface comum para os backends de OCR.
+    
+    Um backend recebe uma imagem (PIL ou array numpy) e uma configuração no
+    formato da CLI do Tesseract e devolve o mesmo dicionário de
+    ``pytesseract.image_to_data(..., output_type=Output.DICT)``.
+    """
+    
+    name = "base"
+    
+    def image_to_data(self, img: Union[Image.Image, np.ndarray], config: str) -> Dict[str, List]:
+        """
+        Executa OCR na imagem e retorna os dados por palavra.
+        
+        Args:
+            img (PIL.Image or numpy.ndarray): Imagem a ser processada
+            config (str): Configuração do Tesseract
+            
+        Returns:
+            dict: Dados no formato do pytesseract (text, conf, left, top, ...)
+        """
+        raise NotImplementedError
+    
+    def close(self) -> None:
+        """Libera recursos mantidos pelo backend."""
+        pass
+
+
+class PytesseractBackend(OCRBackend):
+    """
+    Backend baseado no pytesseract (um processo tesseract por chamada).
+    
+    É o backend de fallback: funciona em qualquer ambiente com o executável
+    do Tesseract instalado.
+    """
+    
+    name = "pytesseract"
+    
+    def image_to_data(self, img: Union[Image.Image, np.ndarray], config: str) -> Dict[str, List]:
+        import pytesseract
+        
+        if isinstance(img, np.ndarray):
+            img = Image.fromarray(img)
+        
+        return pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT, config=config)
+
+
+class TesserocrBackend(OCRBackend):
+    """
+    Backend persistente baseado no tesserocr (bindings da libtesseract).
+    
+    Mantém instâncias ``PyTessBaseAPI`` vivas entre chamadas, de modo que o
+    modelo de idioma é carregado uma única vez e as imagens são passadas
+    diretamente da memória, sem processos nem arquivos temporários.
+    
+    As instâncias são mantidas por thread, pois a API do Tesseract não é
+    thread-safe, e separadas pelas variáveis que só podem ser definidas na
+    inicialização (dicionários, user-words, etc.). Cada thread mantém no
+    máximo ``max_instances`` APIs; a menos usada é finalizada ao criar outra.
+    """
+    
+    name = "tesserocr"
+    
+    def __init__(self, lang: str = "eng", tessdata_path: Optional[str] = None,
+                 max_instances: int = 4):
+        """
+        Inicializa o backend.
+        
+        Args:
+            lang (str): Idiomas do Tesseract (ex: "eng" ou "eng+por")
+            tessdata_path (str, optional): Diretório tessdata
+            max_instances (int): Máximo de APIs (modelos carregados) por thread
+            
+        Raises:
+            ImportError: Se o tesserocr não estiver instalado
+        """
+        import tesserocr
+        
+        self._tesserocr = tesserocr
+        self.lang = lang
+        self.tessdata_path = tessdata_path
+        self.max_instances = max(1, max_instances)
+        self._local = threading.local()
+        self._all_apis = []
+        self._lock = threading.Lock()
+    
+    def _get_api(self, oem: int, init_variables: Dict[str, str]):
+        """
+        Retorna (criando se necessário) a API da thread atual para a combinação dada.
+        
+        Raises:
+            BackendInitializationError: Se a API não puder ser inicializada
+        """
+        apis = getattr(self._local, "apis", None)
+        if apis is None:
+            apis = self._local.apis = OrderedDict()
+        
+        key = (oem, tuple(sorted(init_variables.items())))
+        api = apis.get(key)
+        
+        if api is not None:
+            apis.move_to_end(key)
+        else:
+            while len(apis) >= self.max_instances:
+                _, evicted = apis.popitem(last=False)
+                self._end_api(evicted)
+            
+            kwargs = {"lang": self.lang, "oem": oem}
+            if self.tessdata_path:
+                kwargs["path"] = self.tessdata_path.rstrip("/\\") + "/"
+            if init_variables:
+                kwargs["variables"] = dict(init_variables)
+            
+            try:
+                api = self._tesserocr.PyTessBaseAPI(**kwargs)
+            except Exception as e:
+                raise BackendInitializationError(f"Não foi possível inicializar o tesserocr: {e}") from e
+            apis[key] = api
+            with self._lock:
+                self._all_apis.append(api)
+            logger.debug(f"Nova instância tesserocr criada (oem={oem}, variáveis={init_variables})")
+        
+        return api
+    
+    def _end_api(self, api) -> None:
+        """Finaliza uma API descartada do cache da thread."""
+        with self._lock:
+            if api in self._all_apis:
+                self._all_apis.remove(api)
+        try:
+            api.End()
+        except Exception as e:
+            logger.debug(f"Erro ao finalizar instância tesserocr: {e}")
+    
+    def image_to_data(self, img: Union[Image.Image, np.ndarray], config: str) -> Dict[str, List]:
+        oem, psm, variables = parse_tesseract_config(config)
+        init_variables = {k: v for k, v in variables.items() if k in INIT_ONLY_VARIABLES}
+        runtime_variables = {k: v for k, v in variables.items() if k not in INIT_ONLY_VARIABLES}
+        
+        api = self._get_api(oem, init_variables)
+        api.SetPageSegMode(psm)
+        
+        # Guarda os valores atuais para restaurar após a chamada
+        previous = {key: api.GetVariableAsString(key) for key in runtime_variables}
+        for key, value in runtime_variables.items():
+            api.SetVariable(key, value)
+        
+        try:
+            if isinstance(img, np.ndarray):
+                array = np.ascontiguousarray(img)
+                height, width = array.shape[:2]
+                bytes_per_pixel = 1 if array.ndim == 2 else array.shape[2]
+                api.SetImageBytes(array.tobytes(), width, height, bytes_per_pixel,
+                                  width * bytes_per_pixel)
+            else:
+                api.SetImage(img)
+            
+            return parse_tesseract_tsv(api.GetTSVText(0))
+        finally:
+            for key, value in previous.items():
+                api.SetVariable(key, value if value is not None else "")
+            api.Clear()
+    
+    def close(self) -> None:
+        with self._lock:
+            for api in self._all_apis:
+                try:
+                    api.End()
+                except Exception as e:
+                    logger.debug(f"Erro ao finalizar instância tesserocr: {e}")
+            self._all_apis = []
+        self._local = threading.local()
+
+
+# Backends compartilhados entre engines (o modelo é carregado uma vez por processo)
+_backend_cache: Dict[Tuple, OCRBackend] = {}
+_backend_cache_lock = threading.Lock()
+
+
+def create_ocr_backend(config: Optional[BotVisionConfig] = None) -> OCRBackend:
+    """
+    Cria (ou reutiliza) o backend de OCR definido na configuração.
+    
+    A opção ``ocr_backend`` aceita:
+        - "auto": usa tesserocr se disponível, senão pytesseract (padrão)
+        - "tesserocr": engine persistente (cai para pytesseract se indisponível)
+        - "pytesseract": um processo tesseract por chamada
+    
+    Args:
+        config (BotVisionConfig, optional): Configuração da biblioteca
+        
+    Returns:
+        OCRBackend: Backend pronto para uso
+        
+    Raises:
+        ConfigurationError: Se o backend informado for desconhecido
+    """
+    name = (config.get("ocr_backend", "auto") if config is not None else "auto") or "auto"
+    name = name.lower()
+    
+    if name not in ("auto", "tesserocr", "pytesseract"):
+        raise ConfigurationError(f"Backend de OCR desconhecido: '{name}'. "
+                                 f"Use 'auto', 'tesserocr' ou 'pytesseract'")
+    
+    languages = config.get("ocr_languages", ["eng"]) if config is not None else ["eng"]
+    lang = "+".join(languages) if isinstance(languages, (list, tuple)) else str(languages)
+    tessdata_path = config.get("tesseract_data_path") if config is not None else None
+    max_instances = config.get("ocr_tesserocr_instances", 4) if config is not None else 4
+    
+    key = (name, lang, tessdata_path, max_instances)
+    with _backend_cache_lock:
+        backend = _backend_cache.get(key)
+        if backend is not None:
+            return backend
+        
+        backend = None
+        if name in ("auto", "tesserocr"):
+            try:
+                backend = TesserocrBackend(lang, tessdata_path, max_instances)
+                logger.info("Usando backend de OCR persistente (tesserocr)")
+            except ImportError:
+                log = logger.warning if name == "tesserocr" else logger.debug
+                log("tesserocr não está instalado. Usando pytesseract como fallback "
+                    "(pip install bot-vision-suite[ocr])")
+        
+        if backend is None:
+            backend = PytesseractBackend()
+        
+        _backend_cache[key] = backend
+        return backend
+
+
 class OCREngine:
     """
     Engine de OCR com múltiplas configurações e processamento otimizado.
@@ -50,6 +676,7 @@ class OCREngine:
         """
         self.config = config or BotVisionConfig()
         self.image_processor = ImageProcessor()
+        self.backend = create_ocr_backend(self.config)
         
         # Configurações OCR otimizadas
         self.ocr_configs = [
@@ -69,8 +696,66 @@ class OCREngine:
             "both": {2: 2, 3: 1, 4: 2, 5: 1}      # Configurações gerais
         }
         
+        # Bônus para métodos prioritários (primeiros métodos são otimizados)
+        self.high_confidence_bonus = 8.0
+        
+        # Correspondência aproximada: distância de edição máxima por caractere do alvo
+        self.fuzzy_max_ratio = 0.0
+        if self.config.get("ocr_fuzzy", False):
+            self.fuzzy_max_ratio = float(self.config.get("ocr_fuzzy_max_ratio", 0.25))
+        
+        # Escalonador adaptativo: tenta primeiro as combinações que já venceram
+        self.scheduler = None
+        if self.config.get("ocr_adaptive_order", True):
+            self.scheduler = AdaptiveOCRScheduler(self.config.get("ocr_stats_path"))
+        
+        # Resultados por impressão digital da região: pixels iguais não repetem o OCR
+        self.result_cache = None
+        if self.config.get("ocr_result_cache", True):
+            self.result_cache = OCRResultCache(self.config.get("ocr_result_cache_size", 128),
+                                               self.config.get("ocr_dhash_tolerance", 0))
+        
+        # Pool de OCR paralelo (criado sob demanda) e estatísticas da última busca
+        self._executor = None
+        self._tile_pool = None
+        self._tile_local = threading.local()
+        self._stats_local = threading.local()
+        
         self._setup_tesseract()
     
+    def close(self) -> None:
+        """
+        Encerra os pools de OCR paralelo e de blocos.
+        
+        O backend não é encerrado: ele é compartilhado entre engines. Os pools
+        são recriados sob demanda se o engine voltar a ser usado.
+        """
+        executor, self._executor = self._executor, None
+        tile_pool, self._tile_pool = self._tile_pool, None
+        for pool in (executor, tile_pool):
+            if pool is not None:
+                pool.shutdown(wait=True)
+    
+    def __enter__(self) -> "OCREngine":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    @property
+    def last_run_stats(self) -> Dict[str, Any]:
+        """
+        Estatísticas da última busca feita pela thread atual.
+        
+        Buscas simultâneas em um engine compartilhado não sobrescrevem as
+        estatísticas umas das outras.
+        """
+        return getattr(self._stats_local, "stats", {})
+    
+    @last_run_stats.setter
+    def last_run_stats(self, stats: Dict[str, Any]) -> None:
+        self._stats_local.stats = stats
+    
     def _setup_tesseract(self) -> None:
         """Configura o Tesseract com as configurações atuais."""
         try:
@@ -80,7 +765,9 @@ class OCREngine:
             raise TesseractNotFoundError("Não foi possível configurar o Tesseract OCR")
     
     def find_text(self, region_img: Image.Image, target_text: str, filter_type: str = "both",
-                  early_confidence_threshold: float = 75.0) -> Tuple[List[Tuple], List[float], bool]:
+                  early_confidence_threshold: float = 75.0,
+                  region: Optional[Tuple[int, int, int, int]] = None,
+                  exhaustive: bool = False) -> Tuple[List[Tuple], List[float], bool]:
         """
         Encontra texto usando múltiplas versões pré-processadas da imagem.
         
@@ -89,6 +776,10 @@ class OCREngine:
             target_text (str): Texto a ser encontrado
             filter_type (str): Tipo de filtro ("numbers", "letters", "both")
             early_confidence_threshold (float): Limiar para retorno antecipado
+            region (tuple, optional): Região da tela de onde a imagem veio; compõe a
+                                    assinatura usada pelo escalonador adaptativo
+            exhaustive (bool): Se a detecção de texto não encontrar o alvo, executa a
+                               grade completa (usado na última tentativa)
             
         Returns:
             tuple: (boxes_encontradas, scores_confiança, encontrou_antecipado)
@@ -97,44 +788,596 @@ class OCREngine:
             OCRProcessingError: Se houver erro no processamento OCR
         """
         try:
-            # Pré-processa a imagem
-            processed_images = self.image_processor.preprocess_for_ocr(region_img)
+            if self.result_cache is not None:
+                cached = self.result_cache.get(region_img, target_text, filter_type,
+                                               early_confidence_threshold)
+                if cached is not None:
+                    logger.info(f"Região inalterada: reutilizando resultado do OCR para '{target_text}'")
+                    self.last_run_stats = {"cells": 0, "ocr_calls": 0, "cancelled": 0, "parallel": False,
+                                           "early_exit": cached[2], "cached": True}
+                    return cached
             
-            all_found_boxes = []
-            all_confidence_scores = []
+            # Regiões grandes: OCR de linha única apenas nos recortes com cara de texto
+            if self._text_detection_enabled(region_img):
+                detected = self._find_in_text_regions(region_img, target_text, filter_type,
+                                                      early_confidence_threshold)
+                if detected is not None and (detected[0] or not exhaustive):
+                    results, early_match = detected
+                    found = ([r.box for r in results], [r.confidence for r in results], early_match)
+                    # Falha da detecção não é definitiva: a grade completa ainda pode achar o alvo
+                    if results and self.result_cache is not None:
+                        self.result_cache.put(region_img, target_text, filter_type,
+                                              early_confidence_threshold, found)
+                    return found
+            
+            # Tela inteira: blocos sobrepostos processados em paralelo
+            if self._tiling_enabled(region_img):
+                found = self._find_text_tiled(region_img, target_text, filter_type,
+                                              early_confidence_threshold)
+                if self.result_cache is not None:
+                    self.result_cache.put(region_img, target_text, filter_type,
+                                          early_confidence_threshold, found)
+                return found
+            
+            # Pré-processamento sob demanda: cada variação só é gerada quando o OCR a pede
+            ocr_img, scale = self._normalize_text_height(region_img)
+            processed_images = self.image_processor.preprocess_for_ocr_lazy(ocr_img, scale)
             
             logger.info(f"Buscando texto '{target_text}' com limiar de {early_confidence_threshold}%")
             
-            # Bônus para métodos prioritários (primeiros métodos são otimizados)
-            high_confidence_bonus = 8.0
+            # Grade (imagem pré-processada x configuração OCR) sem as configurações inviáveis
+            config_indices = self._plan_configs([target_text], filter_type, ocr_img.height)
+            cells = [
+                (img_index, config_index)
+                for img_index in range(len(processed_images))
+                for config_index in config_indices
+            ]
+            skipped = len(processed_images) * (len(self.ocr_configs) - len(config_indices))
+            if skipped:
+                logger.debug(f"Planejador de OCR: {skipped} células descartadas "
+                             f"(configurações mantidas: {config_indices})")
             
-            # Processa cada imagem pré-processada
-            for img_index, img in enumerate(processed_images):
-                for config_index, config in enumerate(self.ocr_configs):
-                    results = self._process_single_image(
-                        img, target_text, filter_type, config_index, config,
-                        img_index, len(processed_images), high_confidence_bonus
-                    )
-                    
-                    for result in results:
-                        # Verifica se encontrou com alta confiança
-                        if result.confidence >= early_confidence_threshold:
-                            logger.info(f">>> Detecção com alta confiança ({result.confidence:.2f}%) encontrada!")
-                            return [result.box], [result.confidence], True
-                        
-                        # Adiciona aos resultados gerais
-                        all_found_boxes.append(result.box)
-                        all_confidence_scores.append(result.confidence)
+            # Tenta primeiro as células que já venceram buscas equivalentes
+            signature = make_task_signature(target_text, filter_type, region)
+            if self.scheduler is not None:
+                cells = self.scheduler.order(signature, cells)
             
-            return all_found_boxes, all_confidence_scores, False
+            self.last_run_stats = {"cells": len(cells), "ocr_calls": 0, "cancelled": 0,
+                                   "parallel": self._parallel_enabled(), "early_exit": False,
+                                   "cached": False, "scale": scale, "skipped_cells": skipped,
+                                   "configs": config_indices}
+            
+            if self.last_run_stats["parallel"]:
+                results, early_match = self._run_cells_parallel(
+                    processed_images, cells, target_text, filter_type, early_confidence_threshold)
+            else:
+                results, early_match = self._run_cells_sequential(
+                    processed_images, cells, target_text, filter_type, early_confidence_threshold)
+            
+            self.last_run_stats["early_exit"] = early_match
+            self.last_run_stats["variants_computed"] = processed_images.computed
+            
+            # Sem retorno antecipado, mantém a ordem padrão da grade (usada por 'occurrence')
+            if not early_match:
+                results.sort(key=lambda r: (r.method_index, r.config_index))
+            
+            if results and self.scheduler is not None:
+                winner = max(results, key=lambda r: r.confidence)
+                self.scheduler.record(signature, winner.method_index, winner.config_index)
+            
+            found = ([r.box for r in results], [r.confidence for r in results], early_match)
+            if self.result_cache is not None:
+                self.result_cache.put(region_img, target_text, filter_type,
+                                      early_confidence_threshold, found)
+            return found
             
         except Exception as e:
             logger.error(f"Erro no processamento OCR: {e}")
             raise OCRProcessingError(f"Falha na busca de texto: {e}")
     
+    def find_texts(self, region_img: Image.Image, targets: List[str], filter_type: str = "both",
+                   early_confidence_threshold: float = 75.0,
+                   region: Optional[Tuple[int, int, int, int]] = None) -> Dict[str, Optional[Tuple]]:
+        """
+        Encontra vários textos na mesma imagem com uma única passada de OCR.
+        
+        Cada célula da grade (imagem pré-processada x configuração) é executada
+        uma única vez e todos os alvos são procurados no mesmo resultado do
+        Tesseract. A busca para assim que todos os alvos atingem o limiar
+        antecipado.
+        
+        Args:
+            region_img (PIL.Image): Imagem da região onde buscar
+            targets (list): Textos a serem encontrados
+            filter_type (str): Tipo de filtro ("numbers", "letters", "both")
+            early_confidence_threshold (float): Limiar a partir do qual um alvo
+                                               é considerado encontrado
+            region (tuple, optional): Região da tela de onde a imagem veio; compõe a
+                                    assinatura usada pelo escalonador adaptativo
+            
+        Returns:
+            dict: Texto alvo -> box (x, y, width, height) de maior confiança, ou
+                  None se não encontrado. As confianças ficam em
+                  ``last_run_stats["confidences"]``
+            
+        Raises:
+            OCRProcessingError: Se houver erro no processamento OCR
+        """
+        try:
+            targets = list(dict.fromkeys(targets))
+            if not targets:
+                return {}
+            best = {target: None for target in targets}
+            
+            ocr_img, scale = self._normalize_text_height(region_img)
+            processed_images = self.image_processor.preprocess_for_ocr_lazy(ocr_img, scale)
+            
+            logger.info(f"Buscando {len(targets)} textos com limiar de {early_confidence_threshold}%")
+            
+            config_indices = self._plan_configs(targets, filter_type, ocr_img.height)
+            cells = [
+                (img_index, config_index)
+                for img_index in range(len(processed_images))
+                for config_index in config_indices
+            ]
+            skipped = len(processed_images) * (len(self.ocr_configs) - len(config_indices))
+            
+            signature = make_task_signature("\n".join(sorted(targets)), filter_type, region)
+            if self.scheduler is not None:
+                cells = self.scheduler.order(signature, cells)
+            
+            self.last_run_stats = {"cells": len(cells), "ocr_calls": 0, "cancelled": 0,
+                                   "parallel": False, "early_exit": False, "cached": False,
+                                   "scale": scale, "skipped_cells": skipped, "configs": config_indices}
+            pending = set(targets)
+            
+            all_targets = " ".join(targets)
+            for img_index, config_index in cells:
+                config = self._cell_config(config_index, all_targets, filter_type)
+                self.last_run_stats["ocr_calls"] += 1
+                try:
+                    data = self._image_to_data(processed_images[img_index], config)
+                except ImportError:
+                    raise OCRProcessingError("pytesseract não está instalado")
+                except Exception as e:
+                    logger.debug(f"Erro em OCR com configuração {config}: {e}")
+                    continue
+                
+                # Um único resultado do Tesseract atende a todos os alvos
+                words = OCRWords(data, filter_type, scale)
+                for target in targets:
+                    for result in self._match_target(words, target, filter_type,
+                                                     config_index, img_index, self.high_confidence_bonus):
+                        if best[target] is None or result.confidence > best[target].confidence:
+                            best[target] = result
+                    if best[target] is not None and best[target].confidence >= early_confidence_threshold:
+                        pending.discard(target)
+                
+                if not pending:
+                    logger.info(f">>> Todos os {len(targets)} textos encontrados com alta confiança")
+                    self.last_run_stats["early_exit"] = True
+                    break
+            
+            self.last_run_stats["variants_computed"] = processed_images.computed
+            self.last_run_stats["confidences"] = {
+                target: result.confidence for target, result in best.items() if result is not None
+            }
+            
+            if self.scheduler is not None:
+                for result in best.values():
+                    if result is not None:
+                        self.scheduler.record(signature, result.method_index, result.config_index)
+            
+            return {target: (result.box if result is not None else None)
+                    for target, result in best.items()}
+            
+        except OCRProcessingError:
+            raise
+        except Exception as e:
+            logger.error(f"Erro no processamento OCR: {e}")
+            raise OCRProcessingError(f"Falha na busca de textos: {e}")
+    
+    def _cell_config(self, config_index: int, target_text: str, filter_type: str) -> str:
+        """
+        Configuração do Tesseract de uma célula da grade.
+        
+        Com ``ocr_target_constraints`` habilitado, a configuração recebe a
+        whitelist derivada do filtro e do alvo e desliga os dicionários do
+        idioma; com ``ocr_user_words``, também os user-words/patterns do alvo.
+        
+        Args:
+            config_index (int): Índice da configuração OCR
+            target_text (str): Texto alvo (ou alvos separados por espaço)
+            filter_type (str): Tipo de filtro
+            
+        Returns:
+            str: Configuração no formato da CLI
+        """
+        config = self.ocr_configs[config_index]
+        if not self.config.get("ocr_target_constraints", False):
+            return config
+        return _target_config(config, target_text, filter_type,
+                              bool(self.config.get("ocr_user_words", False)))
+    
+    def _plan_configs(self, target_texts: List[str], filter_type: str, image_height: int) -> List[int]:
+        """
+        Configurações da grade usadas na busca (ver plan_ocr_configs).
+        
+        Args:
+            target_texts (list): Textos alvo (a união dos planos é usada)
+            filter_type (str): Tipo de filtro
+            image_height (int): Altura da imagem enviada ao OCR
+            
+        Returns:
+            list: Índices das configurações, na ordem original
+        """
+        if not self.config.get("ocr_config_planner", True):
+            return list(range(len(self.ocr_configs)))
+        
+        single_line_height = None
+        if self.config.get("ocr_prune_page_modes", False):
+            single_line_height = self.config.get("ocr_single_line_height", 48)
+        
+        planned = set()
+        for target_text in target_texts:
+            planned.update(plan_ocr_configs(self.ocr_configs, target_text, filter_type,
+                                            image_height, single_line_height))
+        return sorted(planned)
+    
+    def _normalize_text_height(self, region_img: Image.Image) -> Tuple[Image.Image, float]:
+        """
+        Redimensiona a região para a altura de texto configurada (se habilitado).
+        
+        Returns:
+            tuple: (imagem para o OCR, fator de escala em relação à região)
+        """
+        if not self.config.get("ocr_normalize_text_height", False):
+            return region_img, 1.0
+        return self.image_processor.normalize_text_height(
+            region_img, self.config.get("ocr_target_text_height", 22.0))
+    
+    def _text_detection_enabled(self, region_img: Image.Image) -> bool:
+        """Indica se a região é grande o bastante para passar pela detecção de texto."""
+        if not self.config.get("ocr_text_detection", False):
+            return False
+        width, height = region_img.size
+        return width * height >= self.config.get("ocr_detection_min_area", 250000)
+    
+    def _line_configs(self, target_text: str, filter_type: str) -> List[int]:
+        """Índices das configurações de linha/palavra única adequadas ao alvo."""
+        single_word = len(target_text.split()) <= 1
+        if filter_type == "numbers":
+            return [0, 1] if single_word else [0]
+        return [4, 5] if single_word else [4]
+    
+    def _find_in_text_regions(self, region_img: Image.Image, target_text: str, filter_type: str,
+                              early_confidence_threshold: float) -> Optional[Tuple[List[OCRResult], bool]]:
+        """
+        Procura o texto apenas nas caixas propostas pela detecção de texto.
+        
+        As caixas são ordenadas pela proporção esperada para o alvo e cada
+        recorte passa pelas primeiras variações de pré-processamento com
+        configurações de linha única (PSM 7/8). Se houver caixas e nenhuma
+        contiver o alvo, a busca termina sem resultados; a grade completa só é
+        executada quando ``find_text`` recebe ``exhaustive=True``.
+        
+        Args:
+            region_img (PIL.Image): Imagem da região onde buscar
+            target_text (str): Texto alvo
+            filter_type (str): Tipo de filtro
+            early_confidence_threshold (float): Limiar para retorno antecipado
+            
+        Returns:
+            tuple or None: (resultados, encontrou_antecipado) em coordenadas da região,
+                           ou None se a detecção não encontrou nenhuma caixa de texto
+        """
+        rgb = region_img.convert("RGB")
+        boxes = detect_text_regions(np.asarray(rgb), merge_gap=self.config.get("ocr_detection_merge_gap", 9))
+        boxes = rank_text_regions(boxes, target_text)[:self.config.get("ocr_detection_max_regions", 20)]
+        config_indices = self._line_configs(target_text, filter_type)
+        max_variants = self.config.get("ocr_detection_variants", 3)
+        
+        self.last_run_stats = {"cells": 0, "ocr_calls": 0, "cancelled": 0, "parallel": False,
+                               "early_exit": False, "cached": False, "text_regions": len(boxes)}
+        logger.debug(f"Detecção de texto: {len(boxes)} recortes candidatos para '{target_text}'")
+        if not boxes:
+            return None
+        
+        all_results = []
+        for box in boxes:
+            pad = max(2, box.height // 4)
+            left, top = max(0, box.left - pad), max(0, box.top - pad)
+            right = min(rgb.width, box.left + box.width + pad)
+            bottom = min(rgb.height, box.top + box.height + pad)
+            processed_images = self.image_processor.preprocess_for_ocr_lazy(rgb.crop((left, top, right, bottom)))
+            
+            for img_index in range(min(max_variants, len(processed_images))):
+                for config_index in config_indices:
+                    self.last_run_stats["cells"] += 1
+                    self.last_run_stats["ocr_calls"] += 1
+                    try:
+                        data = self._image_to_data(processed_images[img_index],
+                                                   self._cell_config(config_index, target_text, filter_type))
+                    except ImportError:
+                        raise OCRProcessingError("pytesseract não está instalado")
+                    except Exception as e:
+                        logger.debug(f"Erro em OCR do recorte {tuple(box)}: {e}")
+                        continue
+                    
+                    for result in self._match_target(OCRWords(data, filter_type), target_text, filter_type,
+                                                     config_index, img_index, self.high_confidence_bonus):
+                        x, y, w, h = result.box
+                        result.box = (x + left, y + top, w, h)
+                        if result.confidence >= early_confidence_threshold:
+                            logger.info(f">>> Detecção com alta confiança ({result.confidence:.2f}%) encontrada!")
+                            self.last_run_stats["early_exit"] = True
+                            return [result], True
+                        all_results.append(result)
+        
+        all_results.sort(key=lambda r: (r.method_index, r.config_index, r.box[1], r.box[0]))
+        return all_results, False
+    
+    def _tiling_enabled(self, region_img: Image.Image) -> bool:
+        """Indica se a região deve ser dividida em blocos processados em paralelo."""
+        if not self.config.get("ocr_tiled", False):
+            return False
+        width, height = region_img.size
+        return width * height >= self.config.get("ocr_tile_min_area", 1000000)
+    
+    def _get_tile_pool(self):
+        """
+        Retorna o pool dos blocos (threads ou processos), criando-o na primeira chamada.
+        
+        O padrão é um pool de threads: cada chamada do pytesseract já é um
+        processo próprio e o tesserocr libera o GIL. Com ``ocr_tile_pool`` igual
+        a "process", o Windows inicia os workers com spawn, que importa de novo
+        o ``__main__``; o script do bot precisa então do guarda
+        ``if __name__ == "__main__":``.
+        """
+        if self._tile_pool is None:
+            workers = self.config.get("ocr_tile_workers") or self._max_workers()
+            if self.config.get("ocr_tile_pool", "thread") == "process":
+                self._tile_pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_tile_worker,
+                                                      initargs=(_portable_config(self.config),))
+            else:
+                self._tile_pool = ThreadPoolExecutor(max_workers=workers,
+                                                     thread_name_prefix="bot_vision_ocr_tile")
+        return self._tile_pool
+    
+    def _find_text_tiled(self, region_img: Image.Image, target_text: str, filter_type: str,
+                         early_confidence_threshold: float) -> Tuple[List[Tuple], List[float], bool]:
+        """
+        Procura o texto dividindo a imagem em blocos sobrepostos.
+        
+        Cada bloco passa pela grade completa em um worker do pool. A
+        sobreposição cobre ao menos a altura do texto e a largura estimada do
+        alvo, para que nenhuma ocorrência fique cortada em todos os blocos; se
+        o alvo não couber em metade do bloco, o bloco é aumentado. As
+        ocorrências repetidas nas emendas são removidas por IoU.
+        
+        No retorno antecipado apenas os blocos ainda na fila são cancelados;
+        os que já estão em execução terminam a grade em segundo plano.
+        
+        Args:
+            region_img (PIL.Image): Imagem da região onde buscar
+            target_text (str): Texto alvo
+            filter_type (str): Tipo de filtro
+            early_confidence_threshold (float): Limiar para retorno antecipado
+            
+        Returns:
+            tuple: (boxes_encontradas, scores_confiança, encontrou_antecipado)
+        """
+        overlap = max(self.config.get("ocr_tile_overlap", 48),
+                      int(len(target_text) * CHAR_ASPECT * TILE_GLYPH_HEIGHT))
+        tile_size = max(self.config.get("ocr_tile_size", 640), 2 * overlap)
+        tiles = split_tiles(region_img.width, region_img.height, tile_size, overlap)
+        pixels = np.asarray(region_img.convert("RGB"))
+        
+        logger.info(f"Buscando texto '{target_text}' em {len(tiles)} blocos de {tile_size}px")
+        self.last_run_stats = {"cells": 0, "ocr_calls": 0, "cancelled": 0, "parallel": True,
+                               "early_exit": False, "cached": False, "tiles": len(tiles)}
+        
+        pool = self._get_tile_pool()
+        worker = _ocr_tile if isinstance(pool, ProcessPoolExecutor) else self._ocr_tile_thread
+        futures = {
+            pool.submit(worker, pixels[y:y + h, x:x + w], target_text, filter_type,
+                        early_confidence_threshold): (x, y)
+            for x, y, w, h in tiles
+        }
+        
+        boxes, scores = [], []
+        try:
+            for future in as_completed(futures):
+                tile_boxes, tile_scores, early, stats = future.result()
+                x, y = futures[future]
+                self.last_run_stats["cells"] += stats.get("cells", 0)
+                self.last_run_stats["ocr_calls"] += stats.get("ocr_calls", 0)
+                tile_boxes = [(bx + x, by + y, bw, bh) for bx, by, bw, bh in tile_boxes]
+                
+                if early and tile_boxes:
+                    logger.info(f">>> Detecção com alta confiança ({tile_scores[0]:.2f}%) no bloco {(x, y)}")
+                    self.last_run_stats["early_exit"] = True
+                    return [tile_boxes[0]], [tile_scores[0]], True
+                
+                boxes.extend(tile_boxes)
+                scores.extend(tile_scores)
+        finally:
+            self.last_run_stats["cancelled"] = sum(1 for future in futures if future.cancel())
+        
+        if not boxes:
+            return [], [], False
+        
+        # Remove as ocorrências repetidas nas emendas e devolve em ordem de leitura
+        keep = non_max_suppression(np.array(boxes), np.array(scores), overlap=0.5)
+        keep = sorted(keep, key=lambda i: (boxes[i][1], boxes[i][0]))
+        return [boxes[i] for i in keep], [scores[i] for i in keep], False
+    
+    def _ocr_tile_thread(self, pixels: np.ndarray, target_text: str, filter_type: str,
+                         early_confidence_threshold: float):
+        """Executa a busca de um bloco em uma thread (engine próprio por thread)."""
+        engine = getattr(self._tile_local, "engine", None)
+        if engine is None:
+            engine = self._tile_local.engine = OCREngine(_TileConfig(self.config))
+        return _search_tile(engine, pixels, target_text, filter_type, early_confidence_threshold)
+    
+    def _run_cells_sequential(self, processed_images, cells: List[Tuple[int, int]],
+                              target_text: str, filter_type: str,
+                              early_confidence_threshold: float) -> Tuple[List[OCRResult], bool]:
+        """
+        Executa as células da grade em sequência, parando no primeiro resultado
+        acima do limiar antecipado.
+        
+        Returns:
+            tuple: (resultados, encontrou_antecipado)
+        """
+        all_results = []
+        
+        for img_index, config_index in cells:
+            self.last_run_stats["ocr_calls"] += 1
+            results = self._run_cell(processed_images, img_index, config_index,
+                                     target_text, filter_type)
+            
+            for result in results:
+                # Verifica se encontrou com alta confiança
+                if result.confidence >= early_confidence_threshold:
+                    logger.info(f">>> Detecção com alta confiança ({result.confidence:.2f}%) encontrada!")
+                    return [result], True
+                
+                # Adiciona aos resultados gerais
+                all_results.append(result)
+        
+        return all_results, False
+    
+    def _run_cell(self, processed_images, img_index: int, config_index: int,
+                  target_text: str, filter_type: str) -> List[OCRResult]:
+        """
+        Executa uma célula da grade (uma imagem pré-processada com uma configuração).
+        
+        Args:
+            processed_images (sequence): Imagens pré-processadas
+            img_index (int): Índice da imagem
+            config_index (int): Índice da configuração OCR
+            target_text (str): Texto alvo
+            filter_type (str): Tipo de filtro
+            
+        Returns:
+            list: Lista de OCRResult encontrados
+        """
+        return self._process_single_image(
+            processed_images[img_index], target_text, filter_type, config_index,
+            self._cell_config(config_index, target_text, filter_type), img_index, len(processed_images),
+            self.high_confidence_bonus, scale=getattr(processed_images, "scale", 1.0)
+        )
+    
+    def _parallel_enabled(self) -> bool:
+        """Indica se a grade de OCR deve ser executada em paralelo."""
+        return bool(self.config.get("ocr_parallel", False)) and self._max_workers() > 1
+    
+    def _max_workers(self) -> int:
+        """Número de workers do pool de OCR (padrão: número de CPUs)."""
+        workers = self.config.get("ocr_max_workers")
+        if not workers:
+            workers = os.cpu_count() or 1
+        return max(1, int(workers))
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Retorna o pool de threads do engine, criando-o na primeira chamada."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers(),
+                                                thread_name_prefix="bot_vision_ocr")
+        return self._executor
+    
+    def _run_cells_parallel(self, processed_images, cells: List[Tuple[int, int]],
+                            target_text: str, filter_type: str,
+                            early_confidence_threshold: float) -> Tuple[List[OCRResult], bool]:
+        """
+        Executa as células da grade em paralelo.
+        
+        Cada chamada do Tesseract é independente (e libera o GIL), então as
+        células são distribuídas em um pool de threads. Assim que um resultado
+        ultrapassa o limiar antecipado, as células pendentes são canceladas.
+        Sem retorno antecipado, os resultados são devolvidos na mesma ordem da
+        execução sequencial. As estatísticas são atualizadas apenas nesta
+        thread, à medida que as células terminam.
+        
+        Args:
+            processed_images (sequence): Imagens pré-processadas
+            cells (list): Células (img_index, config_index) a executar
+            target_text (str): Texto alvo
+            filter_type (str): Tipo de filtro
+            early_confidence_threshold (float): Limiar para retorno antecipado
+            
+        Returns:
+            tuple: (resultados, encontrou_antecipado)
+        """
+        stop_event = threading.Event()
+        
+        def run(cell):
+            if stop_event.is_set():
+                return None  # Célula pulada após a detecção antecipada
+            return self._run_cell(processed_images, cell[0], cell[1], target_text, filter_type)
+        
+        stats = self.last_run_stats
+        
+        executor = self._get_executor()
+        futures = {executor.submit(run, cell): position for position, cell in enumerate(cells)}
+        results_by_position = {}
+        
+        try:
+            for future in as_completed(futures):
+                results = future.result()
+                if results is None:
+                    continue
+                stats["ocr_calls"] += 1
+                
+                for result in results:
+                    if result.confidence >= early_confidence_threshold:
+                        logger.info(f">>> Detecção com alta confiança ({result.confidence:.2f}%) encontrada!")
+                        return [result], True
+                
+                results_by_position[futures[future]] = results
+        finally:
+            stop_event.set()
+            cancelled = sum(1 for future in futures if future.cancel())
+            stats["cancelled"] = cancelled
+            if cancelled:
+                logger.debug(f"{cancelled} chamadas de OCR canceladas após detecção antecipada")
+        
+        all_results = []
+        for position in sorted(results_by_position):
+            all_results.extend(results_by_position[position])
+        
+        return all_results, False
+    
+    def _image_to_data(self, img: Union[Image.Image, np.ndarray], config: str) -> Dict[str, List]:
+        """
+        Executa OCR usando o backend configurado, com fallback para o pytesseract.
+        
+        Apenas falhas de inicialização do backend trocam o engine para o
+        pytesseract; erros de uma chamada são repassados e afetam só a célula.
+        
+        Args:
+            img (PIL.Image or numpy.ndarray): Imagem a ser processada
+            config (str): Configuração do Tesseract
+            
+        Returns:
+            dict: Dados no formato do pytesseract.image_to_data
+        """
+        if isinstance(self.backend, PytesseractBackend):
+            return self.backend.image_to_data(img, config)
+        
+        try:
+            return self.backend.image_to_data(img, config)
+        except BackendInitializationError as e:
+            logger.warning(f"Falha no backend '{self.backend.name}' ({e}). "
+                           f"Usando pytesseract como fallback")
+            self.backend = PytesseractBackend()
+            return self.backend.image_to_data(img, config)
+    
     def _process_single_image(self, img: Image.Image, target_text: str, filter_type: str,
                              config_index: int, config: str, img_index: int, 
-                             total_images: int, high_confidence_bonus: float) -> List[OCRResult]:
+                             total_images: int, high_confidence_bonus: float,
+                             scale: float = 1.0) -> List[OCRResult]:
         """
         Processa uma única imagem com uma configuração específica de OCR.
         
@@ -147,21 +1390,18 @@ class OCREngine:
             img_index (int): Índice da imagem processada
             total_images (int): Total de imagens
             high_confidence_bonus (float): Bônus de confiança
+            scale (float): Fator aplicado à imagem em relação à região original
             
         Returns:
             list: Lista de OCRResult encontrados
         """
         try:
-            import pytesseract
-            
             # Executa OCR
-            data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT, config=config)
-            
-            # Filtra palavras reconhecidas
-            recognized_words = [limpar_texto(w, filter_type) for w in data['text'] if w.strip()]
-            recognized_words = [w for w in recognized_words if matches_filter(w, filter_type)]
+            data = self._image_to_data(img, config)
+            words = OCRWords(data, filter_type, scale)
             
             # Log para debug
+            recognized_words = [w for w in words.cleaned if w]
             if filter_type == "numbers" and recognized_words:
                 logger.debug(f"OCR Numbers (método {img_index+1}/{total_images}): {recognized_words}")
             elif filter_type == "both":
@@ -169,32 +1409,8 @@ class OCREngine:
                 if numeric_words:
                     logger.debug(f"OCR Numbers (método {img_index+1}/{total_images}): {numeric_words}")
             
-            # Processa texto alvo
-            target_words = [limpar_texto(word, filter_type) for word in target_text.split()]
-            target_words = [w for w in target_words if matches_filter(w, filter_type)]
-            n_words = len(target_words)
-            
-            results = []
-            
-            # Busca combinações de palavras
-            for idx in range(len(data['text']) - n_words + 1):
-                candidate = [limpar_texto(data['text'][j], filter_type) for j in range(idx, idx + n_words)]
-                
-                if not all(candidate) or not all(matches_filter(word, filter_type) for word in candidate):
-                    continue
-                
-                # Verifica correspondência
-                if all(candidate[k].lower() == target_words[k].lower() for k in range(n_words)):
-                    result = self._create_ocr_result(
-                        data, idx, n_words, candidate, config_index, filter_type,
-                        img_index, high_confidence_bonus
-                    )
-                    
-                    if result:
-                        results.append(result)
-                        logger.debug(f"Encontrado '{' '.join(candidate)}' com confiança: {result.confidence:.2f}%")
-            
-            return results
+            return self._match_target(words, target_text, filter_type,
+                                      config_index, img_index, high_confidence_bonus)
             
         except ImportError:
             raise OCRProcessingError("pytesseract não está instalado")
@@ -202,48 +1418,94 @@ class OCREngine:
             logger.debug(f"Erro em OCR com configuração {config}: {e}")
             return []
     
-    def _create_ocr_result(self, data: Dict, idx: int, n_words: int, candidate: List[str],
+    def _match_target(self, words: OCRWords, target_text: str, filter_type: str,
+                      config_index: int, img_index: int,
+                      high_confidence_bonus: float) -> List[OCRResult]:
+        """
+        Procura o texto alvo nas palavras de uma única execução do OCR.
+        
+        Args:
+            words (OCRWords): Saída normalizada do Tesseract
+            target_text (str): Texto alvo
+            filter_type (str): Tipo de filtro
+            config_index (int): Índice da configuração
+            img_index (int): Índice da imagem processada
+            high_confidence_bonus (float): Bônus de confiança
+            
+        Returns:
+            list: Lista de OCRResult encontrados
+        """
+        # Processa texto alvo
+        target_words = [limpar_texto(word, filter_type) for word in target_text.split()]
+        target_words = [w.lower() for w in target_words if matches_filter(w, filter_type)]
+        n_words = len(target_words)
+        
+        results = []
+        
+        # Busca as ocorrências a partir do índice da primeira palavra
+        matches = [(idx, 0.0) for idx in words.find(target_words)]
+        
+        # Sem correspondência exata, aceita trocas típicas do OCR ("0"/"o", "1"/"l"...)
+        if not matches and self.fuzzy_max_ratio > 0:
+            matches = words.find_fuzzy(target_words, self.fuzzy_max_ratio)
+        
+        target_length = sum(len(word) for word in target_words)
+        for idx, distance in matches:
+            result = self._create_ocr_result(
+                words, idx, n_words, config_index, filter_type,
+                img_index, high_confidence_bonus, 1.0 - distance / target_length
+            )
+            
+            if result:
+                results.append(result)
+                logger.debug(f"Encontrado '{result.text}' com confiança: {result.confidence:.2f}%")
+        
+        return results
+    
+    def _create_ocr_result(self, words: OCRWords, idx: int, n_words: int,
                           config_index: int, filter_type: str, img_index: int,
-                          high_confidence_bonus: float) -> Optional[OCRResult]:
+                          high_confidence_bonus: float, similarity: float = 1.0) -> Optional[OCRResult]:
         """
         Cria um OCRResult a partir dos dados do Tesseract.
         
         Args:
-            data (dict): Dados retornados pelo Tesseract
+            words (OCRWords): Saída normalizada do Tesseract
             idx (int): Índice inicial da palavra
             n_words (int): Número de palavras
-            candidate (list): Palavras candidatas
             config_index (int): Índice da configuração
             filter_type (str): Tipo de filtro
             img_index (int): Índice da imagem
             high_confidence_bonus (float): Bônus de confiança
+            similarity (float): Semelhança com o alvo (1.0 para correspondência exata);
+                               multiplica a confiança média
             
         Returns:
             OCRResult or None: Resultado do OCR ou None se inválido
         """
         try:
-            # Calcula confiança média
-            confidence_values = [
-                float(data['conf'][j]) for j in range(idx, idx + n_words) 
-                if float(data['conf'][j]) > 0
-            ]
-            
-            if confidence_values:
-                avg_confidence = sum(confidence_values) / len(confidence_values)
-            else:
-                avg_confidence = 0
+            span = slice(idx, idx + n_words)
             
-            # Calcula bounding box
-            lefts = [data['left'][j] for j in range(idx, idx + n_words)]
-            tops = [data['top'][j] for j in range(idx, idx + n_words)]
-            rights = [data['left'][j] + data['width'][j] for j in range(idx, idx + n_words)]
-            bottoms = [data['top'][j] + data['height'][j] for j in range(idx, idx + n_words)]
+            # Calcula confiança média (valores não positivos são ignorados)
+            confidences = words.conf[span]
+            positive = confidences[confidences > 0]
+            avg_confidence = float(positive.mean()) * similarity if positive.size else 0
             
+            # Calcula bounding box (mapeada de volta se a imagem foi redimensionada)
+            if words.scale == 1.0:
+                left = int(words.left[span].min())
+                top = int(words.top[span].min())
+                right = int(words.right[span].max())
+                bottom = int(words.bottom[span].max())
+            else:
+                left = int(np.floor(words.left[span].min() / words.scale))
+                top = int(np.floor(words.top[span].min() / words.scale))
+                right = int(np.ceil(words.right[span].max() / words.scale))
+                bottom = int(np.ceil(words.bottom[span].max() / words.scale))
             box = (
-                min(lefts),
-                min(tops),
-                max(rights) - min(lefts),
-                max(bottoms) - min(tops)
+                left,
+                top,
+                right - left,
+                bottom - top
             )
             
             # Calcula bônus de confiança
@@ -257,7 +1519,7 @@ class OCREngine:
             final_confidence = avg_confidence + config_bonus + method_bonus
             
             return OCRResult(
-                text=' '.join(candidate),
+                text=' '.join(words.cleaned[span]),
                 confidence=final_confidence,
                 box=box,
                 method_index=img_index,
@@ -268,6 +1530,35 @@ class OCREngine:
             logger.debug(f"Erro ao criar OCRResult: {e}")
             return None
     
+    def image_to_data(self, img: Union[Image.Image, np.ndarray], config: str) -> Dict[str, List]:
+        """
+        Executa uma chamada de OCR com o backend do engine.
+        
+        Args:
+            img (PIL.Image or numpy.ndarray): Imagem a ser processada
+            config (str): Configuração do Tesseract
+            
+        Returns:
+            dict: Dados no formato do pytesseract.image_to_data
+        """
+        return self._image_to_data(img, config)
+    
+    def map(self, func: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """
+        Aplica uma função a cada item no pool de threads do engine.
+        
+        Permite que outros componentes (por exemplo, o índice de texto da tela)
+        dividam o OCR em partes sem criar pools próprios.
+        
+        Args:
+            func (callable): Função executada para cada item
+            items (iterable): Itens a processar
+            
+        Returns:
+            list: Resultados, na ordem dos itens
+        """
+        return list(self._get_executor().map(func, items))
+    
     def extract_all_text(self, img: Image.Image, filter_type: str = "both") -> List[OCRResult]:
         """
         Extrai todo o texto encontrado na imagem.
@@ -280,11 +1571,9 @@ class OCREngine:
             list: Lista de OCRResult com todo texto encontrado
         """
         try:
-            import pytesseract
-            
             # Usa configuração padrão para extração completa
             config = r'--oem 3 --psm 6'
-            data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT, config=config)
+            data = self._image_to_data(img, config)
             
             results = []
             
@@ -313,6 +1602,64 @@ class OCREngine:
             raise OCRProcessingError(f"Falha na extração: {e}")
 
 
+# Altura de glifo (px) usada para estimar a largura do alvo na sobreposição dos blocos
+TILE_GLYPH_HEIGHT = 20
+
+# Opções desligadas dentro dos workers de bloco (evita recursão e estado compartilhado)
+_TILE_WORKER_OVERRIDES = {
+    "ocr_tiled": False,
+    "ocr_text_detection": False,
+    "ocr_parallel": False,
+    "ocr_result_cache": False,
+    "ocr_stats_path": None,
+}
+
+_tile_engine = None
+
+
+class _TileConfig:
+    """Visão da configuração com as opções de _TILE_WORKER_OVERRIDES aplicadas."""
+    
+    def __init__(self, config):
+        self._config = config
+    
+    def get(self, key, default=None):
+        if key in _TILE_WORKER_OVERRIDES:
+            return _TILE_WORKER_OVERRIDES[key]
+        return self._config.get(key, default)
+    
+    def setup_tesseract(self) -> None:
+        self._config.setup_tesseract()
+
+
+def _portable_config(config) -> Dict[str, Any]:
+    """Converte a configuração em um dicionário que pode ser enviado a outro processo."""
+    values = config.to_dict() if hasattr(config, "to_dict") else dict(config)
+    portable = (str, int, float, bool, type(None), list, tuple, dict)
+    return {key: value for key, value in values.items() if isinstance(value, portable)}
+
+
+def _init_tile_worker(config_dict: Dict[str, Any]) -> None:
+    """Inicializa o engine de OCR de um processo do pool de blocos."""
+    global _tile_engine
+    config_dict = dict(config_dict, **_TILE_WORKER_OVERRIDES)
+    _tile_engine = OCREngine(BotVisionConfig(config_dict))
+
+
+def _search_tile(engine: "OCREngine", pixels: np.ndarray, target_text: str, filter_type: str,
+                 early_confidence_threshold: float):
+    """Executa a grade completa em um bloco e devolve também as estatísticas da busca."""
+    boxes, scores, early = engine.find_text(Image.fromarray(pixels), target_text, filter_type,
+                                            early_confidence_threshold)
+    return boxes, scores, early, dict(engine.last_run_stats)
+
+
+def _ocr_tile(pixels: np.ndarray, target_text: str, filter_type: str,
+              early_confidence_threshold: float):
+    """Ponto de entrada dos processos do pool de blocos."""
+    return _search_tile(_tile_engine, pixels, target_text, filter_type, early_confidence_threshold)
+
+
 # Funções de conveniência
 def find_text_with_multiple_preprocessing(region_img: Image.Image, target_text: str, 
                                         filter_type: str = "both", 
@@ -0,0 +1,188 @@
+"""
+Bot Vision Suite - Adaptive OCR Scheduler
+
+Este módulo registra quais combinações (pré-processamento, configuração OCR)
+encontraram cada texto e reordena a grade de OCR para tentar primeiro as
+combinações historicamente vencedoras.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def make_task_signature(target_text: str, filter_type: str = "both",
+                        region: Optional[Tuple[int, int, int, int]] = None) -> str:
+    """
+    Cria a assinatura de uma busca de texto (texto + região + tipo de filtro).
+    
+    Args:
+        target_text (str): Texto buscado
+        filter_type (str): Tipo de filtro ("numbers", "letters", "both")
+        region (tuple, optional): Região (x, y, width, height) da busca
+        
+    Returns:
+        str: Assinatura normalizada
+        
+    Examples:
+        >>> make_task_signature("Salvar", "letters", (10, 20, 100, 30))
+        'letters|salvar|10,20,100,30'
+    """
+    region_key = ",".join(str(int(v)) for v in region) if region else "*"
+    return f"{filter_type.lower()}|{' '.join(target_text.lower().split())}|{region_key}"
+
+
+class AdaptiveOCRScheduler:
+    """
+    Escalonador adaptativo da grade de OCR.
+    
+    Guarda, por assinatura de busca, quantas vezes cada célula
+    (img_index, config_index) produziu o resultado vencedor. Também mantém um
+    placar global, usado para assinaturas ainda sem histórico. As estatísticas
+    podem ser persistidas em JSON para reaproveitamento entre execuções.
+    """
+    
+    def __init__(self, stats_path: Optional[str] = None, max_signatures: int = 2000):
+        """
+        Inicializa o escalonador.
+        
+        Args:
+            stats_path (str, optional): Arquivo JSON para persistir as estatísticas
+            max_signatures (int): Máximo de assinaturas mantidas (as mais antigas são descartadas)
+        """
+        self.stats_path = stats_path
+        self.max_signatures = max_signatures
+        self._signatures: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+        self._global: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        
+        if stats_path:
+            self.load()
+    
+    @staticmethod
+    def _cell_key(img_index: int, config_index: int) -> str:
+        return f"{img_index}:{config_index}"
+    
+    def order(self, signature: str, cells: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Reordena as células colocando primeiro as vencedoras para a assinatura.
+        
+        Células sem histórico mantêm a ordem original (o que preserva a ordem
+        padrão quando ainda não há estatísticas).
+        
+        Args:
+            signature (str): Assinatura da busca
+            cells (list): Células (img_index, config_index) na ordem padrão
+            
+        Returns:
+            list: Células reordenadas
+        """
+        with self._lock:
+            local = dict(self._signatures.get(signature, {}))
+            global_wins = dict(self._global)
+        
+        if not local and not global_wins:
+            return list(cells)
+        
+        def rank(item):
+            position, (img_index, config_index) = item
+            key = self._cell_key(img_index, config_index)
+            return (-local.get(key, 0), -global_wins.get(key, 0), position)
+        
+        return [cell for _, cell in sorted(enumerate(cells), key=rank)]
+    
+    def record(self, signature: str, img_index: int, config_index: int) -> None:
+        """
+        Registra a célula que produziu o resultado vencedor.
+        
+        Args:
+            signature (str): Assinatura da busca
+            img_index (int): Índice do método de pré-processamento
+            config_index (int): Índice da configuração OCR
+        """
+        key = self._cell_key(img_index, config_index)
+        
+        with self._lock:
+            wins = self._signatures.pop(signature, {})
+            wins[key] = wins.get(key, 0) + 1
+            self._signatures[signature] = wins
+            self._global[key] = self._global.get(key, 0) + 1
+            
+            while len(self._signatures) > self.max_signatures:
+                self._signatures.popitem(last=False)
+        
+        logger.debug(f"Célula vencedora registrada para '{signature}': método {img_index}, config {config_index}")
+        
+        if self.stats_path:
+            self.save()
+    
+    def best_cells(self, signature: str, limit: int = 3) -> List[Tuple[int, int]]:
+        """
+        Retorna as células mais vencedoras para a assinatura.
+        
+        Args:
+            signature (str): Assinatura da busca
+            limit (int): Número máximo de células
+            
+        Returns:
+            list: Células (img_index, config_index) ordenadas por vitórias
+        """
+        with self._lock:
+            wins = dict(self._signatures.get(signature, {}))
+        
+        ranked = sorted(wins.items(), key=lambda item: -item[1])[:limit]
+        return [tuple(int(v) for v in key.split(":")) for key, _ in ranked]
+    
+    def load(self) -> None:
+        """Carrega estatísticas do arquivo JSON, se existir."""
+        if not self.stats_path or not os.path.exists(self.stats_path):
+            return
+        
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            
+            with self._lock:
+                self._signatures = OrderedDict(data.get("signatures", {}))
+                self._global = dict(data.get("global", {}))
+            
+            logger.info(f"Estatísticas de OCR carregadas: {len(self._signatures)} assinaturas")
+        except Exception as e:
+            logger.warning(f"Não foi possível carregar estatísticas de OCR de {self.stats_path}: {e}")
+    
+    def save(self) -> None:
+        """Salva as estatísticas no arquivo JSON (escrita atômica)."""
+        if not self.stats_path:
+            return
+        
+        with self._lock:
+            data = {
+                "version": 1,
+                "updated_at": time.time(),
+                "signatures": dict(self._signatures),
+                "global": dict(self._global),
+            }
+        
+        temp_path = f"{self.stats_path}.{os.getpid()}.tmp"
+        try:
+            directory = os.path.dirname(os.path.abspath(self.stats_path))
+            os.makedirs(directory, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.stats_path)
+        except Exception as e:
+            logger.warning(f"Não foi possível salvar estatísticas de OCR em {self.stats_path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    def clear(self) -> None:
+        """Remove todas as estatísticas em memória."""
+        with self._lock:
+            self._signatures.clear()
+            self._global.clear()
@@ -6,9 +6,11 @@ permitindo localizar uma imagem target próxima a uma imagem âncora.
 """
 
 import logging
-import pyautogui
-from typing import Optional, Tuple, List
+import numpy as np
+from typing import Dict, Optional, Tuple, List
 from ..exceptions import ImageNotFoundError
+from .screen_capture import FrameProvider
+from .template_matching import TemplateMatcher, match_centers, match_to_box
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +23,113 @@ class RelativeImageDetector:
     útil quando há múltiplas ocorrências da imagem target na tela.
     """
     
-    def __init__(self):
-        """Inicializa o detector de imagens relativas."""
-        pass
+    def __init__(self, frame_provider: Optional[FrameProvider] = None,
+                 template_matcher: Optional[TemplateMatcher] = None,
+                 hint_margin: int = 32):
+        """
+        Inicializa o detector de imagens relativas.
+        
+        Args:
+            frame_provider (FrameProvider, optional): Provedor de frames compartilhado
+            template_matcher (TemplateMatcher, optional): Matcher de templates
+            hint_margin (int): Margem em pixels ao redor da última posição conhecida da âncora
+        """
+        self.frame_provider = frame_provider or FrameProvider()
+        self.template_matcher = template_matcher or TemplateMatcher()
+        self.hint_margin = hint_margin
+        self._anchor_hints: Dict[str, Tuple] = {}  # Última posição de cada âncora
+    
+    def _clip_region(self, left: int, top: int, right: int,
+                     bottom: int) -> Optional[Tuple[int, int, int, int]]:
+        """Recorta um retângulo (left, top, right, bottom) aos limites do frame."""
+        width, height = self.frame_provider.size
+        left, top = max(0, int(left)), max(0, int(top))
+        right, bottom = min(width, int(right)), min(height, int(bottom))
+        if right <= left or bottom <= top:
+            return None
+        return (left, top, right - left, bottom - top)
+    
+    def _locate_anchor(self, anchor_image_path, confidence: float) -> Optional[Tuple]:
+        """
+        Localiza a âncora, tentando primeiro ao redor da última posição conhecida.
+        
+        Args:
+            anchor_image_path: Caminho (ou imagem) da âncora
+            confidence: Nível de confiança
+            
+        Returns:
+            Localização da âncora ou None
+        """
+        hint_key = anchor_image_path if isinstance(anchor_image_path, str) else None
+        hint = self._anchor_hints.get(hint_key) if hint_key else None
+        
+        if hint:
+            margin = self.hint_margin
+            hint_region = self._clip_region(hint[0] - margin, hint[1] - margin,
+                                            hint[0] + hint[2] + margin, hint[1] + hint[3] + margin)
+            if hint_region:
+                location = self._locate(anchor_image_path, hint_region, confidence)
+                if location:
+                    logger.debug(f"Âncora encontrada próxima à última posição conhecida {tuple(hint)}")
+                    self._anchor_hints[hint_key] = location
+                    return location
+            logger.debug("Âncora não está na última posição conhecida. Buscando na tela inteira.")
+        
+        location = self._locate(anchor_image_path, confidence=confidence)
+        if location and hint_key:
+            self._anchor_hints[hint_key] = location
+        return location
+    
+    def target_search_region(self, anchor_location: Tuple, target_size: Tuple[int, int],
+                             max_distance: int,
+                             target_region: Optional[Tuple[int, int, int, int]] = None
+                             ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Calcula a região onde um target pode estar, a partir da âncora.
+        
+        Como a distância é medida entre centros, qualquer target válido cabe na
+        caixa do centro da âncora expandida por max_distance mais o tamanho do
+        target. A região é recortada à tela e, se informada, à target_region.
+        
+        Args:
+            anchor_location: Localização (left, top, width, height) da âncora
+            target_size: Tamanho (width, height) do target
+            max_distance: Distância máxima em pixels da âncora ao target
+            target_region: Região explícita de busca (x, y, width, height)
+            
+        Returns:
+            Região (x, y, width, height) ou None se não houver área possível
+        """
+        center_x = anchor_location[0] + anchor_location[2] // 2
+        center_y = anchor_location[1] + anchor_location[3] // 2
+        target_width, target_height = target_size
+        
+        left = center_x - max_distance - target_width
+        top = center_y - max_distance - target_height
+        right = center_x + max_distance + target_width
+        bottom = center_y + max_distance + target_height
+        
+        if target_region:
+            left, top = max(left, target_region[0]), max(top, target_region[1])
+            right = min(right, target_region[0] + target_region[2])
+            bottom = min(bottom, target_region[1] + target_region[3])
+        
+        return self._clip_region(left, top, right, bottom)
+    
+    def _locate(self, image_path: str, region: Optional[Tuple] = None,
+                confidence: float = 0.9, scale: float = 1.0) -> Optional[Tuple]:
+        """Localiza uma imagem no frame em cache."""
+        offset = (int(region[0]), int(region[1])) if region else (0, 0)
+        match = self.template_matcher.locate(image_path, self.frame_provider.grab(region),
+                                             confidence, offset, scale)
+        return match.box if match else None
+    
+    def _locate_all(self, image_path: str, region: Optional[Tuple] = None,
+                    confidence: float = 0.9) -> np.ndarray:
+        """Localiza todas as ocorrências de uma imagem no frame em cache (array MATCH_DTYPE)."""
+        offset = (int(region[0]), int(region[1])) if region else (0, 0)
+        return self.template_matcher.locate_all(image_path, self.frame_provider.grab(region),
+                                                confidence, offset)
     
     def locate_relative_image(self, anchor_image_path: str, target_image_path: str, 
                             confidence: float = 0.9, max_distance: int = 200, 
@@ -45,57 +151,49 @@ class RelativeImageDetector:
             ImageNotFoundError: Se a imagem âncora não for encontrada
         """
         try:
-            # Primeiro, localiza a imagem âncora (sempre na tela inteira)
+            # Primeiro, localiza a imagem âncora (última posição conhecida, depois tela inteira)
             logger.info(f"Procurando imagem âncora: {anchor_image_path}")
-            anchor_location = pyautogui.locateOnScreen(anchor_image_path, confidence=confidence)
+            anchor_location = self._locate_anchor(anchor_image_path, confidence)
             
             if not anchor_location:
                 raise ImageNotFoundError(f"Imagem âncora não encontrada: {anchor_image_path}")
             
             logger.info(f"Imagem âncora encontrada em: {anchor_location}")
-            anchor_center = pyautogui.center(anchor_location)
+            anchor_center = (anchor_location[0] + anchor_location[2] // 2,
+                             anchor_location[1] + anchor_location[3] // 2)
             
             # Agora procura todas as ocorrências da imagem target
             logger.info(f"Procurando imagem target: {target_image_path}")
             
-            # Se target_region foi especificada, busca apenas nessa região
-            if target_region:
-                logger.info(f"Buscando target na região específica: {target_region}")
-                target_locations = list(pyautogui.locateAllOnScreen(
-                    target_image_path, region=target_region, confidence=confidence))
-            else:
-                # Busca na tela inteira
-                target_locations = list(pyautogui.locateAllOnScreen(
-                    target_image_path, confidence=confidence))
-            
-            if not target_locations:
-                region_info = f"na região {target_region}" if target_region else "na tela inteira"
-                logger.warning(f"Imagem target não encontrada {region_info}: {target_image_path}")
+            # Busca apenas na área alcançável a partir da âncora
+            # (recortada à target_region, se especificada; âncora e target usam o mesmo frame)
+            target_height, target_width = self.template_matcher.load_needle(target_image_path).shape[:2]
+            search_region = self.target_search_region(anchor_location, (target_width, target_height),
+                                                      max_distance, target_region)
+            if search_region is None:
+                logger.warning(f"Nenhuma área de busca possível dentro de {max_distance}px da âncora")
                 return None
             
-            logger.info(f"Encontradas {len(target_locations)} ocorrências da imagem target")
+            logger.info(f"Buscando target na região {search_region}")
+            target_matches = self._locate_all(target_image_path, search_region, confidence)
             
-            # Calcula a distância de cada target à âncora e encontra o mais próximo
-            closest_target = None
-            min_distance = float('inf')
+            if len(target_matches) == 0:
+                logger.warning(f"Imagem target não encontrada na região {search_region}: {target_image_path}")
+                return None
             
-            for target_location in target_locations:
-                target_center = pyautogui.center(target_location)
-                
-                # Calcula distância euclidiana
-                distance = ((target_center.x - anchor_center.x) ** 2 + 
-                           (target_center.y - anchor_center.y) ** 2) ** 0.5
-                
-                logger.info(f"Target em {target_location} está a {distance:.1f}px da âncora")
-                
-                # Verifica se está dentro da distância máxima e é o mais próximo
-                if distance <= max_distance and distance < min_distance:
-                    min_distance = distance
-                    closest_target = target_location
+            logger.info(f"Encontradas {len(target_matches)} ocorrências da imagem target")
             
-            if closest_target:
+            # Distância euclidiana de todos os targets à âncora de uma só vez
+            offsets = match_centers(target_matches) - np.asarray(anchor_center)
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+            distances[distances > max_distance] = np.inf
+            nearest = int(np.argmin(distances))
+            
+            if np.isfinite(distances[nearest]):
+                closest_target = match_to_box(target_matches[nearest])
                 logger.info(f"Target mais próximo selecionado: {closest_target} "
-                           f"(distância: {min_distance:.1f}px)")
+                           f"(distância: {distances[nearest]:.1f}px, "
+                           f"score: {target_matches[nearest]['score']:.3f})")
                 return closest_target
             else:
                 logger.warning(f"Nenhuma imagem target encontrada dentro de "
@@ -122,9 +220,6 @@ class RelativeImageDetector:
         Returns:
             Localização da imagem ou None se não encontrada
         """
-        import os
-        from PIL import Image
-        
         if scales is None:
             scales = [1.0, 0.95, 1.05]  # Tenta com escala original e ±5%
         
@@ -132,28 +227,8 @@ class RelativeImageDetector:
             # Tenta localizar com diferentes escalas
             for scale in scales:
                 try:
-                    if scale != 1.0:
-                        # Carrega e redimensiona a imagem de referência
-                        ref_img = Image.open(image_path)
-                        new_width = int(ref_img.width * scale)
-                        new_height = int(ref_img.height * scale)
-                        scaled_img = ref_img.resize((new_width, new_height))
-                        
-                        # Salva temporariamente para usar com pyautogui
-                        temp_path = f"temp_scaled_{scale}.png"
-                        scaled_img.save(temp_path)
-                        
-                        if region:
-                            location = pyautogui.locateOnScreen(temp_path, region=region, confidence=confidence)
-                        else:
-                            location = pyautogui.locateOnScreen(temp_path, confidence=confidence)
-                        
-                        os.remove(temp_path)  # Limpa arquivo temporário
-                    else:
-                        if region:
-                            location = pyautogui.locateOnScreen(image_path, region=region, confidence=confidence)
-                        else:
-                            location = pyautogui.locateOnScreen(image_path, confidence=confidence)
+                    # Variações redimensionadas vêm do cache de templates (sem arquivos temporários)
+                    location = self._locate(image_path, region, confidence, scale)
                     
                     if location:
                         return location
@@ -166,10 +241,7 @@ class RelativeImageDetector:
             logger.debug(f"Ajustando confiança para {adjusted_confidence}")
             
             try:
-                if region:
-                    location = pyautogui.locateOnScreen(image_path, region=region, confidence=adjusted_confidence)
-                else:
-                    location = pyautogui.locateOnScreen(image_path, confidence=adjusted_confidence)
+                location = self._locate(image_path, region, adjusted_confidence)
                 
                 if location:
                     return location
@@ -0,0 +1,577 @@
+"""
+Bot Vision Suite - Screen Capture
+
+Este módulo centraliza a captura de tela. Os backends de captura
+(pyautogui, mss/XShm ou sintético) retornam arrays numpy RGB, e o
+FrameProvider mantém o último frame da tela inteira em cache por um curto
+período (TTL), de modo que recortes de região, buscas de imagem e OCR de
+uma mesma tarefa reutilizam uma única captura. O ScreenChangeDetector
+compara frames consecutivos por blocos e informa quais áreas mudaram.
+"""
+
+import time
+import logging
+import threading
+from typing import List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from ..exceptions import TaskExecutionError, ConfigurationError
+
+logger = logging.getLogger(__name__)
+
+
+class CaptureBackend:
+    """
+    Interface comum para backends de captura de tela.
+    
+    ``grab`` retorna sempre um array numpy RGB (H, W, 3) uint8 da tela
+    principal ou da região pedida, em coordenadas absolutas.
+    """
+    
+    name = "base"
+    
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        """
+        Captura a tela (ou uma região).
+        
+        Args:
+            region (tuple, optional): (x, y, width, height); None para a tela principal
+            
+        Returns:
+            numpy.ndarray: Imagem RGB (H, W, 3)
+        """
+        raise NotImplementedError
+    
+    def close(self) -> None:
+        """Libera recursos mantidos pelo backend."""
+        pass
+
+
+class PyAutoGUICaptureBackend(CaptureBackend):
+    """Backend baseado em pyautogui.screenshot (compatível com qualquer sistema)."""
+    
+    name = "pyautogui"
+    
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        import pyautogui
+        
+        if region is None:
+            screenshot = pyautogui.screenshot()
+        else:
+            screenshot = pyautogui.screenshot(region=tuple(int(v) for v in region))
+        
+        if screenshot.mode != "RGB":
+            screenshot = screenshot.convert("RGB")
+        return np.asarray(screenshot)
+
+
+class MSSCaptureBackend(CaptureBackend):
+    """
+    Backend baseado no mss (XShm no Linux, BitBlt no Windows, CoreGraphics no macOS).
+    
+    Captura direto para memória, sem processos externos nem arquivos
+    temporários. As instâncias do mss são mantidas por thread.
+    """
+    
+    name = "mss"
+    
+    def __init__(self):
+        """
+        Inicializa o backend.
+        
+        Raises:
+            ImportError: Se o mss não estiver instalado
+        """
+        import mss
+        
+        self._mss = mss
+        self._local = threading.local()
+    
+    def _sct(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = self._mss.mss()
+        return sct
+    
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        sct = self._sct()
+        
+        if region is None:
+            monitor = sct.monitors[1]  # Monitor principal (igual ao pyautogui)
+        else:
+            x, y, width, height = (int(v) for v in region)
+            monitor = {"left": x, "top": y, "width": width, "height": height}
+        
+        # O mss entrega BGRA; converte para RGB em uma única passada
+        return cv2.cvtColor(np.asarray(sct.grab(monitor)), cv2.COLOR_BGRA2RGB)
+    
+    def close(self) -> None:
+        sct = getattr(self._local, "sct", None)
+        if sct is not None:
+            sct.close()
+            self._local.sct = None
+
+
+class SyntheticCaptureBackend(CaptureBackend):
+    """
+    Backend sintético que serve imagens da memória ou do disco.
+    
+    Permite testar fluxos de automação sem display: cada captura retorna o
+    frame atual, que pode ser trocado com ``set_frame`` ou avançado com
+    ``next_frame``.
+    
+    Examples:
+        >>> backend = SyntheticCaptureBackend(["tela1.png", "tela2.png"])
+        >>> bot = BotVision({"capture_backend": backend})
+    """
+    
+    name = "synthetic"
+    
+    def __init__(self, frames: Union[str, Image.Image, np.ndarray,
+                                     List[Union[str, Image.Image, np.ndarray]]]):
+        """
+        Inicializa o backend.
+        
+        Args:
+            frames: Frame ou lista de frames (caminhos, imagens PIL ou arrays RGB)
+        """
+        if not isinstance(frames, (list, tuple)):
+            frames = [frames]
+        if not frames:
+            raise ConfigurationError("SyntheticCaptureBackend requer pelo menos um frame")
+        
+        self.frames = [self._to_array(frame) for frame in frames]
+        self.index = 0
+        self.grab_count = 0
+    
+    @staticmethod
+    def _to_array(frame) -> np.ndarray:
+        if isinstance(frame, str):
+            frame = Image.open(frame)
+        if isinstance(frame, Image.Image):
+            frame = np.asarray(frame.convert("RGB"))
+        frame = np.asarray(frame, dtype=np.uint8)
+        if frame.ndim == 2:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB)
+        return frame
+    
+    def set_frame(self, frame) -> None:
+        """Substitui o frame atual."""
+        self.frames[self.index] = self._to_array(frame)
+    
+    def next_frame(self) -> None:
+        """Avança para o próximo frame da lista (permanece no último)."""
+        self.index = min(self.index + 1, len(self.frames) - 1)
+    
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        self.grab_count += 1
+        frame = self.frames[self.index]
+        if region is None:
+            return frame
+        
+        x, y, width, height = (int(v) for v in region)
+        # Fora da tela, o conteúdo é preto (como em uma captura real)
+        result = np.zeros((height, width, 3), dtype=np.uint8)
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, frame.shape[1]), min(y + height, frame.shape[0])
+        if x1 > x0 and y1 > y0:
+            result[y0 - y:y1 - y, x0 - x:x1 - x] = frame[y0:y1, x0:x1]
+        return result
+
+
+class ScreenChangeDetector:
+    """
+    Detector de mudanças na tela por blocos (dirty rectangles).
+    
+    Cada frame é convertido para escala de cinza, reduzido e dividido em
+    blocos; ``cv2.absdiff`` contra o frame anterior, seguido de um máximo por
+    bloco, gera o mapa de blocos alterados. O detector também guarda em qual
+    frame cada bloco mudou pela última vez, o que permite perguntar se uma
+    região mudou desde um frame qualquer sem recomparar pixels.
+    """
+    
+    def __init__(self, tile_size: int = 64, threshold: int = 12, scale: float = 0.25):
+        """
+        Inicializa o detector.
+        
+        Args:
+            tile_size (int): Lado dos blocos em pixels da tela
+            threshold (int): Diferença mínima de intensidade considerada mudança
+            scale (float): Fator de redução aplicado antes da comparação
+        """
+        self.tile_size = tile_size
+        self.threshold = threshold
+        self.scale = scale
+        self.frame_index = 0
+        self.changed = None  # Mapa (linhas, colunas) de blocos alterados no último frame
+        self._previous = None
+        self._last_changed = None  # Índice do último frame em que cada bloco mudou
+        self._screen_shape = None
+        self._lock = threading.Lock()
+        self.stats = {"frames": 0, "changed_fraction": 0.0, "mean_changed_fraction": 0.0}
+    
+    @property
+    def grid_shape(self) -> Tuple[int, int]:
+        """Dimensões (linhas, colunas) da grade de blocos."""
+        return self.changed.shape if self.changed is not None else (0, 0)
+    
+    def _reduce(self, frame: np.ndarray) -> np.ndarray:
+        gray = cv2.cvtColor(np.ascontiguousarray(frame), cv2.COLOR_RGB2GRAY) if frame.ndim == 3 else frame
+        height, width = gray.shape
+        tile = max(1, int(round(self.tile_size * self.scale)))
+        rows, cols = -(-height // self.tile_size), -(-width // self.tile_size)
+        
+        small = cv2.resize(gray, (max(1, int(width * self.scale)), max(1, int(height * self.scale))),
+                           interpolation=cv2.INTER_AREA)
+        # Completa com bordas para uma grade exata de blocos
+        padded = np.zeros((rows * tile, cols * tile), dtype=np.uint8)
+        h, w = min(small.shape[0], padded.shape[0]), min(small.shape[1], padded.shape[1])
+        padded[:h, :w] = small[:h, :w]
+        return padded
+    
+    def update(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Compara o frame com o anterior e atualiza o mapa de blocos alterados.
+        
+        Args:
+            frame (numpy.ndarray): Frame completo da tela (RGB)
+            
+        Returns:
+            numpy.ndarray: Mapa booleano (linhas, colunas); o primeiro frame marca tudo como alterado
+        """
+        reduced = self._reduce(frame)
+        tile = max(1, int(round(self.tile_size * self.scale)))
+        rows, cols = reduced.shape[0] // tile, reduced.shape[1] // tile
+        
+        with self._lock:
+            self.frame_index += 1
+            if self._previous is None or self._previous.shape != reduced.shape:
+                changed = np.ones((rows, cols), dtype=bool)
+                self._last_changed = np.full((rows, cols), self.frame_index, dtype=np.int64)
+            else:
+                diff = cv2.absdiff(reduced, self._previous)
+                changed = diff.reshape(rows, tile, cols, tile).max(axis=(1, 3)) > self.threshold
+                self._last_changed[changed] = self.frame_index
+            
+            self._previous = reduced
+            self._screen_shape = frame.shape[:2]
+            self.changed = changed
+            
+            fraction = float(changed.mean())
+            frames = self.stats["frames"] + 1
+            self.stats["frames"] = frames
+            self.stats["changed_fraction"] = fraction
+            self.stats["mean_changed_fraction"] += (fraction - self.stats["mean_changed_fraction"]) / frames
+            return changed
+    
+    def _tile_slice(self, region: Optional[Tuple[int, int, int, int]]) -> Tuple[slice, slice]:
+        if region is None:
+            return slice(None), slice(None)
+        x, y, width, height = (int(v) for v in region)
+        rows, cols = self.grid_shape
+        return (slice(max(0, y // self.tile_size), min(rows, -(-(y + height) // self.tile_size))),
+                slice(max(0, x // self.tile_size), min(cols, -(-(x + width) // self.tile_size))))
+    
+    def region_changed(self, region: Optional[Tuple[int, int, int, int]] = None) -> bool:
+        """
+        Verifica se algum bloco da região mudou no último frame.
+        
+        Args:
+            region (tuple, optional): (x, y, width, height); None para a tela inteira
+            
+        Returns:
+            bool: True se a região mudou (ou se ainda não há frame)
+        """
+        with self._lock:
+            if self.changed is None:
+                return True
+            rows, cols = self._tile_slice(region)
+            return bool(self.changed[rows, cols].any())
+    
+    def changed_since(self, region: Optional[Tuple[int, int, int, int]], frame_index: int) -> bool:
+        """
+        Verifica se a região mudou depois de um determinado frame.
+        
+        Args:
+            region (tuple, optional): (x, y, width, height); None para a tela inteira
+            frame_index (int): Índice do frame de referência (ver ``frame_index``)
+            
+        Returns:
+            bool: True se algum bloco da região mudou após o frame de referência
+        """
+        with self._lock:
+            if self._last_changed is None:
+                return True
+            rows, cols = self._tile_slice(region)
+            tiles = self._last_changed[rows, cols]
+            return tiles.size == 0 or bool((tiles > frame_index).any())
+    
+    def _reduced_slice(self, region: Tuple[int, int, int, int]) -> Tuple[slice, slice]:
+        x, y, width, height = (int(v) for v in region)
+        return (slice(max(0, int(y * self.scale)), max(0, int(np.ceil((y + height) * self.scale)))),
+                slice(max(0, int(x * self.scale)), max(0, int(np.ceil((x + width) * self.scale)))))
+    
+    def snapshot(self, region: Tuple[int, int, int, int]) -> Optional[np.ndarray]:
+        """
+        Guarda o recorte reduzido da região no último frame.
+        
+        Args:
+            region (tuple): (x, y, width, height)
+            
+        Returns:
+            numpy.ndarray or None: Recorte de referência para differs_from (None sem frame)
+        """
+        with self._lock:
+            if self._previous is None:
+                return None
+            return self._previous[self._reduced_slice(region)].copy()
+    
+    def differs_from(self, region: Tuple[int, int, int, int], snapshot: Optional[np.ndarray]) -> bool:
+        """
+        Compara a região do último frame com um recorte guardado por snapshot.
+        
+        Ao contrário de changed_since, que compara frames consecutivos, a
+        diferença é medida contra o recorte de referência, de modo que mudanças
+        lentas (fade, redesenho gradual) também são detectadas.
+        
+        Args:
+            region (tuple): (x, y, width, height) usada no snapshot
+            snapshot (numpy.ndarray): Recorte de referência
+            
+        Returns:
+            bool: True se algum pixel reduzido difere mais que o limiar (ou sem referência)
+        """
+        with self._lock:
+            if self._previous is None or snapshot is None:
+                return True
+            current = self._previous[self._reduced_slice(region)]
+            if current.shape != snapshot.shape:
+                return True
+            return current.size > 0 and bool(cv2.absdiff(current, snapshot).max() > self.threshold)
+    
+    def changed_boxes(self) -> List[Tuple[int, int, int, int]]:
+        """
+        Retorna os blocos alterados no último frame em coordenadas da tela.
+        
+        Returns:
+            list: Caixas (x, y, width, height) dos blocos alterados
+        """
+        with self._lock:
+            if self.changed is None:
+                return []
+            screen_height, screen_width = self._screen_shape
+            size = self.tile_size
+            return [(int(col * size), int(row * size),
+                     int(min(size, screen_width - col * size)), int(min(size, screen_height - row * size)))
+                    for row, col in zip(*np.nonzero(self.changed))]
+    
+    def reset(self) -> None:
+        """Descarta o histórico (o próximo frame será marcado como totalmente alterado)."""
+        with self._lock:
+            self._previous = None
+            self._last_changed = None
+            self.changed = None
+
+
+def create_capture_backend(backend: Union[str, CaptureBackend, None] = "auto") -> CaptureBackend:
+    """
+    Cria o backend de captura definido na configuração.
+    
+    A opção ``capture_backend`` aceita:
+        - "auto": usa mss se disponível, senão pyautogui (padrão)
+        - "mss": captura direta em memória (cai para pyautogui se indisponível)
+        - "pyautogui": pyautogui.screenshot
+        - uma instância de CaptureBackend (ex: SyntheticCaptureBackend)
+        
+    Args:
+        backend (str or CaptureBackend): Nome ou instância do backend
+        
+    Returns:
+        CaptureBackend: Backend pronto para uso
+        
+    Raises:
+        ConfigurationError: Se o backend informado for desconhecido
+    """
+    if isinstance(backend, CaptureBackend):
+        return backend
+    
+    name = (backend or "auto").lower()
+    if name not in ("auto", "mss", "pyautogui"):
+        raise ConfigurationError(f"Backend de captura desconhecido: '{name}'. "
+                                 f"Use 'auto', 'mss' ou 'pyautogui'")
+    
+    if name in ("auto", "mss"):
+        try:
+            return MSSCaptureBackend()
+        except ImportError:
+            log = logger.warning if name == "mss" else logger.debug
+            log("mss não está instalado. Usando pyautogui para captura "
+                "(pip install bot-vision-suite[capture])")
+    
+    return PyAutoGUICaptureBackend()
+
+
+class FrameProvider:
+    """
+    Provedor de frames da tela com cache de curta duração.
+    
+    O frame completo é guardado como array numpy RGB; recortes de região são
+    slices sem cópia desse array. O cache expira após ``ttl`` segundos e deve
+    ser invalidado explicitamente após qualquer ação de mouse ou teclado.
+    """
+    
+    def __init__(self, ttl: float = 0.25, backend: Optional[CaptureBackend] = None,
+                 change_detector: Optional["ScreenChangeDetector"] = None):
+        """
+        Inicializa o provedor.
+        
+        Args:
+            ttl (float): Tempo de vida do frame em cache, em segundos (0 desativa o cache)
+            backend (CaptureBackend, optional): Backend de captura (padrão: pyautogui)
+            change_detector (ScreenChangeDetector, optional): Recebe cada frame novo capturado
+        """
+        self.ttl = ttl
+        self.backend = backend or PyAutoGUICaptureBackend()
+        self.change_detector = change_detector
+        self._frame = None
+        self._frame_image = None
+        self._timestamp = 0.0
+        self._lock = threading.RLock()
+        self.stats = {"captures": 0, "hits": 0, "invalidations": 0}
+    
+    def _capture_full_frame(self) -> np.ndarray:
+        """Captura a tela inteira."""
+        return self.backend.grab()
+    
+    def _is_fresh(self) -> bool:
+        return (self._frame is not None and self.ttl > 0 and
+                time.monotonic() - self._timestamp < self.ttl)
+    
+    def frame(self, force: bool = False) -> np.ndarray:
+        """
+        Retorna o frame completo da tela (RGB, somente leitura).
+        
+        Args:
+            force (bool): Ignora o cache e captura um novo frame
+            
+        Returns:
+            numpy.ndarray: Frame (H, W, 3)
+        """
+        with self._lock:
+            if not force and self._is_fresh():
+                self.stats["hits"] += 1
+                return self._frame
+            
+            # View somente leitura: recortes compartilham a memória do frame
+            frame = self._capture_full_frame().view()
+            frame.flags.writeable = False
+            
+            self._frame = frame
+            self._frame_image = None
+            self._timestamp = time.monotonic()
+            self.stats["captures"] += 1
+            
+            if self.change_detector is not None:
+                self.change_detector.update(frame)
+            return frame
+    
+    def frame_image(self, force: bool = False) -> Image.Image:
+        """
+        Retorna o frame completo como imagem PIL.
+        
+        Args:
+            force (bool): Ignora o cache e captura um novo frame
+            
+        Returns:
+            PIL.Image: Frame completo
+        """
+        with self._lock:
+            frame = self.frame(force)
+            if self._frame_image is None:
+                self._frame_image = Image.fromarray(frame)
+            return self._frame_image
+    
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Dimensões (largura, altura) do frame atual."""
+        height, width = self.frame().shape[:2]
+        return width, height
+    
+    def contains(self, region: Tuple[int, int, int, int]) -> bool:
+        """
+        Verifica se a região está totalmente dentro do frame capturado.
+        
+        Args:
+            region (tuple): (x, y, width, height)
+            
+        Returns:
+            bool: True se a região cabe no frame
+        """
+        return self._fits(self.frame(), region)
+    
+    @staticmethod
+    def _fits(frame: np.ndarray, region: Tuple[int, int, int, int]) -> bool:
+        x, y, width, height = (int(v) for v in region)
+        frame_height, frame_width = frame.shape[:2]
+        return x >= 0 and y >= 0 and width > 0 and height > 0 and \
+            x + width <= frame_width and y + height <= frame_height
+    
+    def grab(self, region: Optional[Tuple[int, int, int, int]] = None,
+             force: bool = False) -> np.ndarray:
+        """
+        Retorna uma região da tela como view sem cópia do frame em cache.
+        
+        Regiões fora do frame principal (ex: outro monitor) são capturadas
+        diretamente, sem cache.
+        
+        Args:
+            region (tuple, optional): (x, y, width, height); None para a tela inteira
+            force (bool): Ignora o cache e captura um novo frame
+            
+        Returns:
+            numpy.ndarray: Região (h, w, 3) em RGB
+        """
+        frame = self.frame(force)
+        if region is None:
+            return frame
+        
+        x, y, width, height = (int(v) for v in region)
+        if not self._fits(frame, region):
+            logger.debug(f"Região {region} fora do frame em cache. Capturando diretamente.")
+            return self.backend.grab((x, y, width, height))
+        
+        return frame[y:y + height, x:x + width]
+    
+    def grab_image(self, region: Optional[Tuple[int, int, int, int]] = None,
+                   force: bool = False) -> Image.Image:
+        """
+        Retorna uma região da tela como imagem PIL.
+        
+        Args:
+            region (tuple, optional): (x, y, width, height); None para a tela inteira
+            force (bool): Ignora o cache e captura um novo frame
+            
+        Returns:
+            PIL.Image: Imagem da região
+            
+        Raises:
+            TaskExecutionError: Se a captura falhar
+        """
+        try:
+            if region is None:
+                return self.frame_image(force)
+            return Image.fromarray(np.ascontiguousarray(self.grab(region, force)))
+        except Exception as e:
+            raise TaskExecutionError(f"Erro na captura de tela: {e}")
+    
+    def invalidate(self) -> None:
+        """Descarta o frame em cache (chamar após ações de mouse/teclado)."""
+        with self._lock:
+            if self._frame is not None:
+                self.stats["invalidations"] += 1
+            self._frame = None
+            self._frame_image = None
+            self._timestamp = 0.0
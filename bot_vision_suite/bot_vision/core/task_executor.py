@@ -9,6 +9,7 @@ import time
 import threading
 import logging
 import os
+import numpy as np
 from typing import List, Dict, Any, Optional, Tuple, Union
 from PIL import Image
 
@@ -19,6 +20,11 @@ from .ocr_engine import OCREngine
 from .overlay import show_overlay
 from .relative_image import RelativeImageDetector
 from .keyboard_commands import KeyboardCommander
+from .screen_capture import FrameProvider, ScreenChangeDetector, create_capture_backend
+from .template_matching import TemplateMatcher, MatchResult
+from .template_cache import TemplateCache
+from .location_cache import LocationCache, image_signature, text_signature, pixel_fingerprint
+from .wait import wait_for, frame_signature
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +57,35 @@ class TaskExecutor:
         """
         self.config = config or BotVisionConfig()
         self.ocr_engine = OCREngine(self.config)
-        self.relative_detector = RelativeImageDetector()
+        
+        # Mapa de blocos alterados entre frames consecutivos
+        self.change_detector = None
+        if self.config.get("change_detection", True):
+            self.change_detector = ScreenChangeDetector(self.config.get("change_tile_size", 64))
+        
+        # Frame da tela compartilhado entre capturas, buscas de imagem e OCR
+        self.frame_provider = FrameProvider(
+            self.config.get("frame_cache_ttl", 0.25),
+            create_capture_backend(self.config.get("capture_backend", "auto")),
+            self.change_detector
+        )
+        self.template_cache = TemplateCache(self.config.get("template_cache_max_bytes", 64 * 1024 * 1024))
+        self.template_matcher = TemplateMatcher(self.config.get("template_grayscale", False),
+                                                self.template_cache)
+        self.relative_detector = RelativeImageDetector(self.frame_provider, self.template_matcher)
+        self.last_image_match = None  # Última busca de imagem (inclui quase-acertos)
+        self._last_text_capture = None  # (região, hash dos pixels) da última busca de texto
+        
+        # Esperas orientadas a eventos no lugar das pausas fixas entre ações
+        self.smart_waits = self.config.get("smart_waits", False)
+        
+        # Memória de posições: verifica a última posição antes da busca completa
+        self.location_cache = None
+        if self.config.get("location_cache", True):
+            self.location_cache = LocationCache(self.config.get("location_cache_ttl", 3600.0),
+                                                persist_path=self.config.get("location_cache_path"),
+                                                save_interval=self.config.get("location_cache_save_interval", 5.0))
+        self._verified_frames: Dict[str, Tuple] = {}  # (frame, recorte reduzido) de cada confirmação
         self.keyboard_commander = KeyboardCommander()
         
         # Configurações padrão
@@ -75,6 +109,18 @@ class TaskExecutor:
         except ImportError:
             raise TaskExecutionError("PyAutoGUI não está instalado")
     
+    def close(self) -> None:
+        """Libera os pools do engine de OCR e grava as posições memorizadas pendentes."""
+        self.ocr_engine.close()
+        if self.location_cache is not None:
+            self.location_cache.close()
+    
+    def __enter__(self) -> "TaskExecutor":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
     def execute_tasks(self, tasks: List[Dict[str, Any]]) -> List[TaskResult]:
         """
         Executa uma lista de tarefas sequencialmente.
@@ -228,7 +274,7 @@ class TaskExecutor:
             
             # Se não encontrou, aguarda antes da próxima tentativa
             if not location:
-                time.sleep(max(0.5, attempts * 0.5))
+                self._wait_before_retry(task, max(0.5, attempts * 0.5))
             
             attempts += 1
         
@@ -261,17 +307,30 @@ class TaskExecutor:
         if not region:
             raise TextNotFoundError("Nenhuma região definida para OCR")
         
+        signature = None
+        if self.location_cache is not None:
+            signature = text_signature(target_text, filter_type, region)
+            if not task.get('best_confidence', True):
+                signature += f"|#{task.get('occurrence', 1)}"
+            
+            cached_location = self._verify_cached_text(signature)
+            if cached_location:
+                logger.info(f"Texto '{target_text}' confirmado na posição memorizada {cached_location}")
+                return cached_location
+        
         logger.info(f"Buscando texto '{target_text}' na região {region} "
                    f"com filtro '{filter_type}' (tentativa {attempt+1} de {self.max_attempts})")
         
         # Captura screenshot da região
         region_img = self._capture_region(region)
+        self._last_text_capture = (tuple(region), pixel_fingerprint(np.asarray(region_img)))
         
         logger.info(f"Área capturada para OCR: {region[2]}x{region[3]} pixels")
         
         # Usa OCR engine para encontrar texto
         found_boxes, confidence_scores, early_match = self.ocr_engine.find_text(
-            region_img, target_text, filter_type, early_confidence_threshold
+            region_img, target_text, filter_type, early_confidence_threshold, region=region,
+            exhaustive=attempt >= self.max_attempts - 1
         )
         
         if found_boxes:
@@ -307,11 +366,108 @@ class TaskExecutor:
             
             logger.info(f"Texto '{target_text}' encontrado na posição {selected_box_relative} "
                        f"dentro da região {region}")
+            
+            if signature:
+                self._remember_text_location(signature, selected_box)
             return selected_box
         else:
             logger.warning(f"Texto '{target_text}' não encontrado na região {region}")
             return None
     
+    def _wait_before_retry(self, task: Dict[str, Any], timeout: float) -> None:
+        """
+        Aguarda antes de uma nova tentativa.
+        
+        Para tarefas de texto, a espera termina assim que os pixels da região
+        mudam (não adianta repetir o OCR sobre a mesma imagem); caso contrário
+        dura até ``timeout`` segundos.
+        
+        Args:
+            task (dict): Configuração da tarefa
+            timeout (float): Espera máxima em segundos
+        """
+        region = task.get('region')
+        last_capture = self._last_text_capture
+        
+        if 'text' in task and region and last_capture and last_capture[0] == tuple(region):
+            # Retoma assim que os pixels lidos pelo OCR mudarem
+            self.wait_for(lambda: pixel_fingerprint(self.frame_provider.grab(region)) != last_capture[1],
+                          region, timeout)
+        elif self.smart_waits and ('image' in task or task.get('type') == 'relative_image'):
+            search_region = region if task.get('specific', True) else None
+            self.wait_for("changed", search_region, timeout)
+        else:
+            time.sleep(timeout)
+    
+    def wait_for(self, condition, region: Optional[Tuple] = None, timeout: Optional[float] = None,
+                 poll_interval: Optional[float] = None, **kwargs) -> bool:
+        """
+        Aguarda uma condição da tela usando o provedor de frames do executor.
+        
+        Args:
+            condition (str or callable): "stable", "changed", "appeared" ou função
+            region (tuple, optional): Região observada; None para a tela inteira
+            timeout (float, optional): Espera máxima (padrão: config 'wait_timeout')
+            poll_interval (float, optional): Intervalo entre verificações (padrão: config 'wait_poll_interval')
+            **kwargs: Demais parâmetros de bot_vision.core.wait.wait_for
+            
+        Returns:
+            bool: True se a condição foi satisfeita, False se o tempo esgotou
+        """
+        kwargs.setdefault("stable_for", self.config.get("wait_stable_time", 0.2))
+        return wait_for(
+            condition, region,
+            timeout=self.config.get("wait_timeout", 5.0) if timeout is None else timeout,
+            poll_interval=self.config.get("wait_poll_interval", 0.05) if poll_interval is None else poll_interval,
+            frame_provider=self.frame_provider, **kwargs
+        )
+    
+    def _settle(self, max_wait: float, region: Optional[Tuple] = None) -> None:
+        """
+        Pausa após uma ação: espera fixa ou, com smart_waits, até a tela estabilizar.
+        
+        Args:
+            max_wait (float): Duração da pausa fixa (espera máxima com smart_waits)
+            region (tuple, optional): Região observada; None para a tela inteira
+        """
+        if self.smart_waits:
+            self.wait_for("stable", region, timeout=max_wait)
+        else:
+            time.sleep(max_wait)
+    
+    def _wait_after_action(self, task: Dict[str, Any], baseline=None) -> None:
+        """
+        Aguarda após a ação da tarefa: 'wait_until' se declarado, senão 'delay'.
+        
+        Chaves opcionais da tarefa:
+            wait_until: "stable", "changed" ou "appeared"
+            wait_region: Região observada (padrão: tela inteira)
+            wait_timeout: Espera máxima (padrão: maior entre 'delay' e config 'wait_timeout')
+            wait_image: Imagem aguardada por "appeared"
+            
+        Args:
+            task (dict): Configuração da tarefa
+            baseline (numpy.ndarray, optional): Assinatura da região antes da ação (para "changed")
+        """
+        delay = task.get('delay', 0)
+        condition = task.get('wait_until')
+        if not condition:
+            time.sleep(delay)
+            return
+        
+        region = task.get('wait_region')
+        timeout = task.get('wait_timeout', max(delay, self.config.get("wait_timeout", 5.0)))
+        target = None
+        if condition == "appeared":
+            wait_image = task.get('wait_image')
+            if not wait_image:
+                raise TaskExecutionError("wait_until='appeared' requer a chave 'wait_image'")
+            confidence = task.get('confidence', self.default_confidence)
+            target = lambda: self._locate_on_screen(wait_image, region, confidence) is not None
+        
+        if not self.wait_for(condition, region, timeout, target=target, baseline=baseline):
+            logger.warning(f"Tempo esgotado aguardando '{condition}' após a tarefa ({timeout:.1f}s)")
+    
     def _find_image_location(self, task: Dict[str, Any], attempt: int) -> Optional[Tuple]:
         """
         Encontra localização de imagem.
@@ -328,6 +484,16 @@ class TaskExecutor:
         region = task.get('region')
         specific = task.get('specific', True)
         
+        search_region = region if specific else None
+        
+        signature = None
+        if self.location_cache is not None and isinstance(image_path, str):
+            signature = image_signature(image_path, search_region)
+            cached_location = self._verify_cached_image(signature, image_path, confidence)
+            if cached_location:
+                logger.info(f"Imagem {image_path} confirmada na posição memorizada {tuple(cached_location)}")
+                return cached_location
+        
         if specific and region:
             logger.info(f"Buscando {image_path} na região {region} "
                        f"com confiança {confidence} (tentativa {attempt+1} de {self.max_attempts})")
@@ -337,8 +503,111 @@ class TaskExecutor:
                        f"com confiança {confidence} (tentativa {attempt+1} de {self.max_attempts})")
             location = self._locate_image_with_retry(image_path, confidence=confidence)
         
+        if location and signature:
+            self.location_cache.put(signature, location)
+            self._mark_verified(signature, location)
+        
         return location
     
+    def _verify_cached_image(self, signature: str, image_path: str,
+                             confidence: float) -> Optional[Tuple]:
+        """
+        Confirma a posição memorizada de uma imagem com um template match local.
+        
+        Args:
+            signature (str): Assinatura da tarefa
+            image_path (str): Caminho da imagem
+            confidence (float): Confiança
+            
+        Returns:
+            tuple: Localização confirmada ou None
+        """
+        entry = self.location_cache.get(signature)
+        if entry is None:
+            return None
+        
+        # Nenhum bloco da caixa mudou desde a última confirmação: não precisa recomparar
+        if self._unchanged_since_verified(signature, entry["box"]):
+            self.location_cache.record_hit()
+            return entry["box"]
+        
+        try:
+            # Pequena margem para tolerar deslocamentos de 1-2 pixels
+            left, top, width, height = entry["box"]
+            margin = 2
+            frame_width, frame_height = self.frame_provider.size
+            x0, y0 = max(0, left - margin), max(0, top - margin)
+            x1 = min(frame_width, left + width + margin)
+            y1 = min(frame_height, top + height + margin)
+            
+            if x1 > x0 and y1 > y0:
+                location = self._accept_match(
+                    self._match_on_screen(image_path, (x0, y0, x1 - x0, y1 - y0)), confidence
+                )
+                if location:
+                    self.location_cache.record_hit()
+                    self._mark_verified(signature, location)
+                    return location
+        except Exception as e:
+            logger.debug(f"Erro ao verificar posição memorizada: {e}")
+        
+        self._verified_frames.pop(signature, None)
+        self.location_cache.reject(signature)
+        return None
+    
+    def _mark_verified(self, signature: str, box: Tuple) -> None:
+        """Registra o frame e o conteúdo reduzido da caixa confirmada."""
+        if self.change_detector is not None:
+            self._verified_frames[signature] = (self.change_detector.frame_index,
+                                                self.change_detector.snapshot(box))
+    
+    def _unchanged_since_verified(self, signature: str, box: Tuple) -> bool:
+        """Verifica, pelo detector de mudanças, se a caixa continua igual desde a confirmação."""
+        verified = self._verified_frames.get(signature)
+        if self.change_detector is None or verified is None:
+            return False
+        
+        self.frame_provider.frame()  # Garante que o detector viu o frame atual
+        verified_frame, snapshot = verified
+        if self.change_detector.changed_since(box, verified_frame):
+            return False
+        # Mudanças lentas passam entre frames consecutivos; compara com o conteúdo confirmado
+        return not self.change_detector.differs_from(box, snapshot)
+    
+    def _verify_cached_text(self, signature: str) -> Optional[Tuple]:
+        """
+        Confirma a posição memorizada de um texto comparando o hash dos pixels.
+        
+        Args:
+            signature (str): Assinatura da tarefa
+            
+        Returns:
+            tuple: Localização confirmada ou None
+        """
+        entry = self.location_cache.get(signature)
+        if entry is None:
+            return None
+        
+        try:
+            box = entry["box"]
+            if entry.get("fingerprint") and self.frame_provider.contains(box) and \
+                    pixel_fingerprint(self.frame_provider.grab(box)) == entry["fingerprint"]:
+                self.location_cache.record_hit()
+                return box
+        except Exception as e:
+            logger.debug(f"Erro ao verificar posição memorizada: {e}")
+        
+        self.location_cache.reject(signature)
+        return None
+    
+    def _remember_text_location(self, signature: str, box: Tuple) -> None:
+        """Memoriza a posição de um texto junto com o hash dos seus pixels."""
+        try:
+            if self.frame_provider.contains(box):
+                self.location_cache.put(signature, box, pixel_fingerprint(self.frame_provider.grab(box)))
+        except Exception as e:
+            logger.debug(f"Erro ao memorizar posição do texto: {e}")
+    
     def _capture_region(self, region: Tuple[int, int, int, int]) -> Image.Image:
         """
         Captura screenshot de uma região.
@@ -353,8 +622,7 @@ class TaskExecutor:
             TaskExecutionError: Se falhar na captura
         """
         try:
-            import pyautogui
-            region_img = pyautogui.screenshot(region=region)
+            region_img = self.frame_provider.grab_image(region)
             
             if not region_img or region_img.width <= 1 or region_img.height <= 1:
                 raise TaskExecutionError(f"Falha ao capturar região {region}")
@@ -364,9 +632,80 @@ class TaskExecutor:
         except Exception as e:
             raise TaskExecutionError(f"Erro na captura de tela: {e}")
     
+    def _match_on_screen(self, image_path, region: Optional[Tuple] = None,
+                         scale: float = 1.0) -> Optional[MatchResult]:
+        """
+        Busca a melhor correspondência de uma imagem no frame em cache.
+        
+        Args:
+            image_path (str, PIL.Image ou numpy.ndarray): Imagem a buscar
+            region (tuple, optional): Região de busca
+            scale (float): Escala a aplicar à imagem
+            
+        Returns:
+            MatchResult: Melhor correspondência (mesmo abaixo da confiança) ou None
+        """
+        haystack = self.frame_provider.grab(region)
+        offset = (int(region[0]), int(region[1])) if region else (0, 0)
+        
+        match = self.template_matcher.best_match(image_path, haystack, offset, scale)
+        self.last_image_match = match
+        return match
+    
+    def _locate_on_screen(self, image_path, region: Optional[Tuple] = None,
+                          confidence: float = 0.9, scale: float = 1.0) -> Optional[Tuple]:
+        """
+        Localiza uma imagem no frame em cache (substitui o pyautogui.locateOnScreen).
+        
+        Args:
+            image_path (str, PIL.Image ou numpy.ndarray): Imagem a buscar
+            region (tuple, optional): Região de busca
+            confidence (float): Confiança
+            scale (float): Escala a aplicar à imagem
+            
+        Returns:
+            tuple: Localização (left, top, width, height) ou None
+        """
+        match = self._match_on_screen(image_path, region, scale)
+        return self._accept_match(match, confidence)
+    
+    def _match_on_screen_multiscale(self, image_path, region: Optional[Tuple] = None,
+                                    scales: Optional[List[float]] = None) -> Optional[MatchResult]:
+        """
+        Busca a imagem em todo o intervalo de escalas com a pirâmide do matcher.
+        
+        Args:
+            image_path (str, PIL.Image ou numpy.ndarray): Imagem a buscar
+            region (tuple, optional): Região de busca
+            scales (list, optional): Escalas de referência
+            
+        Returns:
+            MatchResult: Melhor correspondência (mesmo abaixo da confiança) ou None
+        """
+        haystack = self.frame_provider.grab(region)
+        offset = (int(region[0]), int(region[1])) if region else (0, 0)
+        
+        match = self.template_matcher.match_multiscale(image_path, haystack, scales or [1.0], offset)
+        self.last_image_match = match
+        return match
+    
+    def _accept_match(self, match: Optional[MatchResult], confidence: float) -> Optional[Tuple]:
+        """Retorna a localização se a correspondência atingir a confiança."""
+        if match is None:
+            return None
+        
+        if match.score >= confidence:
+            logger.debug(f"Imagem encontrada em {tuple(match.box)} (score {match.score:.3f})")
+            return match.box
+        
+        logger.debug(f"Imagem não encontrada: melhor score {match.score:.3f} < {confidence:.3f} "
+                     f"em {tuple(match.box)}")
+        return None
+    
     def _locate_image_with_retry(self, image_path: str, region: Optional[Tuple] = None,
                                 confidence: float = 0.9, max_attempts: int = 3,
-                                scales: Optional[List[float]] = None) -> Optional[Tuple]:
+                                scales: Optional[List[float]] = None,
+                                base_scale: float = 1.0) -> Optional[Tuple]:
         """
         Localiza imagem com múltiplas tentativas e escalas.
         
@@ -376,6 +715,7 @@ class TaskExecutor:
             confidence (float): Nível de confiança
             max_attempts (int): Máximo de tentativas
             scales (list, optional): Escalas a testar
+            base_scale (float): Escala aplicada à imagem antes das escalas de teste
             
         Returns:
             tuple: Coordenadas da imagem ou None
@@ -383,22 +723,22 @@ class TaskExecutor:
         if scales is None:
             scales = [1.0, 0.95, 1.05]  # Escala original e ±5%
         
+        if self.config.get("template_pyramid", True):
+            return self._locate_image_pyramid(image_path, region, confidence, max_attempts,
+                                              [base_scale * scale for scale in scales])
+        
         try:
-            import pyautogui
-            
             for attempt in range(max_attempts):
                 # Tenta diferentes escalas
                 for scale in scales:
                     try:
                         if scale != 1.0:
-                            # Redimensiona imagem temporariamente
-                            location = self._try_scaled_image(image_path, scale, region, confidence)
+                            # Variação redimensionada (servida pelo cache de templates)
+                            location = self._try_scaled_image(image_path, base_scale * scale,
+                                                              region, confidence)
                         else:
                             # Usa imagem original
-                            if region:
-                                location = pyautogui.locateOnScreen(image_path, region=region, confidence=confidence)
-                            else:
-                                location = pyautogui.locateOnScreen(image_path, confidence=confidence)
+                            location = self._locate_on_screen(image_path, region, confidence, base_scale)
                         
                         if location:
                             return location
@@ -412,10 +752,7 @@ class TaskExecutor:
                 logger.debug(f"Ajustando confiança para {adjusted_confidence}")
                 
                 try:
-                    if region:
-                        location = pyautogui.locateOnScreen(image_path, region=region, confidence=adjusted_confidence)
-                    else:
-                        location = pyautogui.locateOnScreen(image_path, confidence=adjusted_confidence)
+                    location = self._locate_on_screen(image_path, region, adjusted_confidence, base_scale)
                     
                     if location:
                         return location
@@ -432,6 +769,50 @@ class TaskExecutor:
             logger.error(f"Erro na localização de imagem: {e}")
             return None
     
+    def _locate_image_pyramid(self, image_path: str, region: Optional[Tuple], confidence: float,
+                              max_attempts: int, scales: List[float]) -> Optional[Tuple]:
+        """
+        Variante de _locate_image_with_retry com busca multiescala em uma passada.
+        
+        Cada tentativa faz uma única busca em pirâmide sobre o intervalo de
+        escalas; a confiança reduzida é aplicada à mesma correspondência, sem
+        nova busca.
+        
+        Args:
+            image_path (str): Caminho para imagem
+            region (tuple, optional): Região onde buscar
+            confidence (float): Nível de confiança
+            max_attempts (int): Máximo de tentativas
+            scales (list): Escalas de referência
+            
+        Returns:
+            tuple: Coordenadas da imagem ou None
+        """
+        try:
+            for attempt in range(max_attempts):
+                match = self._match_on_screen_multiscale(image_path, region, scales)
+                
+                location = self._accept_match(match, confidence)
+                if location:
+                    return location
+                
+                # Reduz confiança se não encontrou
+                adjusted_confidence = max(0.7, confidence - 0.05 * (attempt + 1))
+                logger.debug(f"Ajustando confiança para {adjusted_confidence}")
+                
+                location = self._accept_match(match, adjusted_confidence)
+                if location:
+                    return location
+                
+                # Pausa entre tentativas
+                time.sleep(0.5)
+            
+            return None
+            
+        except Exception as e:
+            logger.error(f"Erro na localização de imagem: {e}")
+            return None
+    
     def _try_scaled_image(self, image_path: str, scale: float, region: Optional[Tuple],
                          confidence: float) -> Optional[Tuple]:
         """
@@ -447,31 +828,8 @@ class TaskExecutor:
             tuple: Localização ou None
         """
         try:
-            import pyautogui
-            from PIL import Image
-            
-            # Carrega e redimensiona imagem
-            ref_img = Image.open(image_path)
-            new_width = int(ref_img.width * scale)
-            new_height = int(ref_img.height * scale)
-            scaled_img = ref_img.resize((new_width, new_height))
-            
-            # Salva temporariamente
-            temp_path = f"temp_scaled_{scale}_{os.getpid()}.png"
-            scaled_img.save(temp_path)
-            
-            try:
-                if region:
-                    location = pyautogui.locateOnScreen(temp_path, region=region, confidence=confidence)
-                else:
-                    location = pyautogui.locateOnScreen(temp_path, confidence=confidence)
-                
-                return location
-                
-            finally:
-                # Remove arquivo temporário
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+            # A variação redimensionada fica em memória no cache de templates
+            return self._locate_on_screen(image_path, region, confidence, scale)
                     
         except Exception as e:
             logger.debug(f"Erro ao testar imagem escalada: {e}")
@@ -485,13 +843,18 @@ class TaskExecutor:
             task (dict): Configuração da tarefa
             location (tuple): Coordenadas onde executar ação
         """
-        delay = task.get('delay', 0)
         show_overlay_enabled = task.get('show_overlay')
         
         # Se não especificado na task, usa configuração global
         if show_overlay_enabled is None:
             show_overlay_enabled = self.config.get('show_overlay', True)
         
+        # Estado da tela antes da ação, para wait_until='changed'; capturado
+        # antes do overlay para que o retângulo desenhado não conte como mudança
+        baseline = None
+        if task.get('wait_until') == 'changed':
+            baseline = frame_signature(self.frame_provider.grab(task.get('wait_region'), force=True))
+        
         # Mostra overlay visual apenas se habilitado
         if show_overlay_enabled:
             # Obter configurações de overlay da configuração
@@ -515,18 +878,22 @@ class TaskExecutor:
         else:
             overlay_thread = None
         
-        # Executa clique
-        self._perform_click(task, location)
-        
-        # Processa comandos de texto
-        if 'sendtext' in task and task['sendtext']:
-            self._process_sendtext(task['sendtext'])
+        try:
+            # Executa clique
+            self._perform_click(task, location)
+            
+            # Processa comandos de texto
+            if 'sendtext' in task and task['sendtext']:
+                self._process_sendtext(task['sendtext'])
+        finally:
+            # A tela mudou (ou pode ter mudado): o frame em cache não vale mais
+            self.frame_provider.invalidate()
         
         # Aguarda overlay finalizar se foi criado
         if overlay_thread:
             overlay_thread.join()
             
-        time.sleep(delay)
+        self._wait_after_action(task, baseline)
     
     def _perform_click(self, task: Dict[str, Any], location: Tuple) -> None:
         """
@@ -544,7 +911,13 @@ class TaskExecutor:
             
             # Movimento suave
             pyautogui.moveTo(click_point.x, click_point.y, duration=0.1)
-            time.sleep(0.5)  # Pausa para garantir movimento
+            # Pausa para garantir movimento (com smart_waits: até o hover estabilizar)
+            screen_width, screen_height = pyautogui.size()
+            left, top = max(0, click_point.x - 100), max(0, click_point.y - 50)
+            right = min(screen_width, click_point.x + 100)
+            bottom = min(screen_height, click_point.y + 50)
+            hover_region = (left, top, right - left, bottom - top) if right > left and bottom > top else None
+            self._settle(0.5, hover_region)
             
             # Executa ação baseada no tipo
             mouse_button = task.get('mouse_button', 'left').lower()
@@ -618,7 +991,7 @@ class TaskExecutor:
                 logger.info(f"Colando texto: '{text_to_write}'")
                 pyperclip.copy(text_to_write)
                 pyautogui.hotkey('ctrl', 'v')
-                time.sleep(0.5)
+                self._settle(0.5)
                 
         except Exception as e:
             logger.error(f"Erro ao processar sendtext: {e}")
@@ -703,6 +1076,8 @@ class TaskExecutor:
         except Exception as e:
             logger.error(f"Erro ao digitar texto: {e}")
             return None
+        finally:
+            self.frame_provider.invalidate()
     
     def _execute_keyboard_command(self, task: Dict[str, Any], attempt: int) -> str:
         """
@@ -729,6 +1104,8 @@ class TaskExecutor:
         except Exception as e:
             logger.error(f"Erro ao executar comando de teclado: {e}")
             return None
+        finally:
+            self.frame_provider.invalidate()
 
 
 # Funções de conveniência
@@ -0,0 +1,147 @@
+"""
+Bot Vision Suite - Template Cache
+
+Este módulo mantém em memória as imagens de referência (templates) já
+decodificadas, em cor ou em escala de cinza, junto com suas variações
+redimensionadas. Evita reabrir o arquivo e gravar arquivos temporários a
+cada tentativa de busca.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from ..exceptions import ImageProcessingError
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateCache:
+    """
+    Cache LRU de templates decodificados e pré-escalados.
+    
+    As entradas são indexadas por (caminho, mtime, escala, modo); se o
+    arquivo for modificado no disco, as variações antigas são descartadas na
+    próxima consulta. O total de memória é limitado por ``max_bytes``.
+    """
+    
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Inicializa o cache.
+        
+        Args:
+            max_bytes (int): Limite de memória ocupada pelos arrays, em bytes
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self._mtimes: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+    
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos arrays em cache, em bytes."""
+        return self._bytes
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, image_path: str, scale: float = 1.0, grayscale: bool = False) -> np.ndarray:
+        """
+        Retorna o template decodificado (e redimensionado, se necessário).
+        
+        Args:
+            image_path (str): Caminho da imagem
+            scale (float): Escala a aplicar sobre o tamanho original
+            grayscale (bool): Retorna em escala de cinza em vez de RGB
+            
+        Returns:
+            numpy.ndarray: Array somente leitura (H, W, 3) RGB ou (H, W) cinza
+            
+        Raises:
+            ImageProcessingError: Se a imagem não puder ser carregada
+        """
+        path = os.path.abspath(image_path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError as e:
+            raise ImageProcessingError(f"Não foi possível carregar o template {image_path}: {e}")
+        
+        with self._lock:
+            if self._mtimes.get(path, mtime) != mtime:
+                logger.debug(f"Template modificado no disco, descartando variações: {path}")
+                self._discard_path(path)
+            self._mtimes[path] = mtime
+            
+            return self._get(path, mtime, round(float(scale), 4), bool(grayscale))
+    
+    def _get(self, path: str, mtime: int, scale: float, grayscale: bool) -> np.ndarray:
+        key = (path, mtime, scale, grayscale)
+        array = self._entries.get(key)
+        if array is not None:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return array
+        
+        self.stats["misses"] += 1
+        if grayscale:
+            array = cv2.cvtColor(self._get(path, mtime, scale, False), cv2.COLOR_RGB2GRAY)
+        elif scale != 1.0:
+            base = self._get(path, mtime, 1.0, False)
+            width = max(1, int(base.shape[1] * scale))
+            height = max(1, int(base.shape[0] * scale))
+            array = np.asarray(Image.fromarray(base).resize((width, height)))
+        else:
+            array = self._decode(path)
+        
+        array.flags.writeable = False
+        self._store(key, array)
+        return array
+    
+    @staticmethod
+    def _decode(path: str) -> np.ndarray:
+        try:
+            with Image.open(path) as img:
+                return np.array(img.convert("RGB"))
+        except Exception as e:
+            raise ImageProcessingError(f"Não foi possível carregar o template {path}: {e}")
+    
+    def _store(self, key: Tuple, array: np.ndarray) -> None:
+        self._entries[key] = array
+        self._bytes += array.nbytes
+        
+        # Mantém ao menos a entrada recém-inserida, mesmo acima do limite
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.stats["evictions"] += 1
+    
+    def _discard_path(self, path: str) -> None:
+        for key in [key for key in self._entries if key[0] == path]:
+            self._bytes -= self._entries.pop(key).nbytes
+    
+    def invalidate(self, image_path: str) -> None:
+        """
+        Remove do cache todas as variações de um template.
+        
+        Args:
+            image_path (str): Caminho da imagem
+        """
+        path = os.path.abspath(image_path)
+        with self._lock:
+            self._discard_path(path)
+            self._mtimes.pop(path, None)
+    
+    def clear(self) -> None:
+        """Remove todos os templates em cache."""
+        with self._lock:
+            self._entries.clear()
+            self._mtimes.clear()
+            self._bytes = 0
@@ -0,0 +1,421 @@
+"""
+Bot Vision Suite - Template Matching
+
+Este módulo implementa a busca de imagens (template matching) diretamente
+com cv2.matchTemplate sobre o frame da tela em cache, retornando a
+pontuação junto com a localização.
+"""
+
+import logging
+from collections import namedtuple
+from typing import List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from ..exceptions import ImageProcessingError
+from .template_cache import TemplateCache
+
+logger = logging.getLogger(__name__)
+
+# Mesmo formato do Box do pyautogui/pyscreeze (compatível com pyautogui.center)
+Box = namedtuple("Box", "left top width height")
+
+# Resultado de locate_all: uma linha por ocorrência, ordenadas por pontuação
+MATCH_DTYPE = np.dtype([
+    ("left", np.int32),
+    ("top", np.int32),
+    ("width", np.int32),
+    ("height", np.int32),
+    ("score", np.float32),
+])
+
+
+def non_max_suppression(boxes: np.ndarray, scores: np.ndarray,
+                        overlap: float = 0.3) -> np.ndarray:
+    """
+    Supressão de não-máximos (NMS) vetorizada por IoU.
+    
+    Args:
+        boxes (numpy.ndarray): Caixas (N, 4) no formato (left, top, width, height)
+        scores (numpy.ndarray): Pontuações (N,)
+        overlap (float): IoU a partir da qual a caixa de menor pontuação é descartada
+        
+    Returns:
+        numpy.ndarray: Índices das caixas mantidas, em ordem decrescente de pontuação
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.intp)
+    
+    boxes = np.asarray(boxes, dtype=np.float64)
+    x1, y1 = boxes[:, 0], boxes[:, 1]
+    x2, y2 = x1 + boxes[:, 2], y1 + boxes[:, 3]
+    areas = boxes[:, 2] * boxes[:, 3]
+    
+    order = np.argsort(-np.asarray(scores), kind="stable")
+    keep = []
+    while order.size:
+        best, rest = order[0], order[1:]
+        keep.append(best)
+        
+        # IoU da melhor caixa contra todas as restantes de uma só vez
+        inter_w = np.clip(np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest]), 0, None)
+        inter_h = np.clip(np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest]), 0, None)
+        inter = inter_w * inter_h
+        iou = inter / (areas[best] + areas[rest] - inter)
+        order = rest[iou <= overlap]
+    
+    return np.asarray(keep, dtype=np.intp)
+
+
+def match_centers(matches: np.ndarray) -> np.ndarray:
+    """
+    Calcula os centros das ocorrências (mesma regra do pyautogui.center).
+    
+    Args:
+        matches (numpy.ndarray): Array estruturado MATCH_DTYPE
+        
+    Returns:
+        numpy.ndarray: Centros (N, 2) como (x, y)
+    """
+    return np.stack([matches["left"] + matches["width"] // 2,
+                     matches["top"] + matches["height"] // 2], axis=1)
+
+
+def match_to_box(match: np.void) -> Box:
+    """Converte uma linha de MATCH_DTYPE em Box."""
+    return Box(int(match["left"]), int(match["top"]), int(match["width"]), int(match["height"]))
+
+
+class MatchResult:
+    """
+    Resultado de uma busca de template.
+    
+    Attributes:
+        box (Box): Localização (left, top, width, height) em coordenadas absolutas
+        score (float): Pontuação TM_CCOEFF_NORMED (-1.0 a 1.0)
+        scale (float): Escala do template que produziu o resultado
+    """
+    
+    def __init__(self, box: Box, score: float, scale: float = 1.0):
+        self.box = box
+        self.score = score
+        self.scale = scale
+    
+    def __repr__(self):
+        return f"MatchResult(box={tuple(self.box)}, score={self.score:.3f}, scale={self.scale:.2f})"
+
+
+NeedleType = Union[str, Image.Image, np.ndarray]
+
+
+class TemplateMatcher:
+    """
+    Localizador de imagens baseado em cv2.matchTemplate (TM_CCOEFF_NORMED).
+    
+    Substitui pyautogui.locateOnScreen: recebe o haystack já capturado (array
+    RGB) e retorna a melhor correspondência com sua pontuação, o que permite
+    ver quão perto ficou uma busca que falhou.
+    """
+    
+    # Menor lado (em pixels) do template no nível reduzido da pirâmide
+    MIN_COARSE_SIZE = 12
+    
+    def __init__(self, grayscale: bool = False, cache: Optional[TemplateCache] = None):
+        """
+        Inicializa o matcher.
+        
+        Args:
+            grayscale (bool): Compara em escala de cinza (mais rápido, menos preciso)
+            cache (TemplateCache, optional): Cache de templates (padrão: cache próprio)
+        """
+        self.grayscale = grayscale
+        self.cache = cache if cache is not None else TemplateCache()
+    
+    def load_needle(self, needle: NeedleType, scale: float = 1.0) -> np.ndarray:
+        """
+        Converte o template para array RGB (ou cinza, se configurado).
+        
+        Templates informados por caminho são servidos pelo cache, já
+        decodificados e redimensionados.
+        
+        Args:
+            needle (str, PIL.Image ou numpy.ndarray): Caminho ou imagem do template
+            scale (float): Escala a aplicar ao template
+            
+        Returns:
+            numpy.ndarray: Template pronto para a busca
+            
+        Raises:
+            ImageProcessingError: Se o template não puder ser carregado
+        """
+        if isinstance(needle, str):
+            return self.cache.get(needle, scale, self.grayscale)
+        
+        try:
+            if isinstance(needle, np.ndarray) and scale != 1.0:
+                needle = Image.fromarray(needle)
+            if isinstance(needle, Image.Image):
+                if scale != 1.0:
+                    needle = needle.resize((max(1, int(needle.width * scale)),
+                                            max(1, int(needle.height * scale))))
+                needle = np.asarray(needle.convert("RGB"))
+        except Exception as e:
+            raise ImageProcessingError(f"Não foi possível carregar o template: {e}")
+        
+        return self._prepare(np.asarray(needle))
+    
+    def _prepare(self, img: np.ndarray) -> np.ndarray:
+        """Ajusta o número de canais de acordo com o modo (cor ou cinza)."""
+        if img.dtype != np.uint8:
+            img = img.astype(np.uint8)
+        
+        if self.grayscale:
+            if img.ndim == 3:
+                img = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+        elif img.ndim == 2:
+            img = cv2.cvtColor(img, cv2.COLOR_GRAY2RGB)
+        elif img.shape[2] == 4:
+            img = cv2.cvtColor(img, cv2.COLOR_RGBA2RGB)
+        
+        return img
+    
+    def match_scores(self, needle: np.ndarray, haystack: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Calcula o mapa de pontuações do template sobre o haystack.
+        
+        Args:
+            needle (numpy.ndarray): Template preparado
+            haystack (numpy.ndarray): Imagem onde buscar (RGB)
+            
+        Returns:
+            numpy.ndarray or None: Mapa (H-h+1, W-w+1) ou None se o template for maior
+        """
+        haystack = self._prepare(haystack)
+        if needle.ndim != haystack.ndim:
+            needle = self._prepare(needle)
+        
+        if needle.shape[0] > haystack.shape[0] or needle.shape[1] > haystack.shape[1]:
+            return None
+        
+        scores = cv2.matchTemplate(haystack, needle, cv2.TM_CCOEFF_NORMED)
+        # Regiões uniformes podem gerar NaN/inf
+        cv2.patchNaNs(scores, 0)
+        return scores
+    
+    def best_match(self, needle: NeedleType, haystack: np.ndarray,
+                   offset: Tuple[int, int] = (0, 0), scale: float = 1.0) -> Optional[MatchResult]:
+        """
+        Retorna a melhor correspondência, independentemente da pontuação.
+        
+        Args:
+            needle: Template (caminho, PIL ou array)
+            haystack (numpy.ndarray): Imagem onde buscar (RGB)
+            offset (tuple): Deslocamento (x, y) do haystack na tela
+            scale (float): Escala a aplicar ao template
+            
+        Returns:
+            MatchResult or None: Melhor correspondência, ou None se o template não couber
+        """
+        needle = self.load_needle(needle, scale)
+        scores = self.match_scores(needle, haystack)
+        if scores is None:
+            return None
+        
+        _, max_score, _, max_loc = cv2.minMaxLoc(scores)
+        height, width = needle.shape[:2]
+        box = Box(int(max_loc[0] + offset[0]), int(max_loc[1] + offset[1]), width, height)
+        return MatchResult(box, float(max_score), scale)
+    
+    def locate(self, needle: NeedleType, haystack: np.ndarray, confidence: float = 0.9,
+               offset: Tuple[int, int] = (0, 0), scale: float = 1.0) -> Optional[MatchResult]:
+        """
+        Localiza o template no haystack.
+        
+        Args:
+            needle: Template (caminho, PIL ou array)
+            haystack (numpy.ndarray): Imagem onde buscar (RGB)
+            confidence (float): Pontuação mínima (0.0-1.0)
+            offset (tuple): Deslocamento (x, y) do haystack na tela
+            scale (float): Escala a aplicar ao template
+            
+        Returns:
+            MatchResult or None: Correspondência acima da confiança ou None
+        """
+        result = self.best_match(needle, haystack, offset, scale)
+        if result is None:
+            return None
+        
+        if result.score >= confidence:
+            return result
+        
+        logger.debug(f"Melhor correspondência abaixo da confiança: {result.score:.3f} < {confidence:.3f} "
+                     f"em {tuple(result.box)}")
+        return None
+    
+    def locate_all(self, needle: NeedleType, haystack: np.ndarray, confidence: float = 0.9,
+                   offset: Tuple[int, int] = (0, 0), overlap: float = 0.3,
+                   scale: float = 1.0) -> np.ndarray:
+        """
+        Localiza todas as ocorrências do template em uma única passada.
+        
+        Os picos locais acima da confiança são extraídos do mapa de pontuações
+        e as ocorrências sobrepostas são colapsadas por NMS.
+        
+        Args:
+            needle: Template (caminho, PIL ou array)
+            haystack (numpy.ndarray): Imagem onde buscar (RGB)
+            confidence (float): Pontuação mínima (0.0-1.0)
+            offset (tuple): Deslocamento (x, y) do haystack na tela
+            overlap (float): IoU máxima entre ocorrências mantidas
+            scale (float): Escala a aplicar ao template
+            
+        Returns:
+            numpy.ndarray: Array estruturado MATCH_DTYPE ordenado por pontuação decrescente
+        """
+        needle = self.load_needle(needle, scale)
+        scores = self.match_scores(needle, haystack)
+        if scores is None:
+            return np.empty(0, dtype=MATCH_DTYPE)
+        
+        # Mantém só máximos locais (3x3) acima da confiança antes do NMS
+        peaks = (scores >= confidence) & (scores >= cv2.dilate(scores, np.ones((3, 3), np.uint8)))
+        ys, xs = np.nonzero(peaks)
+        if xs.size == 0:
+            return np.empty(0, dtype=MATCH_DTYPE)
+        
+        height, width = needle.shape[:2]
+        matches = np.empty(xs.size, dtype=MATCH_DTYPE)
+        matches["left"] = xs + offset[0]
+        matches["top"] = ys + offset[1]
+        matches["width"] = width
+        matches["height"] = height
+        matches["score"] = scores[ys, xs]
+        
+        boxes = np.stack([matches["left"], matches["top"], matches["width"], matches["height"]], axis=1)
+        return matches[non_max_suppression(boxes, matches["score"], overlap)]
+    
+    @staticmethod
+    def scale_samples(scales: Sequence[float], step: float = 0.025) -> List[float]:
+        """
+        Amostra o intervalo contínuo coberto pelas escalas informadas.
+        
+        Args:
+            scales (list): Escalas de referência (ex: [1.0, 0.95, 1.05])
+            step (float): Passo entre as amostras
+            
+        Returns:
+            list: Escalas entre min(scales) e max(scales), incluindo as originais
+        """
+        low, high = min(scales), max(scales)
+        count = int(round((high - low) / step)) + 1 if high > low else 1
+        samples = set(np.round(np.linspace(low, high, count), 4).tolist())
+        samples.update(round(float(scale), 4) for scale in scales)
+        return sorted(samples)
+    
+    def _load_gray(self, needle: NeedleType, scale: float) -> np.ndarray:
+        """Carrega o template em escala de cinza (usado no nível reduzido)."""
+        if isinstance(needle, str):
+            return self.cache.get(needle, scale, grayscale=True)
+        needle = self.load_needle(needle, scale)
+        return needle if needle.ndim == 2 else cv2.cvtColor(needle, cv2.COLOR_RGB2GRAY)
+    
+    def pyramid_factor(self, needle_size: int) -> float:
+        """
+        Escolhe o fator de redução da pirâmide para um template.
+        
+        Args:
+            needle_size (int): Menor lado do template, em pixels
+            
+        Returns:
+            float: 0.5, 0.25 ou 0.125; 1.0 se o template for pequeno demais para reduzir
+        """
+        factor = 1.0
+        while factor > 0.125 and needle_size * factor / 2 >= self.MIN_COARSE_SIZE:
+            factor /= 2
+        return factor
+    
+    @staticmethod
+    def _peaks(scores: np.ndarray, count: int, radius: int) -> List[Tuple[float, int, int]]:
+        """Extrai até ``count`` picos do mapa, suprimindo a vizinhança de cada um."""
+        scores = scores.copy()
+        peaks = []
+        for _ in range(count):
+            _, score, _, (x, y) = cv2.minMaxLoc(scores)
+            peaks.append((float(score), x, y))
+            scores[max(0, y - radius):y + radius + 1, max(0, x - radius):x + radius + 1] = -1.0
+        return peaks
+    
+    def match_multiscale(self, needle: NeedleType, haystack: np.ndarray,
+                         scales: Sequence[float] = (1.0,), offset: Tuple[int, int] = (0, 0),
+                         step: float = 0.025, candidates: int = 5) -> Optional[MatchResult]:
+        """
+        Busca o template em várias escalas com uma pirâmide (grosso para fino).
+        
+        Haystack e template são reduzidos e comparados em escala de cinza ao
+        longo de todo o intervalo de escalas; apenas as janelas dos melhores
+        picos são refinadas na resolução original. Templates pequenos demais
+        para a redução são comparados diretamente em cada escala.
+        
+        Args:
+            needle: Template (caminho, PIL ou array)
+            haystack (numpy.ndarray): Imagem onde buscar (RGB)
+            scales (list): Escalas de referência; o intervalo entre elas é amostrado
+            offset (tuple): Deslocamento (x, y) do haystack na tela
+            step (float): Passo entre as escalas amostradas
+            candidates (int): Número de picos refinados na resolução original
+            
+        Returns:
+            MatchResult or None: Melhor correspondência, ou None se o template não couber
+        """
+        samples = self.scale_samples(scales, step)
+        base_height, base_width = self.load_needle(needle).shape[:2]
+        factor = self.pyramid_factor(int(min(base_height, base_width) * samples[0]))
+        
+        if factor >= 1.0:
+            results = [self.best_match(needle, haystack, offset, scale) for scale in samples]
+            return max((r for r in results if r is not None), key=lambda r: r.score, default=None)
+        
+        haystack = self._prepare(haystack)
+        gray = haystack if haystack.ndim == 2 else cv2.cvtColor(haystack, cv2.COLOR_RGB2GRAY)
+        coarse = cv2.resize(gray, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA)
+        
+        # Nível reduzido: picos candidatos em todo o intervalo de escalas
+        peaks = []
+        for scale in samples:
+            coarse_needle = self._load_gray(needle, scale * factor)
+            if coarse_needle.shape[0] > coarse.shape[0] or coarse_needle.shape[1] > coarse.shape[1]:
+                continue
+            scores = cv2.matchTemplate(coarse, coarse_needle, cv2.TM_CCOEFF_NORMED)
+            cv2.patchNaNs(scores, 0)
+            radius = max(1, min(coarse_needle.shape[:2]) // 2)
+            peaks.extend((score, scale, x, y) for score, x, y in self._peaks(scores, 2, radius))
+        
+        if not peaks:
+            return None
+        peaks.sort(key=lambda peak: -peak[0])
+        
+        # Resolução original: refina só as janelas dos melhores picos
+        margin = int(np.ceil(1.0 / factor)) + 2
+        low, high = samples[0], samples[-1]
+        best = None
+        refined = set()
+        for _, scale, x, y in peaks[:candidates]:
+            for fine_scale in {min(high, max(low, round(scale + delta, 4)))
+                               for delta in ((-step / 2, 0.0, step / 2) if high > low else (0.0,))}:
+                fine_needle = self.load_needle(needle, fine_scale)
+                height, width = fine_needle.shape[:2]
+                x0 = max(0, int(x / factor) - margin)
+                y0 = max(0, int(y / factor) - margin)
+                if (fine_scale, x0, y0) in refined:
+                    continue
+                refined.add((fine_scale, x0, y0))
+                
+                window = haystack[y0:int(y / factor) + height + margin, x0:int(x / factor) + width + margin]
+                result = self.best_match(fine_needle, window, (offset[0] + x0, offset[1] + y0))
+                if result is not None and (best is None or result.score > best.score):
+                    result.scale = fine_scale
+                    best = result
+        
+        return best
@@ -0,0 +1,158 @@
+"""
+Bot Vision Suite - Text Detection
+
+Este módulo localiza regiões com cara de texto (palavras ou linhas) antes do
+OCR. Em vez de passar a região inteira pelo Tesseract com modos de página,
+o OCR roda apenas nesses recortes, com modos de linha única.
+"""
+
+import logging
+from typing import List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from .template_matching import Box
+
+logger = logging.getLogger(__name__)
+
+# Proporção largura/altura média de um caractere de interface
+CHAR_ASPECT = 0.6
+
+
+def split_tiles(width: int, height: int, tile_size: int,
+                overlap: int = 0) -> List[Tuple[int, int, int, int]]:
+    """
+    Divide uma imagem em blocos sobrepostos.
+    
+    Args:
+        width (int): Largura da imagem
+        height (int): Altura da imagem
+        tile_size (int): Lado máximo de cada bloco; 0 para um único bloco
+        overlap (int): Sobreposição entre blocos vizinhos (ao menos a altura do texto)
+        
+    Returns:
+        list: Blocos (x, y, width, height) cobrindo a imagem inteira
+    """
+    if tile_size <= 0:
+        return [(0, 0, width, height)]
+    
+    step = max(1, tile_size - overlap)
+    
+    def starts(length):
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size, step))
+        return positions + [length - tile_size]
+    
+    return [(x, y, min(tile_size, width), min(tile_size, height))
+            for y in starts(height) for x in starts(width)]
+
+
+def detect_text_regions(image: Union[Image.Image, np.ndarray], merge_gap: int = 9,
+                        min_height: int = 6, max_height: int = 80,
+                        min_fill: float = 0.2) -> List[Box]:
+    """
+    Propõe caixas de texto usando gradiente morfológico e componentes conexos.
+    
+    As bordas dos caracteres são realçadas pelo gradiente, binarizadas por
+    Otsu e unidas na horizontal (fechamento com largura ``merge_gap``), de
+    forma que cada componente corresponda a uma palavra ou linha.
+    
+    Args:
+        image (PIL.Image or numpy.ndarray): Imagem RGB ou em escala de cinza
+        merge_gap (int): Maior espaço horizontal (px) unido dentro de uma caixa
+        min_height (int): Altura mínima de uma caixa de texto
+        max_height (int): Altura máxima de uma caixa de texto
+        min_fill (float): Fração mínima da caixa ocupada pelo componente
+        
+    Returns:
+        list: Caixas (left, top, width, height) de cima para baixo, da esquerda para a direita
+    """
+    pixels = np.asarray(image)
+    gray = cv2.cvtColor(pixels, cv2.COLOR_RGB2GRAY) if pixels.ndim == 3 else pixels
+    gray = np.ascontiguousarray(gray, dtype=np.uint8)
+    
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT,
+                                cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    _, binary = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    joined = cv2.morphologyEx(binary, cv2.MORPH_CLOSE,
+                              cv2.getStructuringElement(cv2.MORPH_RECT, (max(1, merge_gap), 1)))
+    
+    count, _, stats, _ = cv2.connectedComponentsWithStats(joined, connectivity=8)
+    stats = stats[1:]  # Descarta o fundo
+    if count <= 1:
+        return []
+    
+    left, top, width, height, area = stats.T
+    keep = ((height >= min_height) & (height <= max_height) & (width >= 2) &
+            (area >= min_fill * width * height) & (width < gray.shape[1] * 0.98))
+    kept = stats[keep]
+    order = np.lexsort((kept[:, 0], kept[:, 1]))
+    
+    return [Box(int(l), int(t), int(w), int(h)) for l, t, w, h, _ in kept[order]]
+
+
+def estimate_text_height(image: Union[Image.Image, np.ndarray], min_height: int = 4,
+                         max_height: int = 120) -> Optional[float]:
+    """
+    Estima a altura dominante dos caracteres da imagem.
+    
+    A imagem é binarizada por Otsu (o texto é a classe minoritária) e cada
+    componente conexo com proporções de caractere conta como um glifo. A
+    mediana das alturas representa o tamanho da fonte predominante.
+    
+    Args:
+        image (PIL.Image or numpy.ndarray): Imagem RGB ou em escala de cinza
+        min_height (int): Altura mínima de um glifo (descarta ruído)
+        max_height (int): Altura máxima de um glifo (descarta ícones e bordas)
+        
+    Returns:
+        float or None: Altura mediana dos glifos em pixels, ou None se não houver texto
+    """
+    pixels = np.asarray(image)
+    gray = cv2.cvtColor(pixels, cv2.COLOR_RGB2GRAY) if pixels.ndim == 3 else pixels
+    gray = np.ascontiguousarray(gray, dtype=np.uint8)
+    
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    if np.count_nonzero(binary) > binary.size // 2:
+        binary = cv2.bitwise_not(binary)
+    
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    if count <= 1:
+        return None
+    
+    _, _, width, height, area = stats[1:].T
+    glyphs = ((height >= min_height) & (height <= max_height) &
+              (width <= 2 * height) & (area >= 0.1 * width * height))
+    if np.count_nonzero(glyphs) < 3:
+        return None
+    
+    return float(np.median(height[glyphs]))
+
+
+def rank_text_regions(boxes: List[Box], target_text: str) -> List[Box]:
+    """
+    Ordena as caixas pela chance de conterem o texto alvo.
+    
+    O comprimento do alvo dá a proporção esperada (largura/altura) da caixa.
+    Caixas estreitas demais dificilmente contêm o alvo e são penalizadas mais
+    do que caixas largas (uma linha pode conter o alvo e outras palavras).
+    
+    Args:
+        boxes (list): Caixas propostas por detect_text_regions
+        target_text (str): Texto procurado
+        
+    Returns:
+        list: Caixas da mais para a menos provável
+    """
+    if not boxes:
+        return []
+    
+    expected = max(1, len(target_text.strip())) * CHAR_ASPECT
+    sizes = np.array([(box.width, box.height) for box in boxes], dtype=np.float64)
+    ratio = np.log((sizes[:, 0] / np.maximum(sizes[:, 1], 1)) / expected)
+    penalty = np.where(ratio < 0, -2.0 * ratio, 0.5 * ratio)
+    
+    return [boxes[i] for i in np.argsort(penalty, kind="stable")]
@@ -0,0 +1,435 @@
+"""
+Bot Vision Suite - Screen Text Index
+
+Este módulo executa o OCR da tela inteira uma única vez por frame e guarda
+as palavras reconhecidas em um índice espacial (blocos de uma grade) e em um
+hash de texto normalizado. Enquanto o frame não muda, cada busca de texto é
+apenas uma consulta ao dicionário.
+"""
+
+import time
+import logging
+import threading
+from collections import defaultdict, namedtuple
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+from ..utils.text_filters import limpar_texto, matches_filter
+from .location_cache import pixel_fingerprint
+from .ocr_engine import OCRResult
+from .text_detection import split_tiles
+
+logger = logging.getLogger(__name__)
+
+# Texto esparso: telas têm rótulos espalhados, sem layout de página
+INDEX_OCR_CONFIG = r'--oem 3 --psm 11'
+
+# Palavra indexada: box em coordenadas da tela; line agrupa palavras da mesma linha
+IndexedWord = namedtuple("IndexedWord", ["text", "confidence", "box", "line"])
+
+
+def box_iou(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    """Calcula a interseção sobre união de duas caixas (x, y, width, height)."""
+    ix = max(0, min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union > 0 else 0.0
+
+
+def dedupe_words(words: List[IndexedWord], iou_threshold: float = 0.5) -> List[IndexedWord]:
+    """
+    Remove palavras repetidas nas emendas entre blocos sobrepostos.
+    
+    Entre ocorrências do mesmo texto com caixas sobrepostas, mantém a de maior
+    confiança. A ordem original das palavras restantes é preservada.
+    
+    Args:
+        words (list): Palavras indexadas (de todos os blocos)
+        iou_threshold (float): Sobreposição mínima para considerar duplicata
+        
+    Returns:
+        list: Palavras sem duplicatas
+    """
+    by_text = defaultdict(list)
+    for position, word in enumerate(words):
+        by_text[word.text.lower()].append(position)
+    
+    keep = set()
+    for positions in by_text.values():
+        kept = []
+        for position in sorted(positions, key=lambda p: -words[p].confidence):
+            if all(box_iou(words[position].box, words[other].box) < iou_threshold for other in kept):
+                kept.append(position)
+        keep.update(kept)
+    
+    return [word for position, word in enumerate(words) if position in keep]
+
+
+def reading_order(words: List[IndexedWord]) -> List[IndexedWord]:
+    """
+    Ordena as palavras em ordem de leitura.
+    
+    As linhas são ordenadas pelo topo e depois pela esquerda da primeira
+    palavra; dentro de cada linha a ordem do Tesseract é mantida, para que
+    frases continuem em posições consecutivas.
+    
+    Args:
+        words (list): Palavras indexadas (de um ou mais blocos de OCR)
+        
+    Returns:
+        list: Palavras em ordem de leitura
+    """
+    line_keys = {}
+    for word in words:
+        top, left = line_keys.get(word.line, (word.box[1], word.box[0]))
+        line_keys[word.line] = (min(top, word.box[1]), min(left, word.box[0]))
+    order = sorted(range(len(words)), key=lambda p: (line_keys[words[p].line], p))
+    return [words[p] for p in order]
+
+
+class ScreenTextIndex:
+    """
+    Índice das palavras de um frame, construído com uma única passada de OCR.
+    
+    As palavras ficam em blocos de uma grade (consulta espacial) e em um hash
+    texto normalizado -> posições, criado sob demanda para cada tipo de filtro.
+    O índice continua válido enquanto a região consultada não muda; a
+    verificação usa o detector de mudanças (se houver) ou os pixels do frame
+    indexado. Com blocos de OCR (``tile_size``), apenas os blocos alterados
+    são lidos novamente.
+    """
+    
+    def __init__(self, ocr_engine, bucket_size: int = 128, tile_size: int = 0,
+                 tile_overlap: int = 48, ocr_config: str = INDEX_OCR_CONFIG):
+        """
+        Inicializa o índice.
+        
+        Args:
+            ocr_engine (OCREngine): Engine usado para executar o OCR
+            bucket_size (int): Lado dos blocos da grade espacial, em pixels
+            tile_size (int): Lado dos blocos de OCR processados em paralelo; 0 desativa
+            tile_overlap (int): Sobreposição entre blocos de OCR, em pixels
+            ocr_config (str): Configuração do Tesseract usada na indexação
+        """
+        self.ocr_engine = ocr_engine
+        self.bucket_size = max(1, int(bucket_size))
+        self.tile_size = max(0, int(tile_size))
+        self.tile_overlap = max(0, int(tile_overlap))
+        self.ocr_config = ocr_config
+        
+        self.words: List[IndexedWord] = []
+        self.fingerprint = None
+        self.frame_index = None
+        self._source = None
+        self._pixels = None
+        self._tiles = []
+        self._buckets = defaultdict(list)
+        self._normalized = {}  # filter_type -> texto normalizado de cada palavra
+        self._hashes = {}      # filter_type -> {texto normalizado: [posições]}
+        self._lock = threading.RLock()
+        self.stats = {"builds": 0, "updates": 0, "queries": 0, "hits": 0, "build_time": 0.0}
+    
+    def __len__(self) -> int:
+        return len(self.words)
+    
+    def build(self, image: Union[Image.Image, np.ndarray], change_detector=None) -> None:
+        """
+        Executa o OCR do frame e reconstrói o índice.
+        
+        Args:
+            image (PIL.Image or numpy.ndarray): Frame da tela
+            change_detector (ScreenChangeDetector, optional): Detector que já recebeu
+                                                             este frame
+        """
+        pixels, pil_image = self._split_image(image)
+        
+        start = time.perf_counter()
+        tiles = split_tiles(pil_image.width, pil_image.height, self.tile_size, self.tile_overlap)
+        words = self._ocr_tiles(pil_image, tiles, range(len(tiles)))
+        
+        with self._lock:
+            self._tiles = tiles
+            self._store(words, image, pixels, change_detector)
+        
+        elapsed = time.perf_counter() - start
+        self.stats["builds"] += 1
+        self.stats["build_time"] = elapsed
+        logger.debug(f"Índice de texto: {len(words)} palavras em {len(tiles)} bloco(s), {elapsed:.2f}s")
+    
+    def update_tiles(self, image: Union[Image.Image, np.ndarray], tile_indices: List[int],
+                     change_detector=None) -> None:
+        """
+        Lê novamente apenas os blocos de OCR informados.
+        
+        As palavras dos demais blocos são mantidas; o frame deve ter o mesmo
+        tamanho do frame indexado.
+        
+        Args:
+            image (PIL.Image or numpy.ndarray): Frame da tela
+            tile_indices (list): Índices dos blocos (ver ``split_tiles``) a reler
+            change_detector (ScreenChangeDetector, optional): Detector que já recebeu
+                                                             este frame
+        """
+        pixels, pil_image = self._split_image(image)
+        
+        with self._lock:
+            dirty = set(tile_indices)
+            kept = [word for word in self.words if word.line[0] not in dirty]
+            words = dedupe_words(kept + self._ocr_tiles(pil_image, self._tiles, sorted(dirty)))
+            self._store(words, image, pixels, change_detector)
+        
+        self.stats["updates"] += 1
+        logger.debug(f"Índice de texto: {len(dirty)} de {len(self._tiles)} bloco(s) relidos")
+    
+    @staticmethod
+    def _split_image(image: Union[Image.Image, np.ndarray]) -> Tuple[np.ndarray, Image.Image]:
+        """Retorna o frame como array numpy e como imagem PIL."""
+        if isinstance(image, np.ndarray):
+            return image, Image.fromarray(image)
+        return np.asarray(image), image
+    
+    def _ocr_tiles(self, pil_image: Image.Image, tiles: List[Tuple[int, int, int, int]],
+                   tile_indices) -> List[IndexedWord]:
+        """Executa o OCR dos blocos informados (em paralelo se houver mais de um)."""
+        def run(tile_index):
+            x, y, w, h = tiles[tile_index]
+            tile = pil_image if len(tiles) == 1 else pil_image.crop((x, y, x + w, y + h))
+            return self._read_words(self.ocr_engine.image_to_data(tile, self.ocr_config),
+                                    tile_index, x, y)
+        
+        tile_indices = list(tile_indices)
+        if len(tile_indices) == 1:
+            return run(tile_indices[0])
+        words = [word for tile_words in self.ocr_engine.map(run, tile_indices) for word in tile_words]
+        return dedupe_words(words)
+    
+    def _store(self, words: List[IndexedWord], image, pixels: np.ndarray, change_detector) -> None:
+        """Substitui as palavras do índice (em ordem de leitura) e registra o frame de origem."""
+        self.words = words = reading_order(words)
+        self._buckets = defaultdict(list)
+        for position, word in enumerate(words):
+            for key in self._bucket_keys(word.box):
+                self._buckets[key].append(position)
+        self._normalized = {}
+        self._hashes = {}
+        self.fingerprint = pixel_fingerprint(pixels)
+        self.frame_index = change_detector.frame_index if change_detector is not None else None
+        self._source = image
+        self._pixels = pixels
+    
+    @staticmethod
+    def _read_words(data: Dict[str, List], tile_index: int, offset_x: int,
+                    offset_y: int) -> List[IndexedWord]:
+        """Converte a saída do Tesseract em palavras com caixas em coordenadas da tela."""
+        count = len(data['text'])
+        blocks, paragraphs, lines = (data.get(column) or [0] * count
+                                     for column in ('block_num', 'par_num', 'line_num'))
+        words = []
+        for i, text in enumerate(data['text']):
+            text = text.strip()
+            confidence = float(data['conf'][i])
+            if not text or confidence < 0:
+                continue
+            line = (tile_index, blocks[i], paragraphs[i], lines[i])
+            box = (int(data['left'][i]) + offset_x, int(data['top'][i]) + offset_y,
+                   int(data['width'][i]), int(data['height'][i]))
+            words.append(IndexedWord(text, confidence, box, line))
+        return words
+    
+    def _bucket_keys(self, box: Tuple[int, int, int, int]):
+        """Blocos da grade espacial tocados por uma caixa."""
+        size = self.bucket_size
+        for by in range(box[1] // size, (box[1] + max(box[3], 1) - 1) // size + 1):
+            for bx in range(box[0] // size, (box[0] + max(box[2], 1) - 1) // size + 1):
+                yield bx, by
+    
+    def is_current(self, image: Union[Image.Image, np.ndarray], change_detector=None,
+                   region: Optional[Tuple[int, int, int, int]] = None) -> bool:
+        """
+        Verifica se o índice ainda corresponde ao frame informado.
+        
+        Args:
+            image (PIL.Image or numpy.ndarray): Frame atual da tela
+            change_detector (ScreenChangeDetector, optional): Detector que já recebeu
+                                                             o frame atual
+            region (tuple, optional): Verifica apenas esta região (x, y, width, height)
+            
+        Returns:
+            bool: True se a região (ou o frame) não mudou desde a construção do índice
+        """
+        with self._lock:
+            if self.fingerprint is None:
+                return False
+            if image is self._source:
+                return True
+            if change_detector is not None and self.frame_index is not None:
+                return not change_detector.changed_since(region, self.frame_index)
+            pixels = np.asarray(image)
+            if pixels.shape != self._pixels.shape:
+                return False
+            if region is not None:
+                x, y, w, h = region
+                x, y = max(0, x), max(0, y)
+                return np.array_equal(pixels[y:y + h, x:x + w], self._pixels[y:y + h, x:x + w])
+            if pixel_fingerprint(pixels) != self.fingerprint:
+                return False
+            self._source = image
+            return True
+    
+    def _dirty_tiles(self, image: Union[Image.Image, np.ndarray], change_detector=None) -> Optional[List[int]]:
+        """Blocos de OCR alterados desde a indexação, ou None se o índice deve ser refeito."""
+        if self.fingerprint is None or len(self._tiles) <= 1:
+            return None
+        pixels = np.asarray(image)
+        if pixels.shape != self._pixels.shape:
+            return None
+        
+        if change_detector is not None and self.frame_index is not None:
+            dirty = [i for i, tile in enumerate(self._tiles)
+                     if change_detector.changed_since(tile, self.frame_index)]
+        else:
+            dirty = [i for i, (x, y, w, h) in enumerate(self._tiles)
+                     if not np.array_equal(pixels[y:y + h, x:x + w], self._pixels[y:y + h, x:x + w])]
+        return dirty if len(dirty) < len(self._tiles) else None
+    
+    def ensure(self, image: Union[Image.Image, np.ndarray], change_detector=None,
+               region: Optional[Tuple[int, int, int, int]] = None) -> bool:
+        """
+        Atualiza o índice apenas se a região consultada mudou.
+        
+        Mudanças fora da região (relógio, cursor piscando...) não provocam OCR.
+        Quando há mudança, apenas os blocos de OCR alterados são relidos.
+        
+        Args:
+            image (PIL.Image or numpy.ndarray): Frame atual da tela
+            change_detector (ScreenChangeDetector, optional): Detector que já recebeu
+                                                             o frame atual
+            region (tuple, optional): Região da consulta; None para a tela inteira
+            
+        Returns:
+            bool: True se o índice foi atualizado
+        """
+        with self._lock:
+            if self.is_current(image, change_detector, region):
+                return False
+            dirty = self._dirty_tiles(image, change_detector)
+            if dirty is None:
+                self.build(image, change_detector)
+            else:
+                self.update_tiles(image, dirty, change_detector)
+            return True
+    
+    def invalidate(self) -> None:
+        """Descarta o índice atual (a próxima consulta exigirá nova construção)."""
+        with self._lock:
+            self.words = []
+            self._buckets = defaultdict(list)
+            self._normalized = {}
+            self._hashes = {}
+            self.fingerprint = None
+            self.frame_index = None
+            self._source = None
+            self._pixels = None
+            self._tiles = []
+    
+    def _text_hash(self, filter_type: str) -> Dict[str, List[int]]:
+        """Retorna (criando na primeira consulta) o hash texto -> posições para o filtro."""
+        if filter_type not in self._hashes:
+            normalized = []
+            positions = defaultdict(list)
+            for position, word in enumerate(self.words):
+                cleaned = limpar_texto(word.text, filter_type)
+                cleaned = cleaned.lower() if cleaned and matches_filter(cleaned, filter_type) else ""
+                normalized.append(cleaned)
+                if cleaned:
+                    positions[cleaned].append(position)
+            self._normalized[filter_type] = normalized
+            self._hashes[filter_type] = dict(positions)
+        return self._hashes[filter_type]
+    
+    def words_in(self, region: Tuple[int, int, int, int]) -> List[IndexedWord]:
+        """
+        Retorna as palavras que tocam uma região da tela.
+        
+        Args:
+            region (tuple): (x, y, width, height)
+            
+        Returns:
+            list: Palavras em ordem de leitura
+        """
+        with self._lock:
+            positions = set()
+            for key in self._bucket_keys(region):
+                positions.update(self._buckets.get(key, ()))
+            return [self.words[p] for p in sorted(positions) if _intersects(self.words[p].box, region)]
+    
+    def find(self, text: str, filter_type: str = "both",
+             region: Optional[Tuple[int, int, int, int]] = None,
+             min_confidence: float = 0.0) -> List[OCRResult]:
+        """
+        Procura um texto (uma ou mais palavras) no índice.
+        
+        Args:
+            text (str): Texto a ser encontrado
+            filter_type (str): Tipo de filtro ("numbers", "letters", "both")
+            region (tuple, optional): Restringe a busca a palavras dentro da região
+            min_confidence (float): Confiança média mínima da ocorrência
+            
+        Returns:
+            list: OCRResult (caixas em coordenadas da tela) em ordem de leitura
+        """
+        target_words = [limpar_texto(word, filter_type) for word in text.split()]
+        target_words = [w.lower() for w in target_words if matches_filter(w, filter_type)]
+        
+        with self._lock:
+            self.stats["queries"] += 1
+            if not target_words:
+                return []
+            candidates = self._text_hash(filter_type).get(target_words[0], [])
+            normalized = self._normalized[filter_type]
+            n_words = len(target_words)
+            
+            results = []
+            for start in candidates:
+                end = start + n_words
+                if end > len(self.words):
+                    continue
+                words = self.words[start:end]
+                if any(word.line != words[0].line for word in words):
+                    continue
+                if normalized[start:end] != target_words:
+                    continue
+                
+                lefts = [w.box[0] for w in words]
+                tops = [w.box[1] for w in words]
+                box = (min(lefts), min(tops),
+                       max(w.box[0] + w.box[2] for w in words) - min(lefts),
+                       max(w.box[1] + w.box[3] for w in words) - min(tops))
+                if region is not None and not _inside(box, region):
+                    continue
+                
+                positive = [w.confidence for w in words if w.confidence > 0]
+                confidence = sum(positive) / len(positive) if positive else 0.0
+                if confidence < min_confidence:
+                    continue
+                results.append(OCRResult(' '.join(w.text for w in words), confidence, box))
+            
+            if results:
+                self.stats["hits"] += 1
+            return results
+
+
+def _inside(box: Tuple[int, int, int, int], region: Tuple[int, int, int, int]) -> bool:
+    """Verifica se uma caixa está inteiramente dentro da região."""
+    return (box[0] >= region[0] and box[1] >= region[1] and
+            box[0] + box[2] <= region[0] + region[2] and
+            box[1] + box[3] <= region[1] + region[3])
+
+
+def _intersects(box: Tuple[int, int, int, int], region: Tuple[int, int, int, int]) -> bool:
+    """Verifica se uma caixa toca a região."""
+    return (box[0] < region[0] + region[2] and region[0] < box[0] + box[2] and
+            box[1] < region[1] + region[3] and region[1] < box[1] + box[3])
@@ -0,0 +1,161 @@
+"""
+Bot Vision Suite - Wait Conditions
+
+Este módulo substitui esperas fixas (time.sleep) por esperas orientadas a
+eventos: a tela (ou uma região) é amostrada em alta frequência e a espera
+termina assim que a interface estabiliza, muda ou o alvo aparece.
+"""
+
+import time
+import logging
+from typing import Callable, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from ..exceptions import ConfigurationError
+from .screen_capture import FrameProvider
+
+logger = logging.getLogger(__name__)
+
+# Condições aceitas por wait_for (e pela chave 'wait_until' das tarefas)
+WAIT_CONDITIONS = ("stable", "changed", "appeared")
+
+
+def frame_signature(pixels: np.ndarray, max_side: int = 256) -> np.ndarray:
+    """
+    Reduz um recorte da tela a uma assinatura barata de comparar.
+    
+    Args:
+        pixels (numpy.ndarray): Recorte RGB da tela
+        max_side (int): Maior lado da assinatura, em pixels
+        
+    Returns:
+        numpy.ndarray: Imagem em escala de cinza reduzida (uint8)
+    """
+    gray = cv2.cvtColor(np.ascontiguousarray(pixels), cv2.COLOR_RGB2GRAY) if pixels.ndim == 3 else pixels
+    height, width = gray.shape[:2]
+    factor = max_side / max(height, width)
+    if factor < 1.0:
+        gray = cv2.resize(gray, (max(1, int(width * factor)), max(1, int(height * factor))),
+                          interpolation=cv2.INTER_AREA)
+    return gray
+
+
+def signatures_differ(a: np.ndarray, b: np.ndarray, threshold: int = 12) -> bool:
+    """
+    Compara duas assinaturas de frame.
+    
+    Args:
+        a (numpy.ndarray): Assinatura anterior
+        b (numpy.ndarray): Assinatura atual
+        threshold (int): Diferença mínima de intensidade considerada mudança
+        
+    Returns:
+        bool: True se algum ponto mudou mais do que o limiar
+    """
+    if a.shape != b.shape:
+        return True
+    return int(cv2.absdiff(a, b).max()) > threshold
+
+
+def wait_for(condition: Union[str, Callable[[], bool]],
+             region: Optional[Tuple[int, int, int, int]] = None,
+             timeout: float = 5.0, poll_interval: float = 0.05,
+             frame_provider: Optional[FrameProvider] = None,
+             target: Optional[Callable[[], bool]] = None,
+             stable_for: float = 0.2, diff_threshold: int = 12,
+             baseline: Optional[np.ndarray] = None) -> bool:
+    """
+    Aguarda até que uma condição da tela seja satisfeita.
+    
+    Condições:
+        - "stable": a região não muda por ``stable_for`` segundos
+        - "changed": a região difere do estado inicial (ou de ``baseline``)
+        - "appeared": ``target()`` retorna verdadeiro (ex: imagem encontrada)
+        - função: a própria função retorna verdadeiro
+    
+    Para "stable" e "changed" apenas a região é capturada a cada verificação.
+    Para funções e "appeared" nada é capturado aqui: o cache do FrameProvider
+    é descartado, então a própria condição enxerga a tela atual. Falhas de
+    captura não interrompem a espera (a verificação é repetida).
+    
+    Args:
+        condition (str or callable): Condição a aguardar
+        region (tuple, optional): Região (x, y, width, height) observada; None para a tela inteira
+        timeout (float): Espera máxima em segundos
+        poll_interval (float): Intervalo entre verificações em segundos
+        frame_provider (FrameProvider, optional): Provedor de frames (padrão: novo, sem cache)
+        target (callable, optional): Verificação usada por "appeared"
+        stable_for (float): Tempo sem mudanças para considerar a região estável
+        diff_threshold (int): Diferença mínima de intensidade considerada mudança
+        baseline (numpy.ndarray, optional): Assinatura inicial para "changed" (ver frame_signature)
+        
+    Returns:
+        bool: True se a condição foi satisfeita, False se o tempo esgotou
+        
+    Raises:
+        ConfigurationError: Se a condição for desconhecida ou "appeared" não tiver alvo
+    """
+    if callable(condition):
+        check = condition
+    elif condition == "appeared":
+        if target is None:
+            raise ConfigurationError("A condição 'appeared' requer um alvo (target)")
+        check = target
+    elif condition in WAIT_CONDITIONS:
+        check = None
+    else:
+        raise ConfigurationError(f"Condição de espera desconhecida: '{condition}'. "
+                                 f"Use {', '.join(WAIT_CONDITIONS)} ou uma função")
+    
+    frame_provider = frame_provider or FrameProvider(ttl=0)
+    start = time.monotonic()
+    deadline = start + timeout
+    
+    def capture() -> Optional[np.ndarray]:
+        """Assinatura atual da região, ou None se a captura falhar."""
+        if check is not None:
+            # A condição captura por conta própria: basta descartar o frame em cache
+            frame_provider.invalidate()
+            return None
+        try:
+            if region is None:
+                return frame_signature(frame_provider.grab(None, force=True))
+            # Apenas a região observada é capturada, sem o frame inteiro
+            return frame_signature(frame_provider.backend.grab(region))
+        except Exception as e:
+            logger.debug(f"Erro ao capturar frame durante a espera: {e}")
+            return None
+    
+    current = capture()
+    previous = current
+    stable_since = start
+    
+    while True:
+        now = time.monotonic()
+        if check is not None:
+            if check():
+                logger.debug(f"Condição satisfeita após {now - start:.2f}s")
+                return True
+        elif condition == "changed":
+            if baseline is None:
+                baseline = current
+            elif current is not None and signatures_differ(baseline, current, diff_threshold):
+                logger.debug(f"Região {region} mudou após {now - start:.2f}s")
+                return True
+        else:
+            if current is None or previous is None or signatures_differ(previous, current, diff_threshold):
+                stable_since = now
+            elif now - stable_since >= stable_for:
+                logger.debug(f"Região {region} estável após {now - start:.2f}s")
+                return True
+        
+        remaining = deadline - now
+        if remaining <= 0:
+            logger.debug(f"Tempo esgotado aguardando '{condition}' ({timeout:.2f}s)")
+            return False
+        time.sleep(min(poll_interval, remaining))
+        
+        previous = current
+        current = capture()
@@ -12,6 +12,12 @@ from .text_filters import (
     extract_letters_from_text
 )
 
+from .fuzzy import (
+    bounded_levenshtein,
+    substitution_cost,
+    OCR_CONFUSIONS
+)
+
 from .config import (
     BotVisionConfig,
     create_config_from_file,
@@ -25,6 +31,10 @@ __all__ = [
     "validate_text_input",
     "extract_numbers_from_text",
     "extract_letters_from_text",
+    # Fuzzy matching
+    "bounded_levenshtein",
+    "substitution_cost",
+    "OCR_CONFUSIONS",
     # Config
     "BotVisionConfig",
     "create_config_from_file",
@@ -86,7 +86,54 @@ class BotVisionConfig:
             "overlay_enabled": True,  # Controla se o sistema de overlay está ativo
             "log_level": "INFO",
             "ocr_languages": ["eng"],
+            "ocr_backend": "auto",  # auto, tesserocr (engine persistente) ou pytesseract
+            "ocr_tesserocr_instances": 4,  # Máximo de APIs tesserocr (modelos carregados) por thread
+            "ocr_parallel": False,  # Executa a grade (pré-processamento x config) em paralelo
+            "ocr_max_workers": None,  # Workers do OCR paralelo (None = número de CPUs)
+            "ocr_adaptive_order": True,  # Tenta primeiro as combinações que já encontraram o texto
+            "ocr_stats_path": None,  # Arquivo JSON para persistir as estatísticas de OCR
+            "ocr_config_planner": True,  # Pula configurações que não podem encontrar o alvo (whitelist, PSM de palavra)
+            "ocr_prune_page_modes": False,  # Pula também PSM 6/11 em imagens da altura de uma linha
+            "ocr_single_line_height": 48,  # Altura máxima (px) de uma imagem considerada de linha única
+            "ocr_target_constraints": False,  # Whitelist pelo filtro/alvo e dicionários do Tesseract desligados
+            "ocr_user_words": False,  # Também grava user-words/patterns por alvo (tesserocr: uma API por alvo, limitada por ocr_tesserocr_instances)
+            "ocr_fuzzy": False,  # Aceita palavras quase iguais ao alvo (ex: "Salv0" para "Salvo")
+            "ocr_fuzzy_max_ratio": 0.25,  # Distância de edição máxima por caractere do alvo
+            "ocr_normalize_text_height": False,  # Redimensiona a região para a altura de texto ideal do OCR
+            "ocr_target_text_height": 22.0,  # Altura mediana dos glifos (px) após a normalização
+            "ocr_text_detection": False,  # Detecta caixas de texto e faz OCR só nos recortes, sem a grade completa (regiões grandes)
+            "ocr_detection_min_area": 250000,  # Área mínima (px) da região para usar a detecção de texto
+            "ocr_detection_max_regions": 20,  # Máximo de recortes enviados ao OCR, em ordem de prioridade
+            "ocr_detection_variants": 3,  # Variações de pré-processamento testadas em cada recorte
+            "ocr_detection_merge_gap": 9,  # Espaço horizontal (px) unido dentro de uma caixa de texto
+            "ocr_tiled": False,  # Divide regiões grandes (tela inteira) em blocos processados em paralelo
+            "ocr_tile_size": 640,  # Lado dos blocos em pixels (aumentado se o alvo não couber na sobreposição)
+            "ocr_tile_overlap": 48,  # Sobreposição mínima entre blocos (ao menos a altura do texto)
+            "ocr_tile_min_area": 1000000,  # Área mínima (px) da região para usar blocos
+            "ocr_tile_pool": "thread",  # thread ou process (exige o guarda if __name__ == "__main__" no script)
+            "ocr_tile_workers": None,  # Workers do pool de blocos (None = número de CPUs)
             "image_processing_methods": "all",  # ou lista específica
+            "frame_cache_ttl": 0.25,  # Validade (s) do frame da tela em cache (0 desativa)
+            "capture_backend": "auto",  # auto, mss, pyautogui ou instância de CaptureBackend
+            "template_grayscale": False,  # Busca de imagens em escala de cinza (mais rápida)
+            "template_cache_max_bytes": 64 * 1024 * 1024,  # Memória máxima do cache de templates
+            "template_pyramid": True,  # Busca multiescala em pirâmide (grosso para fino)
+            "location_cache": True,  # Verifica a última posição de cada tarefa antes da busca completa
+            "location_cache_ttl": 3600.0,  # Validade das posições memorizadas em segundos
+            "location_cache_path": None,  # Arquivo JSON para persistir as posições entre execuções
+            "location_cache_save_interval": 5.0,  # Intervalo mínimo entre gravações do arquivo de posições (s)
+            "ocr_result_cache": True,  # Reutiliza o OCR quando os pixels da região não mudaram
+            "ocr_result_cache_size": 128,  # Máximo de resultados de OCR em cache
+            "ocr_dhash_tolerance": 0,  # Bits de diferença aceitos no dHash (0: apenas pixels idênticos)
+            "change_detection": True,  # Mapa de blocos alterados entre capturas (ScreenChangeDetector)
+            "change_tile_size": 64,  # Lado dos blocos do detector de mudanças em pixels
+            "smart_waits": False,  # Troca as pausas fixas entre ações por esperas até a tela estabilizar
+            "wait_timeout": 5.0,  # Espera máxima padrão de wait_for/wait_until em segundos
+            "wait_poll_interval": 0.05,  # Intervalo entre verificações da tela durante esperas
+            "wait_stable_time": 0.2,  # Tempo sem mudanças para considerar a tela estável
+            "text_index": False,  # OCR da tela inteira uma vez por frame; buscas de texto consultam o índice
+            "text_index_tile_size": 0,  # Lado dos blocos de OCR do índice processados em paralelo (0 desativa)
+            "text_index_min_confidence": 60.0,  # Confiança mínima para aceitar uma ocorrência do índice
             "click_duration": 0.1,
             "movement_duration": 0.1,
         }
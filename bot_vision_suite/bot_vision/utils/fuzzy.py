@@ -0,0 +1,128 @@
+"""
+Bot Vision Suite - Fuzzy Matching
+
+Este módulo contém a distância de edição usada para aceitar palavras quase
+iguais ao alvo. Trocas típicas do OCR ("0" por "o", "1" por "l", letras sem
+acento) custam menos que uma substituição comum, e o cálculo é interrompido
+assim que a distância ultrapassa o limite.
+"""
+
+import unicodedata
+from functools import lru_cache
+from typing import List, Optional
+
+# Pares de caracteres que o OCR costuma confundir (em minúsculas) e o custo da troca
+OCR_CONFUSIONS = {
+    frozenset(("0", "o")): 0.3,
+    frozenset(("1", "l")): 0.3,
+    frozenset(("1", "i")): 0.3,
+    frozenset(("l", "i")): 0.3,
+    frozenset(("5", "s")): 0.4,
+    frozenset(("8", "b")): 0.4,
+    frozenset(("2", "z")): 0.4,
+    frozenset(("6", "g")): 0.5,
+    frozenset(("9", "g")): 0.5,
+    frozenset(("u", "v")): 0.5,
+    frozenset(("c", "e")): 0.5,
+    frozenset(("n", "h")): 0.6,
+}
+
+# Custo de trocar uma letra pela mesma letra com ou sem acento
+ACCENT_COST = 0.2
+
+
+@lru_cache(maxsize=512)
+def _strip_accent(char: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", char)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)) or char
+
+
+def substitution_cost(a: str, b: str) -> float:
+    """
+    Custo de substituir um caractere por outro.
+    
+    Args:
+        a (str): Caractere do texto reconhecido
+        b (str): Caractere do texto alvo
+        
+    Returns:
+        float: 0 para caracteres iguais, custo reduzido para confusões típicas do OCR, 1 caso contrário
+    """
+    if a == b:
+        return 0.0
+    if _strip_accent(a) == _strip_accent(b):
+        return ACCENT_COST
+    return OCR_CONFUSIONS.get(frozenset((a, b)), 1.0)
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: float) -> Optional[float]:
+    """
+    Distância de edição ponderada, limitada a ``max_distance``.
+    
+    Inserções e remoções custam 1; substituições seguem substitution_cost.
+    O cálculo para assim que nenhuma célula da linha corrente fica dentro do
+    limite.
+    
+    Args:
+        a (str): Texto reconhecido
+        b (str): Texto alvo
+        max_distance (float): Distância máxima aceita
+        
+    Returns:
+        float or None: Distância, ou None se ultrapassar o limite
+        
+    Examples:
+        >>> bounded_levenshtein("salv0", "salvo", 1.0)
+        0.3
+        >>> bounded_levenshtein("abrir", "salvar", 1.0) is None
+        True
+    """
+    if a == b:
+        return 0.0
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    
+    previous = [float(j) for j in range(len(b) + 1)]
+    for i, char_a in enumerate(a, 1):
+        current = [float(i)] + [0.0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(previous[j] + 1.0,
+                             current[j - 1] + 1.0,
+                             previous[j - 1] + substitution_cost(char_a, char_b))
+        if min(current) > max_distance:
+            return None
+        previous = current
+    
+    distance = previous[-1]
+    return round(distance, 6) if distance <= max_distance else None
+
+
+def fuzzy_words_distance(words: List[str], target_words: List[str],
+                         max_ratio: float) -> Optional[float]:
+    """
+    Distância entre duas sequências de palavras, palavra a palavra.
+    
+    Cada palavra pode ter no máximo ``max_ratio * len(palavra_alvo)`` de
+    distância; a soma é comparada com o mesmo limite sobre o texto inteiro.
+    
+    Args:
+        words (list): Palavras reconhecidas (limpas, em minúsculas)
+        target_words (list): Palavras do alvo (limpas, em minúsculas)
+        max_ratio (float): Distância máxima por caractere do alvo
+        
+    Returns:
+        float or None: Distância total, ou None se alguma palavra não corresponder
+    """
+    if len(words) != len(target_words):
+        return None
+    
+    remaining = max_ratio * sum(len(word) for word in target_words)
+    total = 0.0
+    for word, target in zip(words, target_words):
+        if not word:
+            return None
+        distance = bounded_levenshtein(word, target, min(max_ratio * len(target), remaining - total))
+        if distance is None:
+            return None
+        total += distance
+    return total
@@ -0,0 +1,44 @@
+"""
+Shared helpers for tests that build an OCREngine without Tesseract installed.
+"""
+import sys
+from unittest.mock import MagicMock, patch
+
+from bot_vision.core import ocr_engine
+from bot_vision.core.ocr_engine import OCREngine
+
+
+def make_config(**overrides):
+    """Create a config mock that does not require Tesseract to be installed."""
+    values = {"ocr_backend": "auto", "ocr_languages": ["eng"], "tesseract_data_path": None}
+    values.update(overrides)
+    config = MagicMock()
+    config.get.side_effect = lambda key, default=None: values.get(key, default)
+    return config
+
+
+def ocr_data(text=(), conf=(), left=(), top=(), width=(), height=()):
+    """Build a pytesseract-style image_to_data dictionary."""
+    return {"text": list(text), "conf": list(conf), "left": list(left), "top": list(top),
+            "width": list(width), "height": list(height)}
+
+
+def make_engine(data=None, **overrides):
+    """
+    Create an OCREngine on the pytesseract backend with tesserocr hidden.
+    
+    Args:
+        data: Fake tesseract output; a dict is returned by every
+              ``_image_to_data`` call, a callable is used as its side effect.
+              None keeps the real ``_image_to_data``.
+        **overrides: Config values
+    """
+    ocr_engine._backend_cache.clear()
+    overrides.setdefault("ocr_backend", "pytesseract")
+    with patch.dict(sys.modules, {"tesserocr": None}):
+        engine = OCREngine(make_config(**overrides))
+    if callable(data):
+        engine._image_to_data = MagicMock(side_effect=data)
+    elif data is not None:
+        engine._image_to_data = MagicMock(return_value=data)
+    return engine
@@ -0,0 +1,101 @@
+"""
+Unit tests for OCR-aware fuzzy matching.
+"""
+import unittest
+
+from PIL import Image
+
+from bot_vision.core.ocr_engine import OCRWords
+from bot_vision.utils.fuzzy import bounded_levenshtein, fuzzy_words_distance, substitution_cost
+
+from .helpers import make_engine
+
+
+class TestBoundedLevenshtein(unittest.TestCase):
+    """Test the weighted, bounded edit distance."""
+    
+    def test_ocr_confusions_are_cheap(self):
+        self.assertEqual(substitution_cost("0", "o"), 0.3)
+        self.assertEqual(substitution_cost("a", "á"), 0.2)
+        self.assertEqual(substitution_cost("a", "x"), 1.0)
+        self.assertAlmostEqual(bounded_levenshtein("sa1var", "salvar", 1.0), 0.3)
+        self.assertAlmostEqual(bounded_levenshtein("confirmacao", "confirmação", 1.0), 0.4)
+    
+    def test_plain_edits(self):
+        self.assertEqual(bounded_levenshtein("salvar", "salvar", 0), 0.0)
+        self.assertEqual(bounded_levenshtein("salva", "salvar", 1.0), 1.0)
+        self.assertEqual(bounded_levenshtein("salvor", "salvar", 1.0), 1.0)
+    
+    def test_limit_stops_early(self):
+        self.assertIsNone(bounded_levenshtein("abrir", "salvar", 1.0))
+        self.assertIsNone(bounded_levenshtein("ab", "abcdef", 2.0))
+        self.assertIsNone(bounded_levenshtein("salva", "salvar", 0.5))
+    
+    def test_words_distance_is_bounded_per_word(self):
+        self.assertAlmostEqual(fuzzy_words_distance(["n0me", "completo"], ["nome", "completo"], 0.25), 0.3)
+        self.assertIsNone(fuzzy_words_distance(["nxxe", "completo"], ["nome", "completo"], 0.25))
+        self.assertIsNone(fuzzy_words_distance(["", "completo"], ["nome", "completo"], 0.25))
+
+
+class TestFuzzyOCRMatching(unittest.TestCase):
+    """Test that near-matches are folded into the OCR confidence."""
+    
+    DATA = {
+        "text": ["N0me", "completo", "Sa1var"],
+        "conf": [90.0, 90.0, 80.0],
+        "left": [10, 60, 10],
+        "top": [5, 5, 40],
+        "width": [40, 70, 50],
+        "height": [12, 12, 12],
+    }
+    
+    def make_engine(self, **overrides):
+        return make_engine(self.DATA, **overrides)
+    
+    def test_disabled_by_default(self):
+        engine = self.make_engine()
+        
+        boxes, _, _ = engine.find_text(Image.new("RGB", (150, 60)), "Nome completo", "both", 200.0)
+        
+        self.assertEqual(boxes, [])
+    
+    def test_near_match_lowers_confidence(self):
+        engine = self.make_engine(ocr_fuzzy=True)
+        words = OCRWords(self.DATA, "both")
+        
+        results = engine._match_target(words, "Nome completo", "both", 2, 20, 0.0)
+        
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].box, (10, 5, 120, 12))
+        self.assertAlmostEqual(results[0].confidence, 90.0 * (1 - 0.3 / 12) + 2)
+    
+    def test_exact_match_is_preferred(self):
+        engine = self.make_engine(ocr_fuzzy=True)
+        data = dict(self.DATA, text=["Nome", "completo", "Sa1var"])
+        
+        results = engine._match_target(OCRWords(data, "both"), "Nome completo", "both", 2, 20, 0.0)
+        
+        self.assertAlmostEqual(results[0].confidence, 92.0)
+    
+    def test_letters_filter_and_far_words(self):
+        engine = self.make_engine(ocr_fuzzy=True)
+        words = OCRWords(self.DATA, "letters")
+        
+        self.assertEqual(len(engine._match_target(words, "Salvar", "letters", 2, 20, 0.0)), 1)
+        self.assertEqual(engine._match_target(words, "Cancelar", "letters", 2, 20, 0.0), [])
+    
+    
+    def test_filtered_characters_keep_their_confusion_cost(self):
+        engine = self.make_engine(ocr_fuzzy=True)
+        data = dict(self.DATA, text=["N0me", "completo", "Salv0"])
+        
+        results = engine._match_target(OCRWords(data, "letters"), "Salvo", "letters", 2, 20, 0.0)
+        
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].box, (10, 40, 50, 12))
+        self.assertAlmostEqual(results[0].confidence - engine.confidence_bonuses["letters"].get(2, 0),
+                               80.0 * (1 - 0.3 / 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
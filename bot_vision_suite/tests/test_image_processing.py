@@ -0,0 +1,114 @@
+"""
+Unit tests for the OCR preprocessing pipeline.
+"""
+import unittest
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from bot_vision.core.image_processing import ImageProcessor, LazyPreprocessedImages, batch_threshold
+from bot_vision.core.text_detection import estimate_text_height
+from bot_vision.exceptions import ImageProcessingError
+
+
+class TestBatchThreshold(unittest.TestCase):
+    """Test the vectorized threshold stage."""
+    
+    def setUp(self):
+        self.gray = np.random.default_rng(1).integers(0, 256, (30, 50), dtype=np.uint8)
+    
+    def test_matches_cv2_threshold(self):
+        stack = batch_threshold(self.gray, [127, 140, 180], inverse=(False, True, True))
+        
+        self.assertEqual(stack.shape, (3, 30, 50))
+        self.assertEqual(stack.dtype, np.uint8)
+        expected = [
+            cv2.threshold(self.gray, 127, 255, cv2.THRESH_BINARY)[1],
+            cv2.threshold(self.gray, 140, 255, cv2.THRESH_BINARY_INV)[1],
+            cv2.threshold(self.gray, 180, 255, cv2.THRESH_BINARY_INV)[1],
+        ]
+        for binary, reference in zip(stack, expected):
+            self.assertTrue(np.array_equal(binary, reference))
+    
+    def test_reuses_output_stack(self):
+        out = np.empty((2, 30, 50), dtype=np.uint8)
+        stack = batch_threshold(self.gray, [100, 200], out=out)
+        self.assertIs(stack, out)
+    
+    def test_rejects_color_input(self):
+        with self.assertRaises(ImageProcessingError):
+            batch_threshold(np.zeros((5, 5, 3), dtype=np.uint8), [127])
+
+
+class TestLazyPreprocessing(unittest.TestCase):
+    """Test the lazy preprocessing sequence."""
+    
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.image = Image.fromarray(rng.integers(0, 256, (40, 80, 3), dtype=np.uint8))
+        self.processor = ImageProcessor()
+    
+    def test_lazy_matches_eager(self):
+        eager = self.processor.preprocess_for_ocr(self.image)
+        lazy = self.processor.preprocess_for_ocr_lazy(self.image)
+        
+        self.assertEqual(len(lazy), len(eager))
+        for index in reversed(range(len(eager))):
+            self.assertEqual(lazy[index].mode, eager[index].mode)
+            self.assertTrue(np.array_equal(np.array(lazy[index]), np.array(eager[index])))
+    
+    def test_variants_computed_on_demand(self):
+        lazy = self.processor.preprocess_for_ocr_lazy(self.image)
+        self.assertIsInstance(lazy, LazyPreprocessedImages)
+        self.assertEqual(lazy.computed, 0)
+        
+        first = lazy[0]
+        
+        self.assertEqual(lazy.computed, 1)
+        self.assertIs(lazy[0], first)
+    
+    def test_index_out_of_range(self):
+        lazy = self.processor.preprocess_for_ocr_lazy(self.image)
+        with self.assertRaises(IndexError):
+            lazy[len(lazy)]
+
+
+class TestTextHeightNormalization(unittest.TestCase):
+    """Test glyph-height estimation and the single resize before OCR."""
+    
+    @staticmethod
+    def make_text(font_scale):
+        img = np.full((200, 500, 3), 235, dtype=np.uint8)
+        cv2.putText(img, "Nome completo do cliente", (10, 60), cv2.FONT_HERSHEY_SIMPLEX,
+                    font_scale, (20, 20, 20), 1)
+        cv2.putText(img, "Salvar alteracoes", (10, 150), cv2.FONT_HERSHEY_SIMPLEX,
+                    font_scale, (20, 20, 20), 1)
+        return img
+    
+    def test_estimate_grows_with_font(self):
+        small = estimate_text_height(self.make_text(0.5))
+        large = estimate_text_height(self.make_text(1.0))
+        
+        self.assertTrue(6 <= small <= 10)
+        self.assertTrue(13 <= large <= 17)
+        self.assertIsNone(estimate_text_height(np.full((50, 50), 255, dtype=np.uint8)))
+    
+    def test_small_text_is_upscaled_to_target(self):
+        img, scale = ImageProcessor().normalize_text_height(Image.fromarray(self.make_text(0.5)), 22.0)
+        
+        self.assertGreater(scale, 2.0)
+        self.assertEqual(img.size, (round(500 * scale), round(200 * scale)))
+        self.assertAlmostEqual(estimate_text_height(np.asarray(img)), 22.0, delta=3.0)
+    
+    def test_text_near_target_is_untouched(self):
+        original = Image.fromarray(self.make_text(1.0))
+        
+        img, scale = ImageProcessor().normalize_text_height(original, 15.0)
+        
+        self.assertIs(img, original)
+        self.assertEqual(scale, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
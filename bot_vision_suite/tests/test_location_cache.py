@@ -0,0 +1,203 @@
+"""
+Unit tests for the location memory used by repeated tasks.
+"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from PIL import Image
+
+from bot_vision.core.location_cache import (
+    LocationCache,
+    image_signature,
+    pixel_fingerprint,
+    text_signature,
+)
+from bot_vision.core.screen_capture import SyntheticCaptureBackend
+from bot_vision.core.task_executor import TaskExecutor
+
+
+class TestLocationCache(unittest.TestCase):
+    """Test LocationCache storage, expiry and persistence."""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+    
+    def test_signatures(self):
+        self.assertEqual(text_signature("  Salvar  Tudo ", "Letters", (1, 2, 3, 4)),
+                         "text|letters|salvar tudo|1,2,3,4")
+        self.assertTrue(image_signature("button.png").endswith("button.png|*"))
+    
+    def test_put_get_and_reject(self):
+        cache = LocationCache()
+        cache.put("sig", (1, 2, 3, 4), "abc")
+        
+        entry = cache.get("sig")
+        self.assertEqual(entry["box"], (1, 2, 3, 4))
+        self.assertEqual(entry["fingerprint"], "abc")
+        
+        cache.reject("sig")
+        self.assertIsNone(cache.get("sig"))
+        self.assertEqual(cache.stats["rejected"], 1)
+        self.assertEqual(cache.stats["misses"], 2)
+    
+    def test_entries_expire(self):
+        cache = LocationCache(ttl=10)
+        cache.put("sig", (1, 2, 3, 4))
+        
+        with patch("bot_vision.core.location_cache.time.time", return_value=time.time() + 60):
+            self.assertIsNone(cache.get("sig"))
+        self.assertEqual(cache.stats["expired"], 1)
+    
+    def test_max_entries_evicts_oldest(self):
+        cache = LocationCache(max_entries=2)
+        for index in range(3):
+            cache.put(f"sig{index}", (index, 0, 1, 1))
+        
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("sig0"))
+    
+    def test_persistence(self):
+        path = os.path.join(self.tmpdir, "locations.json")
+        cache = LocationCache(persist_path=path)
+        cache.put("sig", (5, 6, 7, 8), "abc")
+        cache.close()
+        
+        self.assertEqual(LocationCache(persist_path=path).get("sig")["box"], (5, 6, 7, 8))
+    
+    def test_saves_are_throttled(self):
+        path = os.path.join(self.tmpdir, "locations.json")
+        cache = LocationCache(persist_path=path, save_interval=60.0)
+        
+        with patch.object(cache, "save", wraps=cache.save) as save:
+            for index in range(5):
+                cache.put(f"sig{index}", (index, 0, 1, 1))
+            self.assertEqual(save.call_count, 0)
+            self.assertFalse(os.path.exists(path))
+            
+            cache.flush()
+            cache.flush()
+            self.assertEqual(save.call_count, 1)
+        
+        self.assertEqual(len(LocationCache(persist_path=path)), 5)
+    
+    def test_pixel_fingerprint_depends_on_content_and_shape(self):
+        pixels = np.zeros((4, 6, 3), dtype=np.uint8)
+        
+        self.assertEqual(pixel_fingerprint(pixels), pixel_fingerprint(pixels.copy()))
+        self.assertNotEqual(pixel_fingerprint(pixels), pixel_fingerprint(pixels.reshape(6, 4, 3)))
+        changed = pixels.copy()
+        changed[0, 0, 0] = 1
+        self.assertNotEqual(pixel_fingerprint(pixels), pixel_fingerprint(changed))
+
+
+class TestExecutorLocationMemory(unittest.TestCase):
+    """Test that the executor verifies remembered locations before searching."""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        
+        rng = np.random.default_rng(3)
+        self.screen = rng.integers(0, 256, (200, 300, 3), dtype=np.uint8)
+        self.image_path = os.path.join(self.tmpdir, "button.png")
+        Image.fromarray(self.screen[40:70, 100:150]).save(self.image_path)
+        
+        self.backend = SyntheticCaptureBackend(self.screen)
+        with patch("bot_vision.core.task_executor.OCREngine"):
+            self.executor = TaskExecutor({"capture_backend": self.backend, "frame_cache_ttl": 0})
+    
+    def test_close_saves_pending_locations(self):
+        path = os.path.join(self.tmpdir, "locations.json")
+        with patch("bot_vision.core.task_executor.OCREngine") as engine_class:
+            executor = TaskExecutor({"capture_backend": self.backend, "location_cache_path": path,
+                                     "location_cache_save_interval": 60.0})
+        executor.location_cache.put("sig", (1, 2, 3, 4))
+        
+        executor.close()
+        
+        engine_class.return_value.close.assert_called_once_with()
+        self.assertEqual(LocationCache(persist_path=path).get("sig")["box"], (1, 2, 3, 4))
+    
+    def test_image_location_is_verified_locally(self):
+        task = {"image": self.image_path, "region": (0, 0, 300, 200)}
+        
+        with patch.object(self.executor, "_locate_image_with_retry",
+                          wraps=self.executor._locate_image_with_retry) as full_search:
+            first = self.executor._find_image_location(task, 0)
+            second = self.executor._find_image_location(task, 0)
+        
+        self.assertEqual(tuple(first), (100, 40, 50, 30))
+        self.assertEqual(tuple(second), (100, 40, 50, 30))
+        self.assertEqual(full_search.call_count, 1)
+        self.assertEqual(self.executor.location_cache.stats["hits"], 1)
+    
+    def test_moved_image_falls_back_to_full_search(self):
+        task = {"image": self.image_path, "region": (0, 0, 300, 200)}
+        self.executor._find_image_location(task, 0)
+        
+        moved = np.roll(self.screen, 60, axis=1)
+        self.backend.set_frame(moved)
+        location = self.executor._find_image_location(task, 0)
+        
+        self.assertEqual(tuple(location), (160, 40, 50, 30))
+        self.assertEqual(self.executor.location_cache.stats["rejected"], 1)
+    
+    def test_unchanged_tiles_skip_template_verification(self):
+        task = {"image": self.image_path, "region": (0, 0, 300, 200)}
+        self.executor._find_image_location(task, 0)
+        
+        with patch.object(self.executor, "_match_on_screen") as match:
+            location = self.executor._find_image_location(task, 0)
+        
+        match.assert_not_called()
+        self.assertEqual(tuple(location), (100, 40, 50, 30))
+    
+    def test_gradual_changes_trigger_template_verification(self):
+        task = {"image": self.image_path, "region": (0, 0, 300, 200)}
+        self.executor._find_image_location(task, 0)
+        
+        # A slow fade: each step stays under the detector threshold
+        frame = self.screen.astype(np.int16)
+        for step in range(1, 9):
+            self.backend.set_frame(np.clip(frame + 5 * step, 0, 255).astype(np.uint8))
+            self.executor.frame_provider.frame()
+        
+        with patch.object(self.executor, "_match_on_screen",
+                          wraps=self.executor._match_on_screen) as match:
+            self.executor._find_image_location(task, 0)
+        
+        match.assert_called_once()
+    
+    def test_text_location_is_verified_by_pixel_hash(self):
+        ocr = self.executor.ocr_engine
+        ocr.find_text.return_value = ([(20, 10, 40, 12)], [90.0], False)
+        task = {"text": "Salvar", "region": (50, 50, 200, 100)}
+        
+        first = self.executor._find_text_location(task, 0)
+        second = self.executor._find_text_location(task, 0)
+        
+        self.assertEqual(first, (70, 60, 40, 12))
+        self.assertEqual(second, first)
+        self.assertEqual(ocr.find_text.call_count, 1)
+        
+        changed = self.screen.copy()
+        changed[65, 80] = 255 - changed[65, 80]
+        self.backend.set_frame(changed)
+        self.executor._find_text_location(task, 0)
+        self.assertEqual(ocr.find_text.call_count, 2)
+    
+    def test_cache_can_be_disabled(self):
+        with patch("bot_vision.core.task_executor.OCREngine"):
+            executor = TaskExecutor({"capture_backend": self.backend, "location_cache": False})
+        
+        self.assertIsNone(executor.location_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,500 @@
+"""
+Unit tests for the OCR backend layer.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import call, patch, MagicMock
+
+import numpy as np
+from PIL import Image
+
+from bot_vision.core import ocr_engine
+from bot_vision.core.ocr_engine import (
+    OCREngine,
+    OCRWords,
+    _portable_config,
+    build_target_config,
+    plan_ocr_configs,
+    target_charset,
+    target_user_files,
+    PytesseractBackend,
+    TesserocrBackend,
+    create_ocr_backend,
+    parse_tesseract_config,
+    parse_tesseract_tsv,
+)
+from bot_vision.exceptions import ConfigurationError
+
+from .helpers import make_config, make_engine, ocr_data
+
+
+class TestTesseractConfigParsing(unittest.TestCase):
+    """Test conversion of CLI style configs."""
+    
+    def test_parse_whitelist_config(self):
+        oem, psm, variables = parse_tesseract_config(
+            r'--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789')
+        self.assertEqual((oem, psm), (3, 7))
+        self.assertEqual(variables, {"tessedit_char_whitelist": "0123456789"})
+    
+    def test_parse_user_words(self):
+        _, psm, variables = parse_tesseract_config('--psm 8 --user-words /tmp/words.txt')
+        self.assertEqual(psm, 8)
+        self.assertEqual(variables["user_words_file"], "/tmp/words.txt")
+    
+    def test_parse_windows_paths(self):
+        with patch.object(ocr_engine, "POSIX_CONFIG", False):
+            _, _, variables = parse_tesseract_config(
+                r'--psm 8 --user-words C:\Temp\a.words --user-patterns "C:\My Temp\b.patterns"')
+        self.assertEqual(variables["user_words_file"], r"C:\Temp\a.words")
+        self.assertEqual(variables["user_patterns_file"], r"C:\My Temp\b.patterns")
+    
+    def test_parse_tsv(self):
+        tsv = ("level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+               "1\t1\t0\t0\t0\t0\t0\t0\t100\t30\t-1\t\n"
+               "5\t1\t1\t1\t1\t1\t10\t5\t40\t20\t91.5\tSave\n")
+        data = parse_tesseract_tsv(tsv)
+        self.assertEqual(data["text"], ["", "Save"])
+        self.assertEqual(data["left"], [0, 10])
+        self.assertEqual(data["conf"], [-1.0, 91.5])
+
+
+class TestBackendSelection(unittest.TestCase):
+    """Test backend factory and fallback."""
+    
+    def setUp(self):
+        ocr_engine._backend_cache.clear()
+    
+    def tearDown(self):
+        ocr_engine._backend_cache.clear()
+    
+    def test_auto_falls_back_to_pytesseract(self):
+        with patch.dict(sys.modules, {"tesserocr": None}):
+            backend = create_ocr_backend(make_config())
+        self.assertIsInstance(backend, PytesseractBackend)
+    
+    def test_backend_is_shared(self):
+        with patch.dict(sys.modules, {"tesserocr": None}):
+            first = create_ocr_backend(make_config(ocr_backend="pytesseract"))
+            second = create_ocr_backend(make_config(ocr_backend="pytesseract"))
+        self.assertIs(first, second)
+    
+    def test_unknown_backend(self):
+        with self.assertRaises(ConfigurationError):
+            create_ocr_backend(make_config(ocr_backend="invalid"))
+    
+    @patch("pytesseract.image_to_data")
+    def test_engine_uses_backend(self, mock_image_to_data):
+        mock_image_to_data.return_value = {
+            "text": ["Save"], "conf": [95.0], "left": [10], "top": [5], "width": [40], "height": [20]
+        }
+        engine = make_engine()
+        results = engine.extract_all_text(np.full((30, 100), 255, dtype=np.uint8), "letters")
+        self.assertEqual([r.text for r in results], ["Save"])
+        self.assertIsInstance(mock_image_to_data.call_args[0][0], Image.Image)
+
+
+class TestTesserocrBackend(unittest.TestCase):
+    """Test the persistent backend against a fake tesserocr module."""
+    
+    TSV = "5\t1\t1\t1\t1\t1\t10\t5\t40\t20\t91.5\tSave"
+    
+    def setUp(self):
+        ocr_engine._backend_cache.clear()
+        self.addCleanup(ocr_engine._backend_cache.clear)
+        self.tesserocr = types.ModuleType("tesserocr")
+        self.tesserocr.PyTessBaseAPI = MagicMock()
+        self.api = self.tesserocr.PyTessBaseAPI.return_value
+        self.api.GetVariableAsString.return_value = ""
+        self.api.GetTSVText.return_value = self.TSV
+        patcher = patch.dict(sys.modules, {"tesserocr": self.tesserocr})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_image_to_data(self):
+        backend = TesserocrBackend("eng")
+        image = np.full((30, 100), 255, dtype=np.uint8)
+        
+        data = backend.image_to_data(image, "--oem 1 --psm 7 -c tessedit_char_whitelist=012 "
+                                            "-c load_system_dawg=0")
+        backend.image_to_data(image, "--oem 1 --psm 8 -c load_system_dawg=0")
+        
+        self.tesserocr.PyTessBaseAPI.assert_called_once_with(
+            lang="eng", oem=1, variables={"load_system_dawg": "0"})
+        self.assertEqual(self.api.SetPageSegMode.call_args_list, [call(7), call(8)])
+        self.assertEqual(self.api.SetVariable.call_args_list,
+                         [call("tessedit_char_whitelist", "012"), call("tessedit_char_whitelist", "")])
+        self.assertEqual(self.api.SetImageBytes.call_args[0][1:], (100, 30, 1, 100))
+        self.assertEqual(data["text"], ["Save"])
+        self.assertEqual(data["conf"], [91.5])
+    
+    def test_instances_are_bounded_per_thread(self):
+        backend = TesserocrBackend("eng", max_instances=2)
+        apis = [MagicMock(name=f"api{i}") for i in range(3)]
+        for api in apis:
+            api.GetVariableAsString.return_value = ""
+            api.GetTSVText.return_value = self.TSV
+        self.tesserocr.PyTessBaseAPI.side_effect = apis
+        image = Image.new("L", (10, 10))
+        
+        for words_file in ("a.words", "b.words", "a.words", "c.words"):
+            backend.image_to_data(image, f"--psm 7 --user-words {words_file}")
+        
+        self.assertEqual(self.tesserocr.PyTessBaseAPI.call_count, 3)
+        apis[1].End.assert_called_once()
+        apis[0].End.assert_not_called()
+        self.assertEqual(backend._all_apis, [apis[0], apis[2]])
+    
+    def test_instance_limit_is_part_of_the_shared_backend_key(self):
+        small = create_ocr_backend(make_config(ocr_backend="tesserocr", ocr_tesserocr_instances=1))
+        large = create_ocr_backend(make_config(ocr_backend="tesserocr", ocr_tesserocr_instances=8))
+        
+        self.assertIsNot(small, large)
+        self.assertEqual((small.max_instances, large.max_instances), (1, 8))
+        self.assertIs(create_ocr_backend(make_config(ocr_backend="tesserocr", ocr_tesserocr_instances=8)), large)
+    
+    def test_call_errors_keep_backend(self):
+        engine = OCREngine(make_config(ocr_backend="tesserocr"))
+        self.api.GetTSVText.side_effect = RuntimeError("bad image")
+        
+        with self.assertRaises(RuntimeError):
+            engine._image_to_data(Image.new("L", (10, 10)), "--psm 7")
+        self.assertIsInstance(engine.backend, TesserocrBackend)
+    
+    def test_initialization_errors_fall_back_to_pytesseract(self):
+        engine = OCREngine(make_config(ocr_backend="tesserocr"))
+        self.tesserocr.PyTessBaseAPI.side_effect = RuntimeError("Failed to init API")
+        
+        with patch("pytesseract.image_to_data", return_value={"text": []}) as fallback:
+            self.assertEqual(engine._image_to_data(Image.new("L", (10, 10)), "--psm 7"), {"text": []})
+        
+        fallback.assert_called_once()
+        self.assertIsInstance(engine.backend, PytesseractBackend)
+
+
+class TestParallelOCR(unittest.TestCase):
+    """Test parallel execution of the OCR grid."""
+    
+    def setUp(self):
+        self.image = Image.new("RGB", (60, 20), "white")
+    
+    def make_engine(self, **overrides):
+        return make_engine(**overrides)
+    
+    @staticmethod
+    def fake_process(img, target_text, filter_type, config_index, config, img_index,
+                     total_images, bonus, scale=1.0):
+        time.sleep(0.005)
+        if config_index == 3:
+            return [ocr_engine.OCRResult("Save", 50.0 + img_index, (img_index, 0, 10, 10),
+                                         img_index, config_index)]
+        return []
+    
+    def test_map_uses_the_engine_pool_and_keeps_order(self):
+        engine = self.make_engine(ocr_max_workers=2)
+        
+        self.assertEqual(engine.map(lambda n: n * n, [3, 1, 2]), [9, 1, 4])
+        self.assertIsNotNone(engine._executor)
+    
+    def test_parallel_matches_sequential_order(self):
+        sequential = self.make_engine()
+        parallel = self.make_engine(ocr_parallel=True, ocr_max_workers=4)
+        for engine in (sequential, parallel):
+            engine._process_single_image = self.fake_process
+        
+        expected = sequential.find_text(self.image, "Save", "letters", 99.0)
+        result = parallel.find_text(self.image, "Save", "letters", 99.0)
+        
+        self.assertEqual(result, expected)
+        self.assertTrue(parallel.last_run_stats["parallel"])
+        self.assertEqual(parallel.last_run_stats["ocr_calls"], parallel.last_run_stats["cells"])
+    
+    def test_stats_are_kept_per_calling_thread(self):
+        engine = self.make_engine(ocr_parallel=True, ocr_max_workers=4, ocr_result_cache=False)
+        engine._process_single_image = self.fake_process
+        stats = {}
+        
+        def search(name, threshold):
+            engine.find_text(self.image, "Save", "letters", threshold)
+            stats[name] = dict(engine.last_run_stats)
+        
+        threads = [threading.Thread(target=search, args=("full", 99.0)),
+                   threading.Thread(target=search, args=("early", 50.0))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertFalse(stats["full"]["early_exit"])
+        self.assertEqual(stats["full"]["ocr_calls"], stats["full"]["cells"])
+        self.assertTrue(stats["early"]["early_exit"])
+        self.assertEqual(engine.last_run_stats, {})
+    
+    def test_parallel_early_exit(self):
+        engine = self.make_engine(ocr_parallel=True, ocr_max_workers=2)
+        engine._process_single_image = self.fake_process
+        
+        boxes, scores, early = engine.find_text(self.image, "Save", "letters", 50.0)
+        
+        self.assertTrue(early)
+        self.assertEqual(len(boxes), 1)
+        self.assertGreaterEqual(scores[0], 50.0)
+        self.assertTrue(engine.last_run_stats["early_exit"])
+        self.assertLess(engine.last_run_stats["ocr_calls"], engine.last_run_stats["cells"])
+
+
+class TestBatchOCR(unittest.TestCase):
+    """Test looking up several targets with one pass over the OCR grid."""
+    
+    DATA = {
+        "text": ["Nome", "", "CPF", "Data", "de", "nascimento"],
+        "conf": [90.0, -1, 60.0, 85.0, 80.0, 75.0],
+        "left": [10, 0, 10, 10, 50, 70],
+        "top": [5, 0, 30, 55, 55, 55],
+        "width": [40, 0, 30, 35, 15, 80],
+        "height": [12, 0, 12, 12, 12, 12],
+    }
+    
+    def setUp(self):
+        self.image = Image.new("RGB", (200, 80), "white")
+        self.engine = make_engine(self.DATA, ocr_adaptive_order=False)
+    
+    def test_each_cell_runs_ocr_once_for_all_targets(self):
+        found = self.engine.find_texts(self.image, ["Nome", "CPF", "Data de nascimento", "Email"],
+                                       "letters", 200.0)
+        
+        self.assertEqual(found["Nome"], (10, 5, 40, 12))
+        self.assertEqual(found["CPF"], (10, 30, 30, 12))
+        self.assertEqual(found["Data de nascimento"], (10, 55, 140, 12))
+        self.assertIsNone(found["Email"])
+        stats = self.engine.last_run_stats
+        self.assertEqual(self.engine._image_to_data.call_count, stats["cells"])
+        self.assertEqual(stats["ocr_calls"], stats["cells"])
+        self.assertNotIn("Email", stats["confidences"])
+    
+    def test_stops_when_all_targets_are_found(self):
+        found = self.engine.find_texts(self.image, ["Nome", "Data de nascimento"], "letters", 75.0)
+        
+        self.assertEqual(found["Nome"], (10, 5, 40, 12))
+        self.assertEqual(self.engine._image_to_data.call_count, 1)
+        self.assertTrue(self.engine.last_run_stats["early_exit"])
+    
+    def test_matches_find_text_boxes(self):
+        boxes, _, _ = self.engine.find_text(self.image, "Data de nascimento", "letters", 75.0)
+        found = self.engine.find_texts(self.image, ["Data de nascimento"], "letters", 75.0)
+        
+        self.assertEqual(found["Data de nascimento"], boxes[0])
+
+
+class TestOCRWords(unittest.TestCase):
+    """Test the normalized tesseract output used for matching."""
+    
+    def test_first_word_index_and_sequences(self):
+        words = OCRWords(TestBatchOCR.DATA, "letters")
+        
+        self.assertEqual(words.cleaned[:3], ["Nome", "", "CPF"])
+        self.assertEqual(words.positions["nome"], [0])
+        self.assertEqual(words.find(["data", "de", "nascimento"]), [3])
+        self.assertEqual(words.find(["data", "nascimento"]), [])
+        self.assertEqual(words.find([]), [])
+    
+    def test_numbers_filter_drops_words(self):
+        data = {"text": ["10", "32", "a5"], "conf": ["90", "80", "70"],
+                "left": [0, 10, 20], "top": [0, 0, 0], "width": [5, 5, 5], "height": [5, 5, 5]}
+        words = OCRWords(data, "numbers")
+        
+        self.assertEqual(words.cleaned, ["10", "", "5"])
+        self.assertEqual(words.conf.tolist(), [90.0, 80.0, 70.0])
+
+
+class TestTiledOCR(unittest.TestCase):
+    """Test tile-parallel OCR of large regions."""
+    
+    def setUp(self):
+        self.screen = np.zeros((900, 1200, 3), dtype=np.uint8)
+        self.screen[300:312, 600:640] = 255  # Word "Salvar" at (600, 300, 40, 12)
+    
+    def make_engine(self, **overrides):
+        values = {"ocr_tiled": True, "ocr_tile_pool": "thread", "ocr_tile_workers": 2,
+                  "ocr_result_cache": False, "ocr_adaptive_order": False}
+        values.update(overrides)
+        return make_engine(**values)
+    
+    @staticmethod
+    def fake_ocr(engine, img, config):
+        # "Reads" the white marker only when the whole word is inside the tile
+        ys, xs = np.nonzero(np.asarray(img.convert("L")) > 128)
+        if xs.size == 0 or xs.max() - xs.min() + 1 != 40 or ys.max() - ys.min() + 1 != 12:
+            return ocr_data()
+        return ocr_data(["Salvar"], [60.0], [int(xs.min())], [int(ys.min())], [40], [12])
+    
+    def test_seam_duplicates_are_merged(self):
+        engine = self.make_engine()
+        
+        with patch.object(OCREngine, "_image_to_data", self.fake_ocr):
+            boxes, scores, early = engine.find_text(Image.fromarray(self.screen), "Salvar", "letters", 200.0)
+        
+        self.assertFalse(early)
+        self.assertEqual(engine.last_run_stats["tiles"], 4)
+        self.assertEqual(boxes, [(600, 300, 40, 12)])
+    
+    def test_early_exit_in_a_tile(self):
+        engine = self.make_engine()
+        
+        with patch.object(OCREngine, "_image_to_data", self.fake_ocr):
+            boxes, _, early = engine.find_text(Image.fromarray(self.screen), "Salvar", "letters", 50.0)
+        
+        self.assertTrue(early)
+        self.assertEqual(boxes, [(600, 300, 40, 12)])
+    
+    def test_tiles_grow_to_fit_long_targets(self):
+        engine = self.make_engine()
+        target = "Salvar todas as alterações agora"
+        
+        with patch.object(OCREngine, "_image_to_data", self.fake_ocr), \
+                patch.object(ocr_engine, "split_tiles", wraps=ocr_engine.split_tiles) as split:
+            engine.find_text(Image.fromarray(self.screen), target, "letters", 200.0)
+        
+        overlap = int(len(target) * ocr_engine.CHAR_ASPECT * ocr_engine.TILE_GLYPH_HEIGHT)
+        self.assertEqual(split.call_args[0][2:], (2 * overlap, overlap))
+    
+    def test_thread_pool_is_the_default(self):
+        engine = make_engine()
+        self.addCleanup(lambda: engine._tile_pool.shutdown())
+        
+        self.assertIsInstance(engine._get_tile_pool(), ThreadPoolExecutor)
+    
+    def test_close_shuts_down_the_pools(self):
+        engine = make_engine(ocr_max_workers=2)
+        executor, tile_pool = engine._get_executor(), engine._get_tile_pool()
+        
+        with engine:
+            pass
+        
+        self.assertTrue(executor._shutdown)
+        self.assertTrue(tile_pool._shutdown)
+        self.assertIsNone(engine._executor)
+        self.assertEqual(engine.map(abs, [-1]), [1])
+        engine.close()
+    
+    def test_small_regions_are_not_tiled(self):
+        engine = self.make_engine()
+        engine._find_text_tiled = MagicMock()
+        engine._process_single_image = MagicMock(return_value=[])
+        
+        engine.find_text(Image.fromarray(self.screen[:400, :400]), "Salvar", "letters", 75.0)
+        
+        engine._find_text_tiled.assert_not_called()
+    
+    def test_portable_config_drops_objects(self):
+        config = MagicMock()
+        config.to_dict.return_value = {"ocr_tile_size": 512, "capture_backend": object()}
+        
+        self.assertEqual(_portable_config(config), {"ocr_tile_size": 512})
+
+
+class TestTextHeightNormalizationInEngine(unittest.TestCase):
+    """Test that boxes found on a resized image map back to the region."""
+    
+    def test_boxes_are_mapped_back(self):
+        engine = make_engine(ocr_data(["Salvar"], [90.0], [21], [10], [80], [24]),
+                             ocr_normalize_text_height=True, ocr_result_cache=False,
+                             ocr_adaptive_order=False)
+        engine.image_processor.normalize_text_height = lambda img, target: (
+            img.resize((img.width * 2, img.height * 2)), 2.0)
+        
+        boxes, _, early = engine.find_text(Image.new("RGB", (100, 40), "white"), "Salvar", "letters", 75.0)
+        
+        self.assertTrue(early)
+        self.assertEqual(boxes, [(10, 5, 41, 12)])
+        self.assertEqual(engine._image_to_data.call_args[0][0].size, (200, 80))
+        self.assertEqual(engine.last_run_stats["scale"], 2.0)
+
+
+class TestTargetConstraints(unittest.TestCase):
+    """Test tesseract configs derived from the filter type and target."""
+    
+    def test_charset_adds_target_characters(self):
+        self.assertEqual(target_charset("12", "numbers"), "0123456789")
+        charset = target_charset("Ação 2", "letters")
+        self.assertTrue(charset.startswith("abc"))
+        self.assertIn("ç", charset)
+        self.assertIn("Ç", charset)
+        self.assertNotIn("2", charset)
+        self.assertIsNone(target_charset("x", "all"))
+    
+    def test_config_keeps_existing_whitelist(self):
+        config = build_target_config("--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789", "Salvar", "letters")
+        _, psm, variables = parse_tesseract_config(config)
+        
+        self.assertEqual(psm, 7)
+        self.assertEqual(variables["tessedit_char_whitelist"], "0123456789")
+        self.assertEqual(variables["load_system_dawg"], "0")
+        self.assertEqual(variables["load_freq_dawg"], "0")
+    
+    def test_user_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            words = target_user_files("Salvar Tudo", "letters", tmpdir)
+            patterns = target_user_files("12", "numbers", tmpdir)
+            
+            with open(words["user_words_file"], encoding="utf-8") as f:
+                self.assertEqual(f.read().split(), ["Salvar", "Tudo", "salvar", "tudo"])
+            with open(patterns["user_patterns_file"], encoding="utf-8") as f:
+                self.assertEqual(f.read(), "\\d\\d\n")
+            self.assertEqual(target_user_files("Salvar Tudo", "letters", tmpdir), words)
+            
+            config = build_target_config("--oem 3 --psm 8", "Salvar Tudo", "letters", user_files=words)
+            self.assertEqual(parse_tesseract_config(config)[2]["user_words_file"], words["user_words_file"])
+    
+    def test_engine_applies_constraints_when_enabled(self):
+        for enabled in (False, True):
+            engine = make_engine(ocr_data(["Salvar"], [90.0], [1], [1], [30], [10]),
+                                 ocr_target_constraints=enabled, ocr_adaptive_order=False,
+                                 ocr_result_cache=False)
+            
+            engine.find_text(Image.new("RGB", (60, 20), "white"), "Salvar", "letters", 75.0)
+            
+            config = engine._image_to_data.call_args[0][1]
+            self.assertEqual("load_system_dawg=0" in config, enabled)
+
+
+class TestConfigPlanner(unittest.TestCase):
+    """Test pruning of grid configs that cannot match the target."""
+    
+    def setUp(self):
+        self.configs = make_engine().ocr_configs
+    
+    def test_plans_by_filter_and_target_shape(self):
+        self.assertEqual(plan_ocr_configs(self.configs, "Salvar", "letters"), [2, 3, 4, 5, 6])
+        self.assertEqual(plan_ocr_configs(self.configs, "Salvar", "both"), [2, 3, 4, 5, 6])
+        self.assertEqual(plan_ocr_configs(self.configs, "Salvar Tudo", "letters"), [2, 3, 4, 6])
+        self.assertEqual(plan_ocr_configs(self.configs, "12", "numbers"), list(range(7)))
+        self.assertEqual(plan_ocr_configs(self.configs, "12", "both"), list(range(7)))
+        self.assertEqual(plan_ocr_configs(self.configs, "12 34", "numbers"), [0, 2, 3, 4, 6])
+    
+    def test_page_modes_pruned_on_single_line_images(self):
+        self.assertEqual(plan_ocr_configs(self.configs, "Salvar", "letters", 30, 48), [4, 5, 6])
+        self.assertEqual(plan_ocr_configs(self.configs, "Salvar", "letters", 120, 48), [2, 3, 4, 5, 6])
+    
+    def test_find_text_reports_skipped_cells(self):
+        for enabled in (False, True):
+            engine = make_engine(ocr_data([""], [-1], [0], [0], [0], [0]), ocr_config_planner=enabled,
+                                 ocr_adaptive_order=False, ocr_result_cache=False)
+            
+            engine.find_text(Image.new("RGB", (60, 20), "white"), "Salvar", "letters", 75.0)
+            
+            stats = engine.last_run_stats
+            used = {call[0][1] for call in engine._image_to_data.call_args_list}
+            self.assertEqual(stats["configs"], [2, 3, 4, 5, 6] if enabled else list(range(7)))
+            self.assertEqual(any("whitelist" in config for config in used), not enabled)
+            self.assertEqual(stats["skipped_cells"] > 0, enabled)
+
+
+if __name__ == '__main__':
+    unittest.main()
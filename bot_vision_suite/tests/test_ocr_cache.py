@@ -0,0 +1,130 @@
+"""
+Unit tests for the OCR result cache and region-change waits.
+"""
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PIL import Image
+
+from bot_vision.core.ocr_cache import OCRResultCache, dhash, hamming_distance
+from bot_vision.core.ocr_engine import OCRResult
+from bot_vision.core.screen_capture import SyntheticCaptureBackend
+from bot_vision.core.task_executor import TaskExecutor
+
+from .helpers import make_engine
+
+
+def make_region(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (30, 80, 3), dtype=np.uint8)
+
+
+class TestOCRResultCache(unittest.TestCase):
+    """Test exact and perceptual lookups."""
+    
+    def test_dhash_is_stable_under_small_noise(self):
+        pixels = np.tile(np.linspace(0, 255, 80, dtype=np.uint8), (30, 1))
+        noisy = pixels.copy()
+        noisy[5, 5] ^= 1
+        
+        self.assertEqual(hamming_distance(dhash(pixels), dhash(noisy)), 0)
+        self.assertGreater(hamming_distance(dhash(pixels), dhash(pixels[:, ::-1])), 32)
+    
+    def test_exact_hit_requires_same_query(self):
+        cache = OCRResultCache()
+        region = make_region()
+        cache.put(region, "Salvar", "letters", 75.0, ([(1, 2, 3, 4)], [80.0], True))
+        
+        self.assertEqual(cache.get(region.copy(), " salvar ", "LETTERS", 75.0),
+                         ([(1, 2, 3, 4)], [80.0], True))
+        self.assertIsNone(cache.get(region, "Salvar", "numbers", 75.0))
+        self.assertIsNone(cache.get(region, "Salvar", "letters", 60.0))
+        self.assertIsNone(cache.get(make_region(1), "Salvar", "letters", 75.0))
+        self.assertEqual(cache.stats["hits"], 1)
+    
+    def test_perceptual_hit_within_tolerance(self):
+        cache = OCRResultCache(dhash_tolerance=4)
+        region = np.tile(np.linspace(0, 255, 80, dtype=np.uint8), (30, 1))
+        cache.put(region, "Ok", "both", 75.0, ([], [], False))
+        noisy = region.copy()
+        noisy[10, 10] ^= 1
+        
+        self.assertEqual(cache.get(noisy, "Ok", "both", 75.0), ([], [], False))
+        self.assertEqual(cache.stats["perceptual_hits"], 1)
+    
+    def test_lru_eviction(self):
+        cache = OCRResultCache(max_entries=1)
+        cache.put(make_region(0), "a", "both", 75.0, ([], [], False))
+        cache.put(make_region(1), "a", "both", 75.0, ([], [], False))
+        
+        self.assertEqual(len(cache), 1)
+        self.assertIsNone(cache.get(make_region(0), "a", "both", 75.0))
+
+
+class TestOCREngineResultCache(unittest.TestCase):
+    """Test that unchanged regions skip the OCR grid."""
+    
+    def make_engine(self, **overrides):
+        engine = make_engine(**overrides)
+        engine._process_single_image = MagicMock(
+            return_value=[OCRResult("Save", 90.0, (1, 2, 30, 10), 0, 0)])
+        return engine
+    
+    def test_identical_region_reuses_result(self):
+        engine = self.make_engine()
+        image = Image.fromarray(make_region())
+        
+        first = engine.find_text(image, "Save", "letters", 75.0)
+        calls = engine._process_single_image.call_count
+        second = engine.find_text(image.copy(), "Save", "letters", 75.0)
+        
+        self.assertEqual(first, second)
+        self.assertEqual(engine._process_single_image.call_count, calls)
+        self.assertTrue(engine.last_run_stats["cached"])
+    
+    def test_cache_can_be_disabled(self):
+        engine = self.make_engine(ocr_result_cache=False)
+        image = Image.fromarray(make_region())
+        
+        engine.find_text(image, "Save", "letters", 75.0)
+        calls = engine._process_single_image.call_count
+        engine.find_text(image, "Save", "letters", 75.0)
+        
+        self.assertEqual(engine._process_single_image.call_count, 2 * calls)
+
+
+class TestRetryWaitsForRegionChange(unittest.TestCase):
+    """Test that text retries wake up when the region changes."""
+    
+    def setUp(self):
+        self.screen = make_region()
+        self.backend = SyntheticCaptureBackend(self.screen)
+        with patch("bot_vision.core.task_executor.OCREngine"):
+            self.executor = TaskExecutor({"capture_backend": self.backend,
+                                          "wait_poll_interval": 0.01})
+        self.executor.ocr_engine.find_text.return_value = ([], [], False)
+        self.task = {"text": "Salvar", "region": (0, 0, 80, 30)}
+        self.executor._find_text_location(self.task, 0)
+    
+    def test_unchanged_region_waits_full_timeout(self):
+        start = time.monotonic()
+        self.executor._wait_before_retry(self.task, 0.2)
+        
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+    
+    def test_changed_region_ends_wait_early(self):
+        timer = threading.Timer(0.05, self.backend.set_frame, args=(255 - self.screen,))
+        timer.start()
+        self.addCleanup(timer.cancel)
+        
+        start = time.monotonic()
+        self.executor._wait_before_retry(self.task, 2.0)
+        
+        self.assertLess(time.monotonic() - start, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
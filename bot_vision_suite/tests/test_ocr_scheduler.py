@@ -0,0 +1,50 @@
+"""
+Unit tests for the adaptive OCR scheduler.
+"""
+import os
+import tempfile
+import unittest
+
+from bot_vision.core.ocr_scheduler import AdaptiveOCRScheduler, make_task_signature
+
+
+class TestAdaptiveOCRScheduler(unittest.TestCase):
+    """Test ordering and persistence of OCR grid statistics."""
+    
+    def setUp(self):
+        self.cells = [(i, c) for i in range(3) for c in range(2)]
+    
+    def test_signature(self):
+        self.assertEqual(make_task_signature("  Salvar  Tudo ", "Letters", (1, 2, 3, 4)),
+                         "letters|salvar tudo|1,2,3,4")
+        self.assertEqual(make_task_signature("10", "numbers"), "numbers|10|*")
+    
+    def test_default_order_without_history(self):
+        scheduler = AdaptiveOCRScheduler()
+        self.assertEqual(scheduler.order("sig", self.cells), self.cells)
+    
+    def test_winning_cell_is_tried_first(self):
+        scheduler = AdaptiveOCRScheduler()
+        scheduler.record("sig", 2, 1)
+        scheduler.record("sig", 2, 1)
+        scheduler.record("other", 1, 0)
+        
+        ordered = scheduler.order("sig", self.cells)
+        
+        self.assertEqual(ordered[0], (2, 1))
+        self.assertEqual(ordered[1], (1, 0))  # Global winner comes next
+        self.assertEqual(sorted(ordered), sorted(self.cells))
+        self.assertEqual(scheduler.best_cells("sig"), [(2, 1)])
+    
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "ocr_stats.json")
+            AdaptiveOCRScheduler(path).record("sig", 1, 1)
+            
+            reloaded = AdaptiveOCRScheduler(path)
+            
+            self.assertEqual(reloaded.order("sig", self.cells)[0], (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+Unit tests for screen capture and frame caching.
+"""
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from PIL import Image
+
+from bot_vision.core.screen_capture import (
+    FrameProvider,
+    PyAutoGUICaptureBackend,
+    ScreenChangeDetector,
+    SyntheticCaptureBackend,
+    create_capture_backend,
+)
+from bot_vision.exceptions import ConfigurationError
+
+
+def make_screen(width=320, height=200):
+    """Create a deterministic RGB screen image."""
+    rng = np.random.default_rng(0)
+    return Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+
+
+class TestFrameProvider(unittest.TestCase):
+    """Test the cached frame provider."""
+    
+    def setUp(self):
+        self.screen = make_screen()
+        patcher = patch("pyautogui.screenshot", return_value=self.screen)
+        self.mock_screenshot = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_frame_is_cached_within_ttl(self):
+        provider = FrameProvider(ttl=60)
+        provider.grab((0, 0, 10, 10))
+        provider.grab_image((5, 5, 20, 20))
+        provider.frame()
+        
+        self.assertEqual(self.mock_screenshot.call_count, 1)
+        self.assertEqual(provider.stats["captures"], 1)
+        self.assertEqual(provider.stats["hits"], 2)
+    
+    def test_region_is_zero_copy_slice(self):
+        provider = FrameProvider(ttl=60)
+        crop = provider.grab((10, 20, 30, 40))
+        
+        self.assertEqual(crop.shape, (40, 30, 3))
+        self.assertTrue(np.shares_memory(crop, provider.frame()))
+        self.assertTrue(np.array_equal(crop, np.array(self.screen)[20:60, 10:40]))
+    
+    def test_invalidate_forces_new_capture(self):
+        provider = FrameProvider(ttl=60)
+        provider.frame()
+        provider.invalidate()
+        provider.frame()
+        
+        self.assertEqual(self.mock_screenshot.call_count, 2)
+        self.assertEqual(provider.stats["invalidations"], 1)
+    
+    def test_zero_ttl_disables_cache(self):
+        provider = FrameProvider(ttl=0)
+        provider.frame()
+        provider.frame()
+        
+        self.assertEqual(self.mock_screenshot.call_count, 2)
+    
+    def test_region_outside_frame_is_captured_directly(self):
+        provider = FrameProvider(ttl=60)
+        region = (-100, 0, 50, 50)
+        
+        self.assertFalse(provider.contains(region))
+        provider.grab(region)
+        
+        self.mock_screenshot.assert_called_with(region=region)
+
+
+class TestCaptureBackends(unittest.TestCase):
+    """Test capture backends."""
+    
+    def setUp(self):
+        self.screen = np.array(make_screen())
+    
+    def test_synthetic_backend_serves_frames(self):
+        backend = SyntheticCaptureBackend([self.screen, np.zeros_like(self.screen)])
+        provider = FrameProvider(ttl=0, backend=backend)
+        
+        self.assertTrue(np.array_equal(provider.grab((10, 10, 5, 5)), self.screen[10:15, 10:15]))
+        backend.next_frame()
+        self.assertEqual(provider.grab((10, 10, 5, 5)).max(), 0)
+        self.assertEqual(backend.grab_count, 2)
+    
+    def test_synthetic_backend_pads_outside_screen(self):
+        backend = SyntheticCaptureBackend(self.screen)
+        crop = backend.grab((-5, -5, 10, 10))
+        
+        self.assertEqual(crop.shape, (10, 10, 3))
+        self.assertEqual(crop[:5, :5].max(), 0)
+        self.assertTrue(np.array_equal(crop[5:, 5:], self.screen[:5, :5]))
+    
+    def test_factory(self):
+        backend = SyntheticCaptureBackend(self.screen)
+        self.assertIs(create_capture_backend(backend), backend)
+        self.assertIsInstance(create_capture_backend("pyautogui"), PyAutoGUICaptureBackend)
+        with patch.dict("sys.modules", {"mss": None}):
+            self.assertIsInstance(create_capture_backend("auto"), PyAutoGUICaptureBackend)
+        with self.assertRaises(ConfigurationError):
+            create_capture_backend("invalid")
+
+
+class TestScreenChangeDetector(unittest.TestCase):
+    """Test the per-tile change bitmap."""
+    
+    def setUp(self):
+        self.screen = np.array(make_screen())  # 320x200
+        self.detector = ScreenChangeDetector(tile_size=64)
+    
+    def test_first_frame_marks_everything(self):
+        changed = self.detector.update(self.screen)
+        
+        self.assertEqual(changed.shape, (4, 5))
+        self.assertTrue(changed.all())
+    
+    def test_reports_only_changed_tiles(self):
+        self.detector.update(self.screen)
+        frame = self.screen.copy()
+        frame[70:90, 140:160] = 255 - frame[70:90, 140:160]
+        
+        changed = self.detector.update(frame)
+        
+        self.assertEqual(np.argwhere(changed).tolist(), [[1, 2]])
+        self.assertEqual(self.detector.changed_boxes(), [(128, 64, 64, 64)])
+        self.assertAlmostEqual(self.detector.stats["changed_fraction"], 1 / 20)
+        self.assertTrue(self.detector.region_changed((130, 70, 10, 10)))
+        self.assertFalse(self.detector.region_changed((0, 0, 60, 60)))
+    
+    def test_changed_since(self):
+        self.detector.update(self.screen)
+        reference = self.detector.frame_index
+        self.detector.update(self.screen)
+        self.assertFalse(self.detector.changed_since(None, reference))
+        
+        frame = self.screen.copy()
+        frame[190:200, 310:320] = 0
+        self.detector.update(frame)
+        self.assertTrue(self.detector.changed_since((300, 180, 20, 20), reference))
+        self.assertFalse(self.detector.changed_since((0, 0, 100, 100), reference))
+    
+    def test_snapshot_catches_gradual_changes(self):
+        self.detector.update(self.screen)
+        reference = self.detector.frame_index
+        box = (100, 40, 50, 30)
+        snapshot = self.detector.snapshot(box)
+        
+        frame = self.screen.astype(np.int16)
+        for step in range(1, 9):
+            self.detector.update(np.clip(frame + 5 * step, 0, 255).astype(np.uint8))
+        
+        self.assertFalse(self.detector.changed_since(box, reference))
+        self.assertTrue(self.detector.differs_from(box, snapshot))
+        self.assertFalse(self.detector.differs_from((0, 0, 10, 10), self.detector.snapshot((0, 0, 10, 10))))
+    
+    def test_frame_provider_feeds_detector(self):
+        backend = SyntheticCaptureBackend([self.screen, np.zeros_like(self.screen)])
+        provider = FrameProvider(ttl=0, backend=backend, change_detector=self.detector)
+        
+        provider.frame()
+        backend.next_frame()
+        provider.frame()
+        
+        self.assertEqual(self.detector.stats["frames"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Unit tests for the in-memory template cache.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from bot_vision.core.template_cache import TemplateCache
+from bot_vision.core.template_matching import TemplateMatcher
+from bot_vision.exceptions import ImageProcessingError
+
+
+class TestTemplateCache(unittest.TestCase):
+    """Test TemplateCache decoding, scaling and eviction."""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        rng = np.random.default_rng(0)
+        self.pixels = rng.integers(0, 256, (40, 60, 3), dtype=np.uint8)
+        self.path = self._save("button.png", self.pixels)
+    
+    def _save(self, name, pixels):
+        path = os.path.join(self.tmpdir, name)
+        Image.fromarray(pixels).save(path)
+        return path
+    
+    def test_decoded_template_is_reused(self):
+        cache = TemplateCache()
+        first = cache.get(self.path)
+        second = cache.get(self.path)
+        
+        self.assertIs(first, second)
+        np.testing.assert_array_equal(first, self.pixels)
+        self.assertFalse(first.flags.writeable)
+        self.assertEqual(cache.stats["misses"], 1)
+        self.assertEqual(cache.stats["hits"], 1)
+    
+    def test_scaled_and_grayscale_variants(self):
+        cache = TemplateCache()
+        scaled = cache.get(self.path, 0.95)
+        gray = cache.get(self.path, 1.05, grayscale=True)
+        
+        expected = Image.fromarray(self.pixels).resize((57, 38))
+        np.testing.assert_array_equal(scaled, np.asarray(expected))
+        self.assertEqual(gray.shape, (42, 63))
+        self.assertIs(cache.get(self.path, 0.95), scaled)
+    
+    def test_modified_file_is_reloaded(self):
+        cache = TemplateCache()
+        cache.get(self.path)
+        cache.get(self.path, 0.95)
+        
+        Image.fromarray(255 - self.pixels).save(self.path)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        
+        np.testing.assert_array_equal(cache.get(self.path), 255 - self.pixels)
+        self.assertEqual(len(cache), 1)
+    
+    def test_byte_budget_evicts_least_recently_used(self):
+        cache = TemplateCache(max_bytes=2 * self.pixels.nbytes)
+        other = self._save("other.png", self.pixels[::-1].copy())
+        third = self._save("third.png", self.pixels[:, ::-1].copy())
+        
+        cache.get(self.path)
+        cache.get(other)
+        cache.get(self.path)
+        cache.get(third)
+        
+        self.assertEqual(cache.stats["evictions"], 1)
+        self.assertLessEqual(cache.nbytes, cache.max_bytes)
+        cache.get(self.path)
+        self.assertEqual(cache.stats["misses"], 3)
+    
+    def test_missing_file_raises(self):
+        with self.assertRaises(ImageProcessingError):
+            TemplateCache().get(os.path.join(self.tmpdir, "missing.png"))
+    
+    def test_matcher_uses_cache_without_temp_files(self):
+        cache = TemplateCache()
+        haystack = np.zeros((200, 200, 3), dtype=np.uint8)
+        haystack[100:140, 50:110] = self.pixels
+        before = set(os.listdir(os.getcwd()))
+        
+        result = TemplateMatcher(cache=cache).locate(self.path, haystack, scale=1.0)
+        TemplateMatcher(cache=cache).best_match(self.path, haystack, scale=0.95)
+        
+        self.assertEqual(tuple(result.box), (50, 100, 60, 40))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(set(os.listdir(os.getcwd())), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
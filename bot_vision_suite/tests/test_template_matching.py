@@ -0,0 +1,238 @@
+"""
+Unit tests for the OpenCV template matcher.
+"""
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from bot_vision.core.screen_capture import FrameProvider, SyntheticCaptureBackend
+from bot_vision.core.relative_image import RelativeImageDetector
+from bot_vision.core.template_matching import (
+    MATCH_DTYPE,
+    MatchResult,
+    TemplateMatcher,
+    non_max_suppression,
+)
+from bot_vision.exceptions import ImageProcessingError
+
+
+def make_scene(width=320, height=200, seed=0):
+    """Create a random RGB haystack and a needle cut from it."""
+    rng = np.random.default_rng(seed)
+    haystack = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    needle = haystack[50:80, 120:160].copy()
+    return haystack, needle
+
+
+class TestTemplateMatcher(unittest.TestCase):
+    """Test TemplateMatcher scoring and location."""
+    
+    def setUp(self):
+        self.haystack, self.needle = make_scene()
+        self.matcher = TemplateMatcher()
+    
+    def test_locate_returns_box_and_score(self):
+        result = self.matcher.locate(self.needle, self.haystack, confidence=0.9)
+        
+        self.assertIsInstance(result, MatchResult)
+        self.assertEqual(tuple(result.box), (120, 50, 40, 30))
+        self.assertGreater(result.score, 0.99)
+    
+    def test_offset_is_added_to_box(self):
+        result = self.matcher.locate(self.needle, self.haystack[40:, 100:], offset=(100, 40))
+        
+        self.assertEqual(tuple(result.box), (120, 50, 40, 30))
+    
+    def test_near_miss_returns_none_but_best_match_keeps_score(self):
+        noisy = self.needle.astype(np.int16)
+        noisy[::2] = 255 - noisy[::2]
+        noisy = noisy.astype(np.uint8)
+        
+        self.assertIsNone(self.matcher.locate(noisy, self.haystack, confidence=0.9))
+        best = self.matcher.best_match(noisy, self.haystack)
+        self.assertLess(best.score, 0.9)
+    
+    def test_needle_larger_than_haystack(self):
+        self.assertIsNone(self.matcher.best_match(self.haystack, self.needle))
+    
+    def test_grayscale_and_path_needle(self):
+        fd, path = tempfile.mkstemp(suffix=".png")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        Image.fromarray(self.needle).save(path)
+        
+        result = TemplateMatcher(grayscale=True).locate(path, self.haystack)
+        
+        self.assertEqual(tuple(result.box), (120, 50, 40, 30))
+    
+    def test_missing_needle_raises(self):
+        with self.assertRaises(ImageProcessingError):
+            self.matcher.load_needle("does_not_exist.png")
+
+
+class TestRelativeDetectorMatching(unittest.TestCase):
+    """Test that the relative detector locates images on the cached frame."""
+    
+    def test_locate_uses_cached_frame(self):
+        haystack, needle = make_scene()
+        backend = SyntheticCaptureBackend(haystack)
+        detector = RelativeImageDetector(FrameProvider(ttl=60, backend=backend))
+        
+        box = detector._locate(needle, region=(100, 40, 100, 100))
+        detector._locate(needle)
+        
+        self.assertEqual(tuple(box), (120, 50, 40, 30))
+        self.assertEqual(backend.grab_count, 1)
+
+
+def make_smooth_scene(width=640, height=360, seed=1):
+    """Create a smooth RGB screen (random blocks upsampled) like a real UI."""
+    rng = np.random.default_rng(seed)
+    blocks = rng.integers(0, 256, (height // 4, width // 4, 3), dtype=np.uint8)
+    return cv2.resize(blocks, (width, height), interpolation=cv2.INTER_LINEAR)
+
+
+class TestMultiscaleMatching(unittest.TestCase):
+    """Test the coarse-to-fine multi-scale search."""
+    
+    def setUp(self):
+        self.haystack = make_smooth_scene()
+        self.matcher = TemplateMatcher()
+    
+    def test_scale_samples_cover_range(self):
+        samples = TemplateMatcher.scale_samples([1.0, 0.95, 1.05])
+        
+        self.assertEqual(samples[0], 0.95)
+        self.assertEqual(samples[-1], 1.05)
+        self.assertIn(1.0, samples)
+        self.assertEqual(len(samples), 5)
+    
+    def test_finds_scaled_needle(self):
+        needle = self.haystack[100:180, 200:320]
+        # Reference saved 4% smaller than it appears on screen
+        reference = cv2.resize(needle, None, fx=1 / 1.04, fy=1 / 1.04, interpolation=cv2.INTER_AREA)
+        
+        result = self.matcher.match_multiscale(reference, self.haystack, [1.0, 0.95, 1.05])
+        
+        self.assertGreater(result.score, 0.95)
+        self.assertAlmostEqual(result.box.left, 200, delta=2)
+        self.assertAlmostEqual(result.box.top, 100, delta=2)
+        self.assertGreater(result.scale, 1.0)
+    
+    def test_matches_exhaustive_search_with_offset(self):
+        needle = self.haystack[220:260, 400:470].copy()
+        
+        pyramid = self.matcher.match_multiscale(needle, self.haystack[200:, 300:], offset=(300, 200))
+        exhaustive = self.matcher.best_match(needle, self.haystack)
+        
+        self.assertEqual(tuple(pyramid.box), tuple(exhaustive.box))
+        self.assertAlmostEqual(pyramid.score, exhaustive.score, places=4)
+    
+    def test_small_needle_uses_full_resolution(self):
+        needle = self.haystack[10:20, 30:42]
+        
+        self.assertEqual(self.matcher.pyramid_factor(10), 1.0)
+        result = self.matcher.match_multiscale(needle, self.haystack, [1.0])
+        self.assertEqual(tuple(result.box), (30, 10, 12, 10))
+
+
+def make_icon_grid(rows=6, cols=8, pitch=40):
+    """Create a screen with a dense grid of identical icons."""
+    rng = np.random.default_rng(2)
+    icon = rng.integers(0, 256, (24, 24, 3), dtype=np.uint8)
+    screen = np.full((rows * pitch + 20, cols * pitch + 20, 3), 30, dtype=np.uint8)
+    for row in range(rows):
+        for col in range(cols):
+            y, x = 10 + row * pitch, 10 + col * pitch
+            screen[y:y + 24, x:x + 24] = icon
+    return screen, icon
+
+
+class TestLocateAll(unittest.TestCase):
+    """Test find-all matching and non-maximum suppression."""
+    
+    def test_non_max_suppression_collapses_overlaps(self):
+        boxes = np.array([[0, 0, 10, 10], [1, 1, 10, 10], [30, 30, 10, 10], [31, 30, 10, 10]])
+        scores = np.array([0.9, 0.95, 0.8, 0.7])
+        
+        keep = non_max_suppression(boxes, scores, overlap=0.3)
+        
+        self.assertEqual(keep.tolist(), [1, 2])
+        self.assertEqual(non_max_suppression(np.empty((0, 4)), np.empty(0)).size, 0)
+    
+    def test_locate_all_returns_every_icon_once(self):
+        screen, icon = make_icon_grid()
+        
+        matches = TemplateMatcher().locate_all(icon, screen, confidence=0.9, offset=(5, 7))
+        
+        self.assertEqual(matches.dtype, MATCH_DTYPE)
+        self.assertEqual(len(matches), 48)
+        self.assertTrue(np.all(np.diff(matches["score"]) <= 0))
+        lefts = sorted(set((matches["left"] - 5).tolist()))
+        self.assertEqual(lefts, [10 + 40 * col for col in range(8)])
+        self.assertEqual(int(matches["top"].min()), 17)
+    
+    def test_locate_all_without_matches(self):
+        screen, icon = make_icon_grid()
+        
+        matches = TemplateMatcher().locate_all(255 - icon, screen, confidence=0.9)
+        
+        self.assertEqual(len(matches), 0)
+        self.assertEqual(matches.dtype, MATCH_DTYPE)
+    
+    def test_relative_image_picks_nearest_icon(self):
+        screen, icon = make_icon_grid()
+        anchor = np.zeros((12, 12, 3), dtype=np.uint8)
+        anchor[3:9, 3:9] = 255
+        # Anchor sits in the gap between two columns, slightly closer to the right one
+        screen[96:108, 197:209] = anchor
+        detector = RelativeImageDetector(FrameProvider(ttl=60, backend=SyntheticCaptureBackend(screen)))
+        
+        box = detector.locate_relative_image(anchor, icon, confidence=0.9, max_distance=60)
+        
+        self.assertEqual(tuple(box), (210, 90, 24, 24))
+        self.assertIsNone(detector.locate_relative_image(anchor, icon, max_distance=5))
+    
+    def test_target_search_region_is_bounded_by_anchor(self):
+        screen, _ = make_icon_grid()
+        detector = RelativeImageDetector(FrameProvider(ttl=60, backend=SyntheticCaptureBackend(screen)))
+        
+        region = detector.target_search_region((197, 96, 12, 12), (24, 24), 60)
+        clipped = detector.target_search_region((0, 0, 12, 12), (24, 24), 60, target_region=(0, 0, 50, 40))
+        
+        self.assertEqual(region, (203 - 84, 102 - 84, 168, 168))
+        self.assertEqual(clipped, (0, 0, 50, 40))
+        self.assertIsNone(detector.target_search_region((0, 0, 12, 12), (24, 24), 10,
+                                                        target_region=(200, 200, 10, 10)))
+    
+    def test_anchor_hint_is_tried_before_full_screen(self):
+        screen, icon = make_icon_grid()
+        fd, anchor_path = tempfile.mkstemp(suffix=".png")
+        os.close(fd)
+        self.addCleanup(os.remove, anchor_path)
+        anchor = np.zeros((12, 12, 3), dtype=np.uint8)
+        anchor[3:9, 3:9] = 255
+        Image.fromarray(anchor).save(anchor_path)
+        screen[96:108, 197:209] = anchor
+        detector = RelativeImageDetector(FrameProvider(ttl=60, backend=SyntheticCaptureBackend(screen)))
+        
+        calls = []
+        original = detector._locate
+        
+        def tracking_locate(image, region=None, confidence=0.9, scale=1.0):
+            calls.append(region)
+            return original(image, region, confidence, scale)
+        
+        detector._locate = tracking_locate
+        detector.locate_relative_image(anchor_path, icon, max_distance=60)
+        detector.locate_relative_image(anchor_path, icon, max_distance=60)
+        
+        self.assertEqual(calls, [None, (165, 64, 76, 76)])
+
+
+if __name__ == "__main__":
+    unittest.main()
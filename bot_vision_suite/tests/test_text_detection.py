@@ -0,0 +1,113 @@
+"""
+Unit tests for the text-region detection stage.
+"""
+import unittest
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from bot_vision.core.template_matching import Box
+from bot_vision.core.text_detection import detect_text_regions, rank_text_regions
+
+from .helpers import make_engine, ocr_data
+
+
+def make_screen():
+    screen = np.full((600, 800, 3), 240, dtype=np.uint8)
+    cv2.rectangle(screen, (300, 150), (560, 260), (200, 200, 200), -1)
+    cv2.putText(screen, "Salvar", (40, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (20, 20, 20), 1)
+    cv2.putText(screen, "Nome completo do cliente", (40, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (20, 20, 20), 1)
+    cv2.putText(screen, "OK", (350, 200), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 1)
+    return screen
+
+
+class TestDetectTextRegions(unittest.TestCase):
+    """Test box proposals and the aspect-ratio prior."""
+    
+    def test_words_and_lines_are_proposed(self):
+        boxes = detect_text_regions(make_screen())
+        
+        self.assertEqual(len(boxes), 3)
+        salvar, line, ok = boxes
+        self.assertTrue(35 <= salvar.left <= 42 and 40 <= salvar.top <= 50)
+        self.assertGreater(line.width, 3 * salvar.width)
+        self.assertTrue(345 <= ok.left <= 352)
+    
+    def test_blank_image_has_no_regions(self):
+        self.assertEqual(detect_text_regions(np.full((100, 100), 255, dtype=np.uint8)), [])
+    
+    def test_ranking_prefers_expected_aspect(self):
+        boxes = [Box(0, 0, 200, 16), Box(0, 30, 22, 14), Box(0, 60, 48, 14)]
+        
+        self.assertEqual(rank_text_regions(boxes, "Salvar")[0], boxes[2])
+        self.assertEqual(rank_text_regions(boxes, "OK")[0], boxes[1])
+
+
+class TestEngineTextDetection(unittest.TestCase):
+    """Test that the engine only OCRs candidate crops."""
+    
+    def setUp(self):
+        self.engine = make_engine(self.fake_ocr, ocr_text_detection=True, ocr_result_cache=False,
+                                  ocr_detection_min_area=10000)
+        self.image = Image.fromarray(make_screen())
+    
+    @staticmethod
+    def fake_ocr(img, config):
+        # Only the crop around "Salvar" is narrow enough to hold the word
+        if img.width < 70:
+            return ocr_data(["Salvar"], [90.0], [3], [3], [48], [14])
+        return ocr_data()
+    
+    def test_match_is_mapped_to_region_coordinates(self):
+        boxes, scores, early = self.engine.find_text(self.image, "Salvar", "letters", 75.0)
+        
+        self.assertTrue(early)
+        self.assertEqual(self.engine.last_run_stats["text_regions"], 3)
+        self.assertLess(self.engine.last_run_stats["ocr_calls"], 10)
+        self.assertEqual(len(boxes), 1)
+        self.assertTrue(35 <= boxes[0][0] <= 45)
+        self.assertEqual(boxes[0][2:], (48, 14))
+        configs = {call.args[1] for call in self.engine._image_to_data.call_args_list}
+        self.assertTrue(all("--psm 7" in c or "--psm 8" in c for c in configs))
+    
+    def test_miss_in_detected_boxes_skips_the_grid(self):
+        self.engine._run_cells_sequential = MagicMock()
+        
+        self.assertEqual(self.engine.find_text(self.image, "Cancelar", "letters", 75.0), ([], [], False))
+        self.engine._run_cells_sequential.assert_not_called()
+    
+    def test_exhaustive_search_falls_back_to_the_grid(self):
+        self.engine._run_cells_sequential = MagicMock(return_value=([], False))
+        
+        self.engine.find_text(self.image, "Cancelar", "letters", 75.0, exhaustive=True)
+        
+        self.engine._run_cells_sequential.assert_called_once()
+    
+    def test_detection_misses_are_not_cached(self):
+        engine = make_engine(self.fake_ocr, ocr_text_detection=True, ocr_detection_min_area=10000)
+        engine.find_text(self.image, "Cancelar", "letters", 75.0)
+        engine._run_cells_sequential = MagicMock(return_value=([], False))
+        
+        engine.find_text(self.image, "Cancelar", "letters", 75.0, exhaustive=True)
+        
+        engine._run_cells_sequential.assert_called_once()
+    
+    def test_without_text_boxes_the_grid_is_used(self):
+        self.engine._run_cells_sequential = MagicMock(return_value=([], False))
+        
+        self.engine.find_text(Image.new("RGB", (200, 200), "white"), "Salvar", "letters", 75.0)
+        
+        self.engine._run_cells_sequential.assert_called_once()
+    
+    def test_small_regions_use_the_full_grid(self):
+        self.engine._find_in_text_regions = MagicMock()
+        
+        self.engine.find_text(self.image.crop((0, 0, 90, 90)), "Salvar", "letters", 75.0)
+        
+        self.engine._find_in_text_regions.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+"""
+Unit tests for the full-screen OCR text index.
+"""
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from bot_vision.core.screen_capture import ScreenChangeDetector
+from bot_vision.core.text_index import IndexedWord, ScreenTextIndex, dedupe_words, split_tiles
+
+DATA = {
+    "text": ["Nome", "completo", "", "CPF", "Nome"],
+    "conf": [92.0, 88.0, -1, 40.0, 90.0],
+    "left": [10, 60, 0, 10, 210],
+    "top": [10, 10, 0, 40, 70],
+    "width": [45, 70, 0, 30, 45],
+    "height": [12, 12, 0, 12, 12],
+    "block_num": [1, 1, 1, 2, 3],
+    "par_num": [1, 1, 1, 1, 1],
+    "line_num": [1, 1, 1, 1, 1],
+}
+
+
+def make_engine(data=DATA):
+    engine = MagicMock()
+    engine.image_to_data.return_value = data
+    return engine
+
+
+def make_screen(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (120, 300, 3), dtype=np.uint8)
+
+
+class TestTiles(unittest.TestCase):
+    """Test tile splitting and seam de-duplication."""
+    
+    def test_split_tiles_covers_image_with_overlap(self):
+        tiles = split_tiles(300, 120, 128, 32)
+        
+        self.assertEqual(tiles[0], (0, 0, 128, 120))
+        self.assertEqual(tiles[-1], (172, 0, 128, 120))
+        self.assertEqual([t[0] for t in tiles], [0, 96, 172])
+        self.assertEqual(split_tiles(300, 120, 0), [(0, 0, 300, 120)])
+    
+    def test_dedupe_keeps_most_confident_copy(self):
+        words = [
+            IndexedWord("Salvar", 70.0, (100, 10, 40, 12), (0, 1, 1, 1)),
+            IndexedWord("Abrir", 90.0, (10, 10, 40, 12), (0, 1, 1, 1)),
+            IndexedWord("Salvar", 85.0, (101, 10, 40, 12), (1, 1, 1, 1)),
+            IndexedWord("Salvar", 80.0, (200, 10, 40, 12), (1, 1, 1, 1)),
+        ]
+        
+        kept = dedupe_words(words)
+        
+        self.assertEqual([(w.text, w.confidence) for w in kept],
+                         [("Abrir", 90.0), ("Salvar", 85.0), ("Salvar", 80.0)])
+
+
+class TestScreenTextIndex(unittest.TestCase):
+    """Test building and querying the index."""
+    
+    def setUp(self):
+        self.engine = make_engine()
+        self.index = ScreenTextIndex(self.engine, bucket_size=64)
+        self.screen = make_screen()
+        self.index.build(self.screen)
+    
+    def test_find_single_and_multi_word(self):
+        nome = self.index.find("nome")
+        self.assertEqual([r.box for r in nome], [(10, 10, 45, 12), (210, 70, 45, 12)])
+        
+        phrase = self.index.find("Nome completo", "letters")
+        self.assertEqual(len(phrase), 1)
+        self.assertEqual(phrase[0].box, (10, 10, 120, 12))
+        self.assertAlmostEqual(phrase[0].confidence, 90.0)
+    
+    def test_words_must_share_a_line(self):
+        self.assertEqual(self.index.find("completo CPF"), [])
+    
+    def test_region_and_confidence_filters(self):
+        self.assertEqual([r.box for r in self.index.find("Nome", region=(200, 60, 100, 60))],
+                         [(210, 70, 45, 12)])
+        self.assertEqual(self.index.find("CPF", min_confidence=60.0), [])
+    
+    def test_words_in_uses_spatial_buckets(self):
+        self.assertEqual([w.text for w in self.index.words_in((0, 0, 100, 60))], ["Nome", "completo", "CPF"])
+    
+    def test_ensure_rebuilds_only_when_frame_changes(self):
+        self.assertFalse(self.index.ensure(self.screen.copy()))
+        self.assertTrue(self.index.ensure(make_screen(1)))
+        self.assertEqual(self.engine.image_to_data.call_count, 2)
+    
+    def test_change_detector_skips_hashing(self):
+        detector = ScreenChangeDetector(tile_size=32)
+        detector.update(self.screen)
+        self.index.build(self.screen, detector)
+        
+        detector.update(self.screen.copy())
+        self.assertTrue(self.index.is_current(self.screen.copy(), detector))
+        
+        changed = self.screen.copy()
+        changed[:40, :40] = 255 - changed[:40, :40]
+        detector.update(changed)
+        self.assertFalse(self.index.is_current(changed, detector))
+    
+    def test_changes_outside_the_region_keep_the_index(self):
+        detector = ScreenChangeDetector(tile_size=32)
+        detector.update(self.screen)
+        self.index.build(self.screen, detector)
+        
+        changed = self.screen.copy()
+        changed[:20, 260:] = 255 - changed[:20, 260:]  # e.g. a clock in the corner
+        detector.update(changed)
+        
+        self.assertFalse(self.index.ensure(changed, detector, region=(0, 40, 200, 80)))
+        self.assertFalse(self.index.ensure(changed.copy(), region=(0, 40, 200, 80)))
+        self.assertTrue(self.index.ensure(changed, detector, region=(200, 0, 100, 60)))
+        self.assertEqual(self.engine.image_to_data.call_count, 3)
+    
+    def test_only_changed_tiles_are_read_again(self):
+        engine = make_engine({"text": ["Salvar"], "conf": [80.0], "left": [10], "top": [10],
+                              "width": [40], "height": [12]})
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        engine.map.side_effect = lambda func, items: list(executor.map(func, items))
+        index = ScreenTextIndex(engine, tile_size=120, tile_overlap=0)
+        screen = make_screen()
+        index.build(screen)
+        
+        changed = screen.copy()
+        changed[50:60, 250:260] = 255 - changed[50:60, 250:260]
+        engine.image_to_data.reset_mock()
+        
+        self.assertTrue(index.ensure(changed))
+        self.assertEqual(engine.image_to_data.call_count, 1)
+        self.assertEqual(index.stats["updates"], 1)
+        self.assertEqual(sorted(w.box for w in index.words),
+                         [(10, 10, 40, 12), (130, 10, 40, 12), (190, 10, 40, 12)])
+        self.assertFalse(index.ensure(changed.copy()))
+    
+    def test_updated_tiles_keep_reading_order(self):
+        words_by_tile = {1: ("Salvar", 60), 2: ("", 0), 3: ("Salvar", 80)}
+        
+        def read_tile(tile, config):
+            text, top = words_by_tile[int(np.asarray(tile)[0, 0, 0])]
+            return {"text": [text], "conf": [80.0], "left": [5], "top": [top],
+                    "width": [40], "height": [12]}
+        
+        engine = make_engine()
+        engine.image_to_data.side_effect = read_tile
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        engine.map.side_effect = lambda func, items: list(executor.map(func, items))
+        index = ScreenTextIndex(engine, tile_size=120, tile_overlap=0)
+        screen = np.zeros((120, 300, 3), dtype=np.uint8)
+        for marker, x in enumerate((0, 120, 180), 1):
+            screen[0, x, 0] = marker
+        index.build(screen)
+        
+        changed = screen.copy()
+        changed[50:60, 250:260] = 255
+        words_by_tile[3] = ("Salvar", 5)
+        self.assertTrue(index.ensure(changed))
+        
+        self.assertEqual(index.stats["updates"], 1)
+        self.assertEqual([r.box for r in index.find("Salvar")], [(185, 5, 40, 12), (5, 60, 40, 12)])
+        self.assertEqual([w.box for w in index.words_in((0, 0, 300, 120))],
+                         [(185, 5, 40, 12), (5, 60, 40, 12)])
+    
+    def test_tile_boxes_are_mapped_to_screen_coordinates(self):
+        engine = make_engine({"text": ["Salvar"], "conf": [80.0], "left": [10], "top": [10],
+                              "width": [40], "height": [12]})
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        engine.map.side_effect = lambda func, items: list(executor.map(func, items))
+        index = ScreenTextIndex(engine, tile_size=200, tile_overlap=150)
+        
+        index.build(make_screen())
+        
+        self.assertEqual(engine.image_to_data.call_count, 3)
+        self.assertEqual([w.box for w in index.words], [(10, 10, 40, 12), (60, 10, 40, 12), (110, 10, 40, 12)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Unit tests for event-driven wait conditions.
+"""
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from bot_vision.core.screen_capture import FrameProvider, SyntheticCaptureBackend
+from bot_vision.core.task_executor import TaskExecutor
+from bot_vision.core.wait import frame_signature, signatures_differ, wait_for
+from bot_vision.exceptions import ConfigurationError
+
+
+def make_screen(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (120, 200, 3), dtype=np.uint8)
+
+
+class TestFrameSignature(unittest.TestCase):
+    """Test the cheap frame comparison."""
+    
+    def test_signature_is_downsampled(self):
+        signature = frame_signature(np.zeros((600, 1000, 3), dtype=np.uint8))
+        
+        self.assertEqual(signature.shape, (153, 256))
+    
+    def test_small_noise_is_not_a_change(self):
+        screen = make_screen()
+        noisy = screen.copy()
+        noisy[0, 0] = np.clip(noisy[0, 0].astype(int) + 3, 0, 255)
+        
+        self.assertFalse(signatures_differ(frame_signature(screen), frame_signature(noisy)))
+        self.assertTrue(signatures_differ(frame_signature(screen), frame_signature(255 - screen)))
+
+
+class TestWaitFor(unittest.TestCase):
+    """Test wait_for conditions against a synthetic screen."""
+    
+    def setUp(self):
+        self.screen = make_screen()
+        self.backend = SyntheticCaptureBackend(self.screen)
+        self.provider = FrameProvider(ttl=0, backend=self.backend)
+    
+    def change_screen_later(self, delay=0.05):
+        timer = threading.Timer(delay, self.backend.set_frame, args=(255 - self.screen,))
+        timer.start()
+        self.addCleanup(timer.cancel)
+    
+    def test_changed_returns_when_region_changes(self):
+        self.change_screen_later()
+        
+        start = time.monotonic()
+        result = wait_for("changed", (10, 10, 50, 50), timeout=2.0, poll_interval=0.01,
+                          frame_provider=self.provider)
+        
+        self.assertTrue(result)
+        self.assertLess(time.monotonic() - start, 1.0)
+    
+    def test_changed_times_out_on_static_screen(self):
+        self.assertFalse(wait_for("changed", timeout=0.1, poll_interval=0.01, frame_provider=self.provider))
+    
+    def test_stable_returns_after_quiet_period(self):
+        start = time.monotonic()
+        result = wait_for("stable", timeout=2.0, poll_interval=0.01, stable_for=0.05,
+                          frame_provider=self.provider)
+        
+        self.assertTrue(result)
+        self.assertLess(time.monotonic() - start, 0.5)
+    
+    def test_appeared_uses_target_check(self):
+        self.change_screen_later()
+        
+        result = wait_for("appeared", timeout=2.0, poll_interval=0.01, frame_provider=self.provider,
+                          target=lambda: self.provider.grab()[0, 0, 0] == 255 - self.screen[0, 0, 0])
+        
+        self.assertTrue(result)
+    
+    def test_region_waits_capture_only_the_region(self):
+        with patch.object(self.backend, "grab", wraps=self.backend.grab) as grab:
+            wait_for("stable", (10, 10, 50, 50), timeout=1.0, poll_interval=0.01, stable_for=0.03,
+                     frame_provider=self.provider)
+        
+        self.assertGreater(grab.call_count, 1)
+        self.assertTrue(all(call.args == ((10, 10, 50, 50),) for call in grab.call_args_list))
+    
+    def test_callable_conditions_do_not_capture(self):
+        calls = []
+        
+        def condition():
+            calls.append(1)
+            return len(calls) == 3
+        
+        self.assertTrue(wait_for(condition, timeout=1.0, poll_interval=0.01, frame_provider=self.provider))
+        self.assertEqual(self.backend.grab_count, 0)
+    
+    def test_capture_errors_do_not_escape(self):
+        backend = MagicMock()
+        backend.grab.side_effect = OSError("display unavailable")
+        provider = FrameProvider(ttl=0, backend=backend)
+        
+        self.assertFalse(wait_for("stable", (0, 0, 10, 10), timeout=0.05, poll_interval=0.01,
+                                  frame_provider=provider))
+        self.assertFalse(wait_for("changed", timeout=0.05, poll_interval=0.01, frame_provider=provider))
+    
+    def test_invalid_conditions(self):
+        with self.assertRaises(ConfigurationError):
+            wait_for("appeared", frame_provider=self.provider)
+        with self.assertRaises(ConfigurationError):
+            wait_for("soon", frame_provider=self.provider)
+
+
+class TestExecutorWaits(unittest.TestCase):
+    """Test wait_until handling in the task executor."""
+    
+    def setUp(self):
+        self.screen = make_screen()
+        self.backend = SyntheticCaptureBackend(self.screen)
+        with patch("bot_vision.core.task_executor.OCREngine"):
+            self.executor = TaskExecutor({"capture_backend": self.backend, "wait_poll_interval": 0.01})
+    
+    def test_wait_until_changed_uses_baseline_from_before_action(self):
+        baseline = frame_signature(self.screen)
+        self.backend.set_frame(255 - self.screen)
+        
+        start = time.monotonic()
+        self.executor._wait_after_action({"wait_until": "changed", "wait_timeout": 2.0}, baseline)
+        
+        self.assertLess(time.monotonic() - start, 0.5)
+    
+    def test_overlay_is_not_part_of_the_changed_baseline(self):
+        overlay_frame = self.screen.copy()
+        overlay_frame[40:80, 60:140] = (255, 0, 0)
+        
+        def fake_overlay(location, **kwargs):
+            self.backend.set_frame(overlay_frame)
+            time.sleep(0.3)
+            self.backend.set_frame(self.screen)
+        
+        self.executor._perform_click = MagicMock()
+        self.executor._wait_after_action = MagicMock()
+        with patch("bot_vision.core.task_executor.show_overlay", side_effect=fake_overlay):
+            self.executor._perform_action({"wait_until": "changed", "show_overlay": True}, (60, 40, 80, 40))
+        
+        baseline = self.executor._wait_after_action.call_args[0][1]
+        self.assertFalse(signatures_differ(baseline, frame_signature(self.screen)))
+    
+    def test_without_wait_until_sleeps_delay(self):
+        with patch("bot_vision.core.task_executor.time.sleep") as sleep:
+            self.executor._wait_after_action({"delay": 1.5})
+        
+        sleep.assert_called_once_with(1.5)
+    
+    def test_hover_region_is_clipped_to_the_screen(self):
+        self.executor._settle = MagicMock()
+        
+        with patch("pyautogui.size", return_value=(200, 120)), patch("pyautogui.moveTo"), \
+                patch("pyautogui.center", return_value=SimpleNamespace(x=10, y=110)), \
+                patch("pyautogui.click"):
+            self.executor._perform_click({}, (0, 100, 20, 20))
+        
+        self.executor._settle.assert_called_once_with(0.5, (0, 60, 110, 60))
+    
+    def test_settle_uses_stable_wait_when_enabled(self):
+        self.executor.smart_waits = True
+        self.executor.config = {"wait_stable_time": 0.02, "wait_poll_interval": 0.01}
+        
+        start = time.monotonic()
+        self.executor._settle(0.5)
+        
+        self.assertLess(time.monotonic() - start, 0.3)
+
+
+if __name__ == "__main__":
+    unittest.main()